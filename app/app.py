@@ -1,6 +1,4 @@
 import streamlit as st
-import time
-import threading
 import sys
 import os
 from datetime import datetime
@@ -8,7 +6,11 @@ from datetime import datetime
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from src.pipeline.main import ConversationalAgent
+from src.pipeline.session_manager import ServerBusy, SessionLimitReached, get_session_manager
+from src.core.utils import get_background_loop
+from src.core.tracing import get_tracer
+from src.core.transport import get_transport
+from config.settings import Settings
 
 # Page configuration
 st.set_page_config(
@@ -18,29 +20,33 @@ st.set_page_config(
 )
 
 # Initialize session state
-if 'agent' not in st.session_state:
-    st.session_state.agent = None
-if 'conversation_history' not in st.session_state:
-    st.session_state.conversation_history = []
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = None
 if 'is_listening' not in st.session_state:
     st.session_state.is_listening = False
 if 'tts_service' not in st.session_state:
     st.session_state.tts_service = "Unknown"
 
-def initialize_agent():
-    """Initialize the conversational agent"""
+def initialize_session():
+    """Join the shared session manager; components are built once per server process"""
     try:
-        if st.session_state.agent is None:
+        if st.session_state.session_id is None:
             with st.spinner("🔄 Initializing AI Assistant..."):
-                agent = ConversationalAgent()
-                st.session_state.agent = agent
-                # Determine which TTS service is being used
-                if hasattr(agent.tts, 'primary'):
-                    st.session_state.tts_service = agent.tts.primary.upper()
-                else:
-                    st.session_state.tts_service = "ElevenLabs"  # Default fallback
-                st.success("✅ Agent initialized successfully!")
-        return st.session_state.agent
+                # Builds the shared components on the first visit to this server process
+                get_session_manager()
+                # Conversations run on the background loop; warm its async connection pools too
+                if Settings.HTTP_PRECONNECT:
+                    get_background_loop().submit(get_transport().apreconnect())
+        # Reopens the same session, or a fresh one if ours was evicted while idle
+        session = get_session_manager().open_session(st.session_state.session_id)
+        if session.session_id != st.session_state.session_id:
+            st.session_state.session_id = session.session_id
+            st.session_state.tts_service = (session.agent.tts.primary or "none").upper()
+            st.success("✅ Agent initialized successfully!")
+        return session
+    except SessionLimitReached as e:
+        st.error(f"🚦 The assistant is at capacity ({e}). Please try again in a few minutes.")
+        return None
     except Exception as e:
         st.error(f"❌ Failed to initialize agent: {e}")
         return None
@@ -50,31 +56,66 @@ def main():
     st.markdown("### Speak with your AI travel assistant in multiple languages!")
     
     # Initialize agent
-    agent = initialize_agent()
+    session = initialize_session()
     
-    if agent is None:
+    if session is None:
         st.error("Unable to initialize the AI assistant. Please check your API keys and try again.")
         return
+    agent = session.agent
+    history = session.state.history
     
     # Sidebar
     with st.sidebar:
         st.header("⚙️ Settings")
         
         recording_duration = st.slider(
-            "Recording duration (seconds)", 
+            "Max listening time (seconds)", 
             min_value=3, 
             max_value=15, 
             value=5,
-            help="How long to record your voice"
+            help="Recording stops early once you stop talking"
         )
         
         st.header("📊 System Info")
-        st.write(f"**TTS Service:** {st.session_state.tts_service}")
-        st.write(f"**Conversations:** {len(st.session_state.conversation_history)}")
+        if not agent.ready:
+            st.info("⏳ Models are still loading in the background; the first turn may be slower.")
+        st.write(f"**TTS Service:** {(agent.tts.primary or 'none').upper()}")
+        st.write(f"**Conversations:** {len(history)}")
+        if agent.last_latency is not None:
+            st.write(f"**Last response latency:** {agent.last_latency * 1000:.0f} ms")
+        if agent.tts.cache:
+            cache_stats = agent.tts.cache.metrics()
+            st.write(f"**TTS cache:** {cache_stats['hit_rate']:.0%} hits, "
+                     f"{cache_stats['bytes_served'] / 1024:.0f} KB served")
+        routing = agent.llm.metrics()
+        if routing["decisions"]["turns"]:
+            decisions = routing["decisions"]
+            st.write(f"**LLM routing:** {' → '.join(routing['ranking'])}, "
+                     f"{decisions['hedged']} hedged, {decisions['hedge_won']} won by hedge")
+            for name, stats in routing["providers"].items():
+                if stats["p50_ms"] is not None:
+                    st.write(f"- {name}: p50 {stats['p50_ms']:.0f} ms, p95 {stats['p95_ms']:.0f} ms, "
+                             f"{stats['error_rate']:.0%} errors")
+        local = routing.get("local")
+        if local and local["tokens_per_s"]:
+            st.write(f"**Local LLM:** {local['tokens_per_s']:.1f} tokens/s, "
+                     f"{local['queued']} queued, {local['rejected']} turned away")
+        server = get_session_manager().metrics()
+        st.write(f"**Server:** {server['sessions']}/{server['max_sessions']} sessions, "
+                 f"{server['running']}/{server['max_concurrent']} turns running, {server['queued']} queued")
+        st.write(f"**Memory:** {server['shared_bytes'] / 2**20:.0f} MB shared, "
+                 f"{server['bytes_per_session'] / 1024:.1f} KB per session")
+        stages = get_tracer().summary()
+        if stages:
+            st.write("**Stage latency (p50 / p95):**")
+            for (stage, provider), stats in sorted(stages.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+                label = f"{stage} ({provider})" if provider else stage
+                st.write(f"- {label}: {stats['p50_ms']:.0f} / {stats['p95_ms']:.0f} ms over {stats['count']}")
         
         st.header("🔄 Controls")
         if st.button("🗑️ Clear History", use_container_width=True):
-            st.session_state.conversation_history = []
+            history.clear()
+            agent.memory.clear()
             st.rerun()
             
         if st.button("🔊 Test Audio", use_container_width=True):
@@ -96,7 +137,7 @@ def main():
                 disabled=st.session_state.is_listening,
                 use_container_width=True
             ):
-                start_conversation(recording_duration, agent)
+                start_conversation(recording_duration, session)
         
         with control_col2:
             if st.button(
@@ -118,11 +159,11 @@ def main():
         
         # Conversation history
         st.header("📝 Conversation History")
-        if not st.session_state.conversation_history:
+        if not history:
             st.info("No conversations yet. Start by clicking 'Start Listening'.")
         else:
-            for i, (timestamp, user_text, assistant_response) in enumerate(reversed(st.session_state.conversation_history)):
-                with st.expander(f"💬 Conversation {len(st.session_state.conversation_history)-i} - {timestamp}"):
+            for i, (timestamp, user_text, assistant_response) in enumerate(reversed(history)):
+                with st.expander(f"💬 Conversation {session.state.turns - i} - {timestamp}"):
                     st.write(f"**You:** {user_text}")
                     st.write(f"**Assistant:** {assistant_response}")
     
@@ -134,21 +175,31 @@ def main():
         
         # STT Status
         st.markdown("**Speech-to-Text**")
-        st.progress(100, text="✅ Operational")
+        st.progress(100, text=f"✅ {'Groq Whisper' if agent.stt.primary else 'Faster-Whisper (local)'}")
         
-        # LLM Status  
+        # LLM Status: health of each backend from the router's rolling error rate
         st.markdown("**Language Model**")
-        st.progress(100, text="✅ Operational")
+        for name, stats in agent.llm.metrics()["providers"].items():
+            health = 1.0 - stats["error_rate"]
+            icon = "✅" if health >= 0.9 else "🟡" if health >= 0.5 else "🔴"
+            st.progress(int(health * 100), text=f"{icon} {name}")
         
-        # TTS Status
+        # TTS Status: one bar per provider, driven by its circuit breaker
         st.markdown("**Text-to-Speech**")
-        st.progress(100, text=f"✅ {st.session_state.tts_service}")
+        for breaker in agent.tts.health():
+            name = breaker["name"].replace("TTS ", "")
+            if breaker["state"] == "closed":
+                st.progress(100, text=f"✅ {name}")
+            elif breaker["state"] == "half_open":
+                st.progress(50, text=f"🟡 {name} (recovering)")
+            else:
+                st.progress(0, text=f"🔴 {name} (down, retry in {breaker['retry_in']:.0f}s)")
         
         # Current session info
         st.subheader("Session Info")
         st.write(f"**Started:** {datetime.now().strftime('%H:%M:%S')}")
         st.write(f"**Duration:** {recording_duration}s")
-        st.write(f"**Total Chats:** {len(st.session_state.conversation_history)}")
+        st.write(f"**Total Chats:** {session.state.turns}")
         
         # Quick tips
         st.subheader("💡 Tips")
@@ -159,36 +210,22 @@ def main():
         - Supports multiple languages
         """)
 
-def start_conversation(duration, agent):
-    """Handle the conversation in a separate thread"""
+def start_conversation(duration, session):
+    """Run one conversation turn through the session manager (history is kept there)"""
     if not st.session_state.is_listening:
         st.session_state.is_listening = True
-        
-        def run_conversation():
-            try:
-                # Run the conversation
-                response = agent.run_conversation(duration=duration)
-                
-                # Get the user input (we'll simulate it for now)
-                # In a real implementation, you'd capture the actual transcribed text
-                user_text = "Voice input"  # This would come from STT
-                
-                # Add to conversation history
-                timestamp = datetime.now().strftime("%H:%M:%S")
-                st.session_state.conversation_history.append(
-                    (timestamp, user_text, response)
-                )
-                
-            except Exception as e:
-                st.error(f"❌ Conversation error: {e}")
-            finally:
-                st.session_state.is_listening = False
-                st.rerun()
-        
-        # Run in thread to avoid blocking the UI
-        thread = threading.Thread(target=run_conversation)
-        thread.daemon = True
-        thread.start()
+        try:
+            with st.spinner(f"🔴 Listening... speak now! (up to {duration}s)"):
+                # All sessions share one loop and a bounded number of turn slots
+                get_session_manager().turn(session.session_id, duration=duration)
+            
+        except ServerBusy:
+            st.warning("🚦 The assistant is busy with other conversations. Please try again in a moment.")
+        except Exception as e:
+            st.error(f"❌ Conversation error: {e}")
+        finally:
+            st.session_state.is_listening = False
+        st.rerun()
 
 def test_tts(agent):
     """Test TTS functionality"""
@@ -8,6 +8,137 @@ class Settings:
     PERPLEXITY_API_KEY = os.getenv("PERPLEXITY_API_KEY")
     ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
     TTSOPENAI_API_KEY = os.getenv("TTSOPENAI_API_KEY")
+    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+    # Multi-session server: sessions per box, concurrent turns, waiting turns, idle eviction
+    SESSION_MAX = int(os.getenv("SESSION_MAX", "100"))
+    SESSION_MAX_CONCURRENT = int(os.getenv("SESSION_MAX_CONCURRENT", "4"))
+    SESSION_MAX_QUEUE = int(os.getenv("SESSION_MAX_QUEUE", "8"))
+    SESSION_IDLE_SECONDS = float(os.getenv("SESSION_IDLE_SECONDS", "900"))
+    SESSION_HISTORY_TURNS = int(os.getenv("SESSION_HISTORY_TURNS", "20"))
+
+    # Shared HTTP transport; per-provider pool sizes as "groq=8,elevenlabs=2"
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "10"))
+    HTTP_KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "120"))
+    HTTP_PROVIDER_LIMITS = os.getenv("HTTP_PROVIDER_LIMITS", "")
+    # Send a provider's traffic elsewhere, e.g. "groq=http://127.0.0.1:9001,perplexity=http://127.0.0.1:9002"
+    HTTP_PROVIDER_OVERRIDES = os.getenv("HTTP_PROVIDER_OVERRIDES", "")
+    HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+    HTTP_PRECONNECT = os.getenv("HTTP_PRECONNECT", "true").lower() == "true"
+
+    # Microphone capture
+    AUDIO_SAMPLE_RATE = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))
+    AUDIO_FRAME_MS = int(os.getenv("AUDIO_FRAME_MS", "30"))
+    AUDIO_BUFFER_SECONDS = int(os.getenv("AUDIO_BUFFER_SECONDS", "30"))
+
+    # Voice-activity endpointing
+    VAD_THRESHOLD = float(os.getenv("VAD_THRESHOLD", "0.5"))
+    VAD_SILENCE_MS = int(os.getenv("VAD_SILENCE_MS", "700"))
+    VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "250"))
+    VAD_PAD_MS = int(os.getenv("VAD_PAD_MS", "200"))
+    BARGE_IN_THRESHOLD = float(os.getenv("BARGE_IN_THRESHOLD", "0.7"))
+    BARGE_IN_MIN_SPEECH_MS = int(os.getenv("BARGE_IN_MIN_SPEECH_MS", "200"))
+
+    # Transcription upload encoding: wav (int16 PCM), flac or ogg (Opus)
+    STT_UPLOAD_FORMAT = os.getenv("STT_UPLOAD_FORMAT", "flac").lower()
+
+    # Local Faster-Whisper (shared across sessions); empty values are auto-detected
+    WHISPER_MODEL_SIZE = os.getenv("WHISPER_MODEL_SIZE", "medium")
+    WHISPER_DEVICE = os.getenv("WHISPER_DEVICE", "")
+    WHISPER_COMPUTE_TYPE = os.getenv("WHISPER_COMPUTE_TYPE", "")
+    WHISPER_WORKERS = int(os.getenv("WHISPER_WORKERS", "0"))
+    # Cross-session batching for local Whisper: up to N utterances, waiting at most N ms
+    # for company (0 = only batch what is already queued; size 1 disables batching)
+    WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+    WHISPER_BATCH_WAIT_MS = float(os.getenv("WHISPER_BATCH_WAIT_MS", "0"))
+    STREAMING_STT_STEP_SECONDS = float(os.getenv("STREAMING_STT_STEP_SECONDS", "1.0"))
+    STREAMING_STT_WINDOW_SECONDS = float(os.getenv("STREAMING_STT_WINDOW_SECONDS", "30"))
+
+    # Offline batch transcription (0 workers = one per core)
+    BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "0"))
+    BATCH_MAX_CHUNK_SECONDS = float(os.getenv("BATCH_MAX_CHUNK_SECONDS", "30"))
+    BATCH_MIN_SILENCE_MS = int(os.getenv("BATCH_MIN_SILENCE_MS", "500"))
+
+    # Pipelined TTS
+    TTS_MAX_PARALLEL = int(os.getenv("TTS_MAX_PARALLEL", "2"))
+    TTS_CHUNK_MIN_CHARS = int(os.getenv("TTS_CHUNK_MIN_CHARS", "20"))
+    TTS_CHUNK_SOFT_CHARS = int(os.getenv("TTS_CHUNK_SOFT_CHARS", "80"))
+    TTS_CHUNK_MAX_CHARS = int(os.getenv("TTS_CHUNK_MAX_CHARS", "200"))
+
+    # Local neural TTS on CPU (SpeechT5 + HiFi-GAN), used when torch/transformers are installed.
+    # Loaded at startup when it is the primary voice or LOCAL_TTS_PRELOAD is set; threads 0 = cores / workers
+    LOCAL_TTS_ENABLED = os.getenv("LOCAL_TTS_ENABLED", "true").lower() == "true"
+    LOCAL_TTS_PRELOAD = os.getenv("LOCAL_TTS_PRELOAD", "false").lower() == "true"
+    LOCAL_TTS_MODEL = os.getenv("LOCAL_TTS_MODEL", "microsoft/speecht5_tts")
+    LOCAL_TTS_VOCODER = os.getenv("LOCAL_TTS_VOCODER", "microsoft/speecht5_hifigan")
+    LOCAL_TTS_SPEAKER_PATH = os.getenv(
+        "LOCAL_TTS_SPEAKER_PATH", os.path.join(os.getcwd(), ".cache", "speecht5_speaker.npy")
+    )
+    LOCAL_TTS_SPEAKER_INDEX = int(os.getenv("LOCAL_TTS_SPEAKER_INDEX", "7306"))
+    LOCAL_TTS_WORKERS = int(os.getenv("LOCAL_TTS_WORKERS", "1"))
+    LOCAL_TTS_THREADS = int(os.getenv("LOCAL_TTS_THREADS", "0"))
+
+    # Provider circuit breakers: open after N consecutive failures, back off exponentially
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "3"))
+    BREAKER_BACKOFF_SECONDS = float(os.getenv("BREAKER_BACKOFF_SECONDS", "2"))
+    BREAKER_MAX_BACKOFF_SECONDS = float(os.getenv("BREAKER_MAX_BACKOFF_SECONDS", "120"))
+    HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "1"))
+
+    # Audio output: "device" plays through the speakers, "null" discards (headless)
+    AUDIO_OUTPUT = os.getenv("AUDIO_OUTPUT", "device").lower()
+
+    # Synthesized-audio cache
+    TTS_CACHE_ENABLED = os.getenv("TTS_CACHE_ENABLED", "true").lower() == "true"
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", os.path.join(os.getcwd(), ".cache", "tts"))
+    TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "256"))
+
+    # LLM response cache: memory, sqlite or none
+    LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+    LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(os.getcwd(), ".cache", "llm_cache.sqlite3"))
+    LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+
+    # Conversation memory: prompt budget (tokens) for system prompt + summary + recent turns
+    MEMORY_TOKEN_BUDGET = int(os.getenv("MEMORY_TOKEN_BUDGET", "1500"))
+    MEMORY_SUMMARY_TOKENS = int(os.getenv("MEMORY_SUMMARY_TOKENS", "150"))
+    # Background summarizer threads shared by every session's memory
+    MEMORY_SUMMARY_WORKERS = int(os.getenv("MEMORY_SUMMARY_WORKERS", "2"))
+
+    # In-process LLM fallback (llama-cpp-python, quantized GGUF), off unless enabled and llama_cpp is installed.
+    # It needs a local MODEL_PATH, or DOWNLOAD=true to fetch REPO/FILE from the Hugging Face Hub;
+    # threads 0 = all cores; MAX_QUEUE = waiting requests
+    LOCAL_LLM_ENABLED = os.getenv("LOCAL_LLM_ENABLED", "false").lower() == "true"
+    LOCAL_LLM_MODEL_PATH = os.getenv("LOCAL_LLM_MODEL_PATH", "")
+    LOCAL_LLM_DOWNLOAD = os.getenv("LOCAL_LLM_DOWNLOAD", "false").lower() == "true"
+    LOCAL_LLM_REPO = os.getenv("LOCAL_LLM_REPO", "Qwen/Qwen2.5-1.5B-Instruct-GGUF")
+    LOCAL_LLM_FILE = os.getenv("LOCAL_LLM_FILE", "qwen2.5-1.5b-instruct-q4_k_m.gguf")
+    LOCAL_LLM_CONTEXT = int(os.getenv("LOCAL_LLM_CONTEXT", "2048"))
+    LOCAL_LLM_THREADS = int(os.getenv("LOCAL_LLM_THREADS", "0"))
+    LOCAL_LLM_MAX_QUEUE = int(os.getenv("LOCAL_LLM_MAX_QUEUE", "4"))
+
+    # Build STT/LLM/TTS concurrently at startup
+    STARTUP_PARALLEL_INIT = os.getenv("STARTUP_PARALLEL_INIT", "true").lower() == "true"
+
+    # Tracing: per-stage spans; JSONL trace file (empty = off) and Prometheus /metrics port (0 = off)
+    TRACE_PATH = os.getenv("TRACE_PATH", "")
+    METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+
+    # LLM routing: hedge to the next-best backend when the first is slower than its p95
+    LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+    LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+    LLM_HEDGE_DEFAULT_MS = float(os.getenv("LLM_HEDGE_DEFAULT_MS", "1500"))
+    LLM_HEDGE_MIN_MS = float(os.getenv("LLM_HEDGE_MIN_MS", "250"))
+    LLM_STATS_WINDOW = int(os.getenv("LLM_STATS_WINDOW", "200"))
+
+    # Paraphrase-level answer reuse via a local embedding model (downloads the model on first use)
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    SEMANTIC_CACHE_MODEL = os.getenv(
+        "SEMANTIC_CACHE_MODEL", "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    )
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+    SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "100000"))
 
 STT_PROVIDER = os.getenv("STT_PROVIDER", "deepgram").lower()
 
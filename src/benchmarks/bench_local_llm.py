@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+CPU speed of the in-process local LLM: time to first token and tokens/s.
+
+Loads the configured GGUF model (``LOCAL_LLM_MODEL_PATH``, or with
+``--download`` ``LOCAL_LLM_REPO``/``LOCAL_LLM_FILE`` from the Hugging Face Hub) once and
+answers travel questions with the production system prompt, in three modes:
+
+- ``warm``: the system prompt is prefilled once up front and every request
+  reuses its KV state (llama.cpp keeps the matching token prefix)
+- ``cold``: the context is cleared before every request, so the system
+  prompt is prefilled each time (what the KV reuse saves)
+- ``concurrent``: ``--sessions`` requests at once through the bounded queue;
+  TTFT includes waiting for the single worker, overflow is turned away
+
+Tokens/s is decode speed after the first token. From the project root:
+
+    LOCAL_LLM_MODEL_PATH=models/qwen2.5-1.5b-instruct-q4_k_m.gguf \
+        python -m src.benchmarks.bench_local_llm --runs 2 --sessions 4 --threads 4
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import numpy as np
+from config.settings import Settings
+
+QUESTIONS = [
+    "Suggest a three day itinerary for Jaipur.",
+    "Goa mein December mein kya karna chahiye?",
+    "What is the cheapest way to get from Delhi to Manali?",
+    "Which documents do I need for a Bhutan trip from India?",
+    "Best time to visit Kerala backwaters?",
+    "Mumbai se Lonavala weekend trip ka plan batao.",
+]
+MODES = ("warm", "cold", "concurrent")
+
+
+async def timed(llm, question):
+    from src.components.llm_engine import SYSTEM_MESSAGE
+    messages = [{"role": "system", "content": SYSTEM_MESSAGE}, {"role": "user", "content": question}]
+    start = time.perf_counter()
+    first, tokens = None, 0
+    async for _ in llm.astream(messages):
+        first = first or time.perf_counter()
+        tokens += 1
+    end = time.perf_counter()
+    return {"ttft": (first or end) - start, "tokens": tokens, "decode": end - (first or end)}
+
+
+def summarize(results, rejected=0):
+    ttfts = [r["ttft"] for r in results]
+    decode = sum(r["decode"] for r in results)
+    return {
+        "requests": len(results),
+        "rejected": rejected,
+        "ttft_p50_ms": float(np.percentile(ttfts, 50)) * 1000 if ttfts else None,
+        "ttft_p95_ms": float(np.percentile(ttfts, 95)) * 1000 if ttfts else None,
+        "tokens_per_s": sum(r["tokens"] - 1 for r in results if r["tokens"]) / decode if decode else None,
+    }
+
+
+async def run_mode(llm, mode, questions, sessions):
+    from src.components.llm_engine import SYSTEM_MESSAGE
+    from src.components.local_llm import LocalLLMBusy
+    if mode == "concurrent":
+        llm.load(prime=[SYSTEM_MESSAGE])
+        batch = [questions[i % len(questions)] for i in range(sessions)]
+        outcomes = await asyncio.gather(*(timed(llm, q) for q in batch), return_exceptions=True)
+        for outcome in outcomes:
+            if isinstance(outcome, Exception) and not isinstance(outcome, LocalLLMBusy):
+                raise outcome
+        results = [o for o in outcomes if not isinstance(o, Exception)]
+        return summarize(results, rejected=len(outcomes) - len(results))
+
+    if mode == "warm":
+        llm.load(prime=[SYSTEM_MESSAGE])
+    results = []
+    for question in questions:
+        if mode == "cold":
+            # The worker is idle between sequential requests, so the model is ours to reset
+            llm.model.reset(prefixes=True)
+        results.append(await timed(llm, question))
+    return summarize(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=1, help="passes over the question set per mode")
+    parser.add_argument("--sessions", type=int, default=4, help="simultaneous requests in concurrent mode")
+    parser.add_argument("--threads", type=int, default=0, help="llama.cpp threads (0 = LOCAL_LLM_THREADS or all cores)")
+    parser.add_argument("--max-tokens", type=int, default=150)
+    parser.add_argument("--queue", type=int, default=None, help="waiting requests allowed (default LOCAL_LLM_MAX_QUEUE)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--download", action="store_true",
+                        help="fetch LOCAL_LLM_REPO/LOCAL_LLM_FILE when LOCAL_LLM_MODEL_PATH is not set")
+    parser.add_argument("--json", help="also write the report here")
+    args = parser.parse_args()
+
+    from src.components.local_llm import LocalLLM
+    if args.threads:
+        Settings.LOCAL_LLM_THREADS = args.threads
+    if args.download:
+        Settings.LOCAL_LLM_DOWNLOAD = True
+    llm = LocalLLM(max_queue=args.queue, max_tokens=args.max_tokens)
+    llm.load()
+    report = {"model": llm.model.name, "load_ms": llm.load_seconds * 1000, "modes": {}}
+    questions = QUESTIONS * args.runs
+    for mode in args.modes:
+        report["modes"][mode] = asyncio.run(run_mode(llm, mode, questions, args.sessions))
+
+    print(f"Local LLM {report['model']} (loaded in {report['load_ms']:.0f} ms, "
+          f"{Settings.LOCAL_LLM_THREADS or 'all'} threads)")
+    print(f"{'mode':<12}{'requests':>10}{'rejected':>10}{'ttft p50':>12}{'ttft p95':>12}{'tokens/s':>10}")
+    for mode, stats in report["modes"].items():
+        p50, p95, speed = stats["ttft_p50_ms"], stats["ttft_p95_ms"], stats["tokens_per_s"]
+        print(f"{mode:<12}{stats['requests']:>10}{stats['rejected']:>10}"
+              f"{p50 or 0:>10.0f}ms{p95 or 0:>10.0f}ms{speed or 0:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
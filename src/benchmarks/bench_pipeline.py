@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+End-to-end voice pipeline benchmark against local stand-in providers.
+
+Every external dependency is swapped for a local one: the microphone for a
+``FileAudioSource`` replaying ``--corpus`` WAV files, Groq/TTSOpenAI/
+ElevenLabs/Perplexity/Ollama for mock servers with configurable latency,
+TTFT and token rate (see ``mock_providers``), and the speakers for the null
+audio sink. ``--sessions`` conversations run concurrently on the shared event
+loop, each for ``--turns`` turns through ``ConversationalAgent.arun_conversation``.
+
+Reports p50/p95/p99 end-of-speech → first audio (TTFA), end-of-speech →
+answer complete (turn latency), turn throughput and per-stage latencies.
+With ``--check`` the run fails (exit 1) if it regressed against the stored
+baseline; ``--update-baseline`` records the current run. p95s are only
+checked when both runs measured at least ``MIN_TAIL_TURNS`` turns, since a
+p95 of a handful of turns is just their slowest one. Runs offline on a
+CPU-only box. From the project root:
+
+    python -m src.benchmarks.bench_pipeline --sessions 4 --turns 5 --check
+    python -m src.benchmarks.bench_pipeline --set groq.ttft_ms=400 --update-baseline
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import numpy as np
+from config.settings import Settings
+from src.benchmarks.mock_providers import environment, parse_overrides, start_mock_providers
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "bench_pipeline.json")
+# Lower is better for these; throughput must not drop
+LATENCY_METRICS = ("ttfa_p50_ms", "ttfa_p95_ms", "turn_p50_ms", "turn_p95_ms")
+THROUGHPUT_METRICS = ("turns_per_s",)
+MIN_TAIL_TURNS = 20
+
+
+def configure(servers):
+    """Point ``Settings`` at the mock servers before any component is built."""
+    env = environment(servers)
+    os.environ["OLLAMA_HOST"] = env.get("OLLAMA_HOST", "")
+    Settings.HTTP_PROVIDER_OVERRIDES = env["HTTP_PROVIDER_OVERRIDES"]
+    for key in ("GROQ_API_KEY", "PERPLEXITY_API_KEY", "TTSOPENAI_API_KEY", "ELEVENLABS_API_KEY", "OPENAI_API_KEY"):
+        setattr(Settings, key, "mock")
+    Settings.AUDIO_OUTPUT = "null"
+    # Repeated turns would otherwise be answered from cache
+    Settings.LLM_CACHE_BACKEND = "none"
+    Settings.TTS_CACHE_ENABLED = False
+    Settings.SEMANTIC_CACHE_ENABLED = False
+    Settings.METRICS_PORT = 0
+    # Provider mocks only: in-process models would dominate the numbers
+    Settings.LOCAL_LLM_ENABLED = False
+    Settings.LOCAL_TTS_ENABLED = False
+
+
+def build_agents(sessions, corpus, speed, realtime_playback):
+    from src.components.audio_capture import FileAudioSource
+    from src.components.audio_player import NullAudioSink
+    from src.components.llm_engine import LLMEngine
+    from src.components.stt import STT
+    from src.components.tts import TTS
+    from src.pipeline.main import ConversationalAgent
+
+    llm, tts = LLMEngine(), TTS()
+    tts.player = NullAudioSink(realtime=realtime_playback)
+    agents = []
+    for i in range(sessions):
+        # One audio source per session; STT itself is cheap with a remote backend
+        stt = STT()
+        stt.mic = FileAudioSource(corpus[i % len(corpus):] + corpus[:i % len(corpus)],
+                                  frame_ms=Settings.AUDIO_FRAME_MS,
+                                  buffer_seconds=Settings.AUDIO_BUFFER_SECONDS, speed=speed)
+        agents.append(ConversationalAgent(stt=stt, llm=llm, tts=tts))
+    return agents
+
+
+async def run_sessions(agents, turns, warmup, max_duration):
+    samples = {"ttfa": [], "turn": [], "failed": 0}
+
+    async def session(agent):
+        for turn in range(warmup + turns):
+            agent.last_latency = agent.last_turn_latency = None
+            response = await agent.arun_conversation(max_duration)
+            if turn < warmup:
+                continue
+            if agent.last_turn_latency is None or response.startswith("Error"):
+                samples["failed"] += 1
+                continue
+            samples["turn"].append(agent.last_turn_latency)
+            if agent.last_latency is not None:
+                samples["ttfa"].append(agent.last_latency)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(session(agent) for agent in agents))
+    samples["wall"] = time.perf_counter() - start
+    return samples
+
+
+def percentile_ms(values, q):
+    return float(np.percentile(values, q)) * 1000 if values else None
+
+
+def summarize(samples, turns_total):
+    report = {"turns": len(samples["turn"]), "failed": samples["failed"]}
+    for name in ("ttfa", "turn"):
+        for q in (50, 95, 99):
+            report[f"{name}_p{q}_ms"] = percentile_ms(samples[name], q)
+    # Includes listening time, so it is bounded by the corpus length and --speed
+    report["turns_per_s"] = turns_total / samples["wall"]
+    return report
+
+
+def compare(current, baseline, tolerance, abs_ms, min_tail_turns=MIN_TAIL_TURNS):
+    """Regressions of ``current`` against ``baseline`` as readable strings.
+
+    p95s are skipped unless both runs measured ``min_tail_turns`` turns.
+    """
+    regressions = []
+    tails = min(current.get("turns", 0), baseline.get("turns", 0)) >= min_tail_turns
+    for name in LATENCY_METRICS:
+        now, before = current.get(name), baseline.get(name)
+        if now is None or before is None or (name.endswith("_p95_ms") and not tails):
+            continue
+        if now > before * (1 + tolerance) + abs_ms:
+            regressions.append(f"{name}: {now:.0f} ms vs baseline {before:.0f} ms")
+    for name in THROUGHPUT_METRICS:
+        now, before = current.get(name), baseline.get(name)
+        if now is None or before is None:
+            continue
+        if now < before * (1 - tolerance):
+            regressions.append(f"{name}: {now:.2f} vs baseline {before:.2f}")
+    if current.get("failed", 0) > baseline.get("failed", 0):
+        regressions.append(f"failed turns: {current['failed']} vs baseline {baseline.get('failed', 0)}")
+    return regressions
+
+
+def print_report(report, stages):
+    print(f"\n{'metric':<14} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for name, label in (("ttfa", "TTFA ms"), ("turn", "turn ms")):
+        values = [report[f"{name}_p{q}_ms"] for q in (50, 95, 99)]
+        print(f"{label:<14} " + " ".join(f"{v:>8.0f}" if v is not None else f"{'-':>8}" for v in values))
+    print(f"\n{report['turns']} turns ({report['failed']} failed), {report['turns_per_s']:.2f} turns/s")
+    print(f"\n{'stage':<28} {'count':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for (stage, provider), stats in sorted(stages.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        label = f"{stage} ({provider})" if provider else stage
+        print(f"{label:<28} {stats['count']:>6} {stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", nargs="+", default=["test.wav"], help="WAV files replayed as user speech")
+    parser.add_argument("--sessions", type=int, default=1)
+    parser.add_argument("--turns", type=int, default=MIN_TAIL_TURNS, help="measured turns per session")
+    parser.add_argument("--warmup", type=int, default=1, help="unmeasured turns per session")
+    parser.add_argument("--speed", type=float, default=1.0, help="audio replay speed (x real time)")
+    parser.add_argument("--max-duration", type=float, default=15, help="longest a turn listens, seconds")
+    parser.add_argument("--realtime-playback", action="store_true", help="null sink waits for clip duration")
+    parser.add_argument("--set", nargs="*", default=[], metavar="PROVIDER.FIELD=VALUE",
+                        help="mock provider profile overrides, e.g. groq.ttft_ms=300")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--check", action="store_true", help="exit 1 on a regression against the baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    parser.add_argument("--abs-tolerance-ms", type=float, default=50, help="allowed absolute slowdown")
+    parser.add_argument("--json", help="also write the report here")
+    args = parser.parse_args()
+
+    servers = start_mock_providers(parse_overrides(args.set))
+    configure(servers)
+    from src.core.tracing import get_tracer
+    from src.core.utils import get_background_loop
+
+    agents = build_agents(args.sessions, args.corpus, args.speed, args.realtime_playback)
+    print(f"🧪 {args.sessions} sessions x {args.turns} turns (+{args.warmup} warm-up) on mock providers")
+    samples = get_background_loop().run(run_sessions(agents, args.turns, args.warmup, args.max_duration))
+    report = summarize(samples, args.sessions * args.turns)
+    report["config"] = {"sessions": args.sessions, "turns": args.turns, "speed": args.speed,
+                        "corpus": args.corpus, "profiles": args.set}
+    stages = get_tracer().summary()
+    print_report(report, stages)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({**report, "stages": {f"{s}|{p or ''}": v for (s, p), v in stages.items()}}, f, indent=2)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Baseline written to {args.baseline}")
+
+    if args.check:
+        if not os.path.exists(args.baseline):
+            print(f"\n❌ No baseline at {args.baseline}; record one with --update-baseline")
+            sys.exit(2)
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("config") != report["config"]:
+            print(f"\n⚠️ Baseline was recorded with a different configuration: {baseline.get('config')}")
+        regressions = compare(report, baseline, args.tolerance, args.abs_tolerance_ms)
+        if regressions:
+            print("\n❌ Regressions against baseline:")
+            for line in regressions:
+                print(f"   - {line}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
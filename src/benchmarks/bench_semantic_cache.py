@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Lookup latency of the semantic cache index against index size.
+
+Uses synthetic clustered unit vectors (no embedding model needed), so it runs
+offline. Run from the project root:
+
+    python -m src.benchmarks.bench_semantic_cache --sizes 1000 10000 100000
+"""
+
+import argparse
+import time
+import numpy as np
+from src.components.semantic_cache import VectorIndex
+
+
+def make_vectors(n, dim, rng, topics=2000, noise=0.35):
+    centers = rng.standard_normal((topics, dim)).astype(np.float32)
+    vectors = centers[rng.integers(0, topics, n)] + noise * rng.standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def percentile_ms(samples, q):
+    return float(np.percentile(samples, q)) * 1000
+
+
+def bench(size, dim, queries, batch, rng):
+    data = make_vectors(size, dim, rng)
+    index = VectorIndex(dim, size)
+    start = time.perf_counter()
+    for vector in data:
+        index.add(vector)
+    build = time.perf_counter() - start
+
+    # Paraphrase-like queries: perturbed copies of stored entries
+    targets = rng.integers(0, size, queries)
+    probes = data[targets] + 0.05 * rng.standard_normal((queries, dim)).astype(np.float32)
+    probes /= np.linalg.norm(probes, axis=1, keepdims=True)
+
+    latencies = []
+    correct = 0
+    for target, probe in zip(targets, probes):
+        t0 = time.perf_counter()
+        slot, _ = index.search(probe)
+        latencies.append(time.perf_counter() - t0)
+        correct += slot == target
+
+    t0 = time.perf_counter()
+    for i in range(0, queries, batch):
+        index.search_batch(probes[i:i + batch])
+    batch_per_query = (time.perf_counter() - t0) / queries
+
+    return {
+        "size": size,
+        "build_s": build,
+        "p50_ms": percentile_ms(latencies, 50),
+        "p99_ms": percentile_ms(latencies, 99),
+        "recall": correct / queries,
+        "batch_ms_per_query": batch_per_query * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=64)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'entries':>8} {'build s':>8} {'p50 ms':>8} {'p99 ms':>8} {'recall@1':>9} {'batch ms/q':>11}")
+    for size in args.sizes:
+        r = bench(size, args.dim, args.queries, args.batch, rng)
+        print(f"{r['size']:>8} {r['build_s']:>8.2f} {r['p50_ms']:>8.3f} {r['p99_ms']:>8.3f} "
+              f"{r['recall']:>9.3f} {r['batch_ms_per_query']:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
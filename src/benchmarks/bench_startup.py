@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Cold-start time of the assistant: process spawn → first ready.
+
+Each run starts a fresh interpreter that imports the pipeline, builds a
+``ConversationalAgent`` (the point where the UI can take input) and waits
+for background model loads (the point where the first turn runs at full
+speed). Milestones are measured from the moment the process was spawned;
+the median over ``--runs`` is reported, for parallel and (with
+``--compare``) sequential component construction. Provider APIs are served
+by the local mocks so no keys or network are needed. ``--importtime`` adds
+the slowest imports from ``python -X importtime``. From the project root:
+
+    python -m src.benchmarks.bench_startup --runs 5 --compare --importtime
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+from src.benchmarks.mock_providers import environment, start_mock_providers
+
+CHILD = r"""
+import json, os, sys, time
+spawned = float(os.environ["BENCH_SPAWNED_AT"])
+marks = {"interpreter": time.time() - spawned}
+from src.pipeline.main import ConversationalAgent
+marks["imports"] = time.time() - spawned
+agent = ConversationalAgent()
+marks["accepts_input"] = time.time() - spawned
+agent.wait_ready()
+marks["ready"] = time.time() - spawned
+print("BENCH " + json.dumps(marks), flush=True)
+os._exit(0)
+"""
+MILESTONES = ("interpreter", "imports", "accepts_input", "ready")
+
+
+def child_env(servers, parallel):
+    env = dict(os.environ)
+    env.update(environment(servers))
+    for key in ("GROQ_API_KEY", "PERPLEXITY_API_KEY", "TTSOPENAI_API_KEY", "ELEVENLABS_API_KEY"):
+        env.setdefault(key, "mock")
+    env.update({
+        "AUDIO_OUTPUT": "null",
+        "STARTUP_PARALLEL_INIT": "true" if parallel else "false",
+        "LOCAL_LLM_ENABLED": "false",
+        "LOCAL_TTS_ENABLED": "false",
+        "PYTHONDONTWRITEBYTECODE": "0",
+    })
+    return env
+
+
+def run_once(env):
+    env = dict(env, BENCH_SPAWNED_AT=repr(time.time()))
+    result = subprocess.run([sys.executable, "-c", CHILD], env=env, capture_output=True, text=True, timeout=600)
+    for line in result.stdout.splitlines():
+        if line.startswith("BENCH "):
+            return json.loads(line[len("BENCH "):])
+    raise RuntimeError(f"Startup run failed:\n{result.stdout[-2000:]}\n{result.stderr[-2000:]}")
+
+
+def slowest_imports(env, top):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import src.pipeline.main"],
+                            env=env, capture_output=True, text=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        # Top-level packages only; nested rows are already included in their parent
+        if not name.startswith(" ") and "." not in name.strip():
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--compare", action="store_true", help="also measure sequential construction")
+    parser.add_argument("--importtime", action="store_true")
+    parser.add_argument("--top", type=int, default=10, help="imports to list with --importtime")
+    parser.add_argument("--json", help="also write the medians here")
+    args = parser.parse_args()
+
+    servers = start_mock_providers()
+    modes = [("parallel", True)] + ([("sequential", False)] if args.compare else [])
+    report = {}
+    # Warm the OS file cache and .pyc files so runs measure our code, not the disk
+    run_once(child_env(servers, True))
+    for mode, parallel in modes:
+        env = child_env(servers, parallel)
+        runs = [run_once(env) for _ in range(args.runs)]
+        report[mode] = {m: float(np.median([r[m] for r in runs])) * 1000 for m in MILESTONES}
+
+    print(f"Median of {args.runs} cold starts (ms since spawn)")
+    print(f"{'mode':<12}" + "".join(f"{m:>15}" for m in MILESTONES))
+    for mode, marks in report.items():
+        print(f"{mode:<12}" + "".join(f"{marks[m]:>15.0f}" for m in MILESTONES))
+
+    if args.importtime:
+        print("\nSlowest top-level imports of src.pipeline.main")
+        for micros, name in slowest_imports(child_env(servers, True), args.top):
+            print(f"  {micros / 1000:>8.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
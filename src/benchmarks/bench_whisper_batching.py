@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Throughput vs. latency of cross-session Whisper batching.
+
+Simulates ``--sessions`` concurrent callers that each submit an utterance,
+wait for the text, pause, and repeat. For every (batch size, max wait)
+setting it reports utterances per second and p50/p95 end-to-end latency.
+
+With faster-whisper installed it decodes ``test.wav`` with the real model;
+``--simulate`` (or a missing faster-whisper) uses a cost model where a batch
+costs a fixed overhead plus a sub-linear per-item term. Run from the project root:
+
+    python -m src.benchmarks.bench_whisper_batching --sessions 8 --batch 1 4 8 --wait 0 20 50
+"""
+
+import argparse
+import threading
+import time
+import numpy as np
+from src.components.whisper_batching import WhisperBatchScheduler
+
+
+class SimulatedPool:
+    workers = 1
+
+
+def simulated_batch_fn(overhead, per_item, exponent):
+    def run(audios):
+        time.sleep(overhead + per_item * len(audios) ** exponent)
+        return ["ok"] * len(audios)
+    return run
+
+
+def load_utterance(path, seconds):
+    import soundfile as sf
+    audio, sr = sf.read(path, dtype="float32")
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    return audio[:int(seconds * sr)]
+
+
+def run_load(scheduler, audio, sessions, requests_per_session, think_ms):
+    latencies = []
+    lock = threading.Lock()
+
+    def session(seed):
+        rng = np.random.default_rng(seed)
+        for _ in range(requests_per_session):
+            time.sleep(rng.uniform(0, think_ms) / 1000)
+            start = time.perf_counter()
+            scheduler.transcribe(audio)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    return {
+        "throughput": len(latencies) / wall,
+        "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "p95_ms": float(np.percentile(latencies, 95)) * 1000,
+        "mean_batch": scheduler.metrics()["mean_batch"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=10, help="utterances per session")
+    parser.add_argument("--think-ms", type=float, default=200, help="max pause between a session's utterances")
+    parser.add_argument("--batch", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--wait", type=float, nargs="+", default=[0, 20, 50], help="max wait in ms")
+    parser.add_argument("--audio", default="test.wav")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--simulate", action="store_true")
+    parser.add_argument("--sim-overhead-ms", type=float, default=150)
+    parser.add_argument("--sim-item-ms", type=float, default=120)
+    parser.add_argument("--sim-exponent", type=float, default=0.6)
+    args = parser.parse_args()
+
+    pool = None
+    batch_fn = None
+    if not args.simulate:
+        try:
+            import faster_whisper  # noqa: F401
+            from src.components.whisper_pool import get_whisper_pool
+            pool = get_whisper_pool()
+            pool.load()
+        except ImportError:
+            print("⚠️ faster-whisper not installed, using the simulated cost model")
+            args.simulate = True
+    if args.simulate:
+        pool = SimulatedPool()
+        batch_fn = simulated_batch_fn(args.sim_overhead_ms / 1000, args.sim_item_ms / 1000, args.sim_exponent)
+
+    audio = load_utterance(args.audio, args.seconds)
+    print(f"{args.sessions} sessions x {args.requests} utterances of {len(audio) / 16000:.1f}s"
+          f"{' (simulated)' if args.simulate else ''}")
+    print(f"{'batch':>6} {'wait ms':>8} {'utt/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'mean batch':>11}")
+    for max_batch in args.batch:
+        for wait in args.wait:
+            scheduler = WhisperBatchScheduler(pool=pool, max_batch=max_batch, max_wait_ms=wait, batch_fn=batch_fn)
+            r = run_load(scheduler, audio, args.sessions, args.requests, args.think_ms)
+            print(f"{max_batch:>6} {wait:>8.0f} {r['throughput']:>7.2f} {r['p50_ms']:>8.0f} "
+                  f"{r['p95_ms']:>8.0f} {r['mean_batch']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the Groq, OpenAI, TTSOpenAI, ElevenLabs, Perplexity and
+Ollama APIs with configurable latency, time-to-first-token and token rate.
+
+Each provider gets its own HTTP/1.1 server on localhost speaking just enough
+of the real wire format for the SDKs used in this repo: streamed chat
+completions (SSE), Ollama NDJSON chat, audio transcriptions and speech
+synthesis (returns WAV). Point the app at them through
+``HTTP_PROVIDER_OVERRIDES`` and ``OLLAMA_HOST``. Run standalone with:
+
+    python -m src.benchmarks.mock_providers --set groq.ttft_ms=300
+"""
+
+import argparse
+import io
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, fields, replace
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+DEFAULT_REPLY = (
+    "Goa in December is lovely. Fly into Dabolim, stay near Panjim and budget about "
+    "four thousand rupees a day. Would you like beach or heritage suggestions?"
+)
+DEFAULT_TRANSCRIPT = "मुझे दिसंबर में गोवा जाना है, क्या सुझाव है?"
+
+
+@dataclass
+class MockProfile:
+    """Simulated behaviour of one provider; all times in milliseconds."""
+
+    latency_ms: float = 300  # transcription / synthesis / non-streamed reply
+    ttft_ms: float = 250  # first streamed token
+    tokens_per_s: float = 200
+    jitter: float = 0.1  # +/- fraction applied to every delay
+    error_rate: float = 0.0  # share of requests answered with HTTP 503
+    reply: str = DEFAULT_REPLY
+    transcript: str = DEFAULT_TRANSCRIPT
+    speech_ms_per_char: float = 60  # length of synthesized audio
+
+
+DEFAULT_PROFILES = {
+    "groq": MockProfile(latency_ms=350, ttft_ms=180, tokens_per_s=400),
+    "openai": MockProfile(latency_ms=600, ttft_ms=450, tokens_per_s=90),
+    "ttsopenai": MockProfile(latency_ms=450),
+    "elevenlabs": MockProfile(latency_ms=350),
+    "perplexity": MockProfile(ttft_ms=600, tokens_per_s=120),
+    "ollama": MockProfile(ttft_ms=900, tokens_per_s=25),
+}
+
+
+def parse_overrides(items):
+    """``["groq.ttft_ms=300", ...]`` -> ``{"groq": {"ttft_ms": 300.0}}``."""
+    types = {f.name: f.type for f in fields(MockProfile)}
+    overrides = {}
+    for item in items or []:
+        key, _, value = item.partition("=")
+        name, _, attr = key.partition(".")
+        if attr not in types:
+            raise ValueError(f"Unknown profile setting {attr!r} in {item!r}")
+        overrides.setdefault(name, {})[attr] = value if types[attr] in (str, "str") else float(value)
+    return overrides
+
+
+def tokens(text):
+    """Split a reply into word-sized stream deltas (trailing whitespace kept)."""
+    return re.findall(r"\S+\s*", text)
+
+
+def wav_bytes(seconds, samplerate=16000):
+    """A short 16-bit mono WAV tone, decodable by the audio player."""
+    import soundfile as sf
+    t = np.arange(int(seconds * samplerate)) / samplerate
+    buffer = io.BytesIO()
+    sf.write(buffer, 0.1 * np.sin(2 * np.pi * 220 * t), samplerate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+class MockProviderServer:
+    """One provider's mock API on ``127.0.0.1``; ``url`` is its origin."""
+
+    def __init__(self, name, profile=None, port=0, seed=0):
+        self.name = name
+        self.profile = profile or DEFAULT_PROFILES.get(name, MockProfile())
+        self.requests = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f"mock-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def delay(self, ms):
+        with self._lock:
+            factor = 1 + self._rng.uniform(-self.profile.jitter, self.profile.jitter)
+        time.sleep(max(0.0, ms * factor) / 1000)
+
+    def should_fail(self):
+        with self._lock:
+            self.requests += 1
+            return self._rng.random() < self.profile.error_rate
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                if "json" in (self.headers.get("Content-Type") or ""):
+                    return json.loads(raw or b"{}")
+                return {}
+
+            def _send(self, status, body, content_type="application/json"):
+                if not isinstance(body, bytes):
+                    body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _start_chunked(self, content_type):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+            def _chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+            def do_HEAD(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def do_GET(self):
+                # Health probes (/models) and anything else read-only
+                self._send(200, {"object": "list", "data": []})
+
+            def do_POST(self):
+                body = self._body()
+                if mock.should_fail():
+                    mock.delay(mock.profile.latency_ms / 4)
+                    self._send(503, {"error": {"message": f"mock {mock.name} unavailable"}})
+                elif self.path.endswith("/chat/completions"):
+                    self._chat(body)
+                elif self.path.endswith("/api/chat"):
+                    self._ollama_chat(body)
+                elif self.path.endswith("/audio/transcriptions"):
+                    mock.delay(mock.profile.latency_ms)
+                    self._send(200, {"text": mock.profile.transcript})
+                elif self.path.endswith("/audio/speech") or "/text-to-speech/" in self.path:
+                    text = body.get("input") or body.get("text") or ""
+                    mock.delay(mock.profile.latency_ms)
+                    audio = wav_bytes(max(0.1, len(text) * mock.profile.speech_ms_per_char / 1000))
+                    self._send(200, audio, "audio/wav")
+                else:
+                    self._send(404, {"error": {"message": f"{self.path} not mocked"}})
+
+            def _stream(self, parts, render, content_type, trailer=b""):
+                mock.delay(mock.profile.ttft_ms)
+                self._start_chunked(content_type)
+                interval = 1000 / mock.profile.tokens_per_s
+                for i, part in enumerate(parts):
+                    if i:
+                        mock.delay(interval)
+                    self._chunk(render(part, False))
+                self._chunk(render("", True))
+                if trailer:
+                    self._chunk(trailer)
+                self._chunk(b"")
+
+            def _chat(self, body):
+                model = body.get("model", "mock")
+                created = int(time.time())
+                if not body.get("stream"):
+                    mock.delay(mock.profile.latency_ms)
+                    self._send(200, {
+                        "id": "mock", "object": "chat.completion", "created": created, "model": model,
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": mock.profile.reply}}],
+                        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                    })
+                    return
+
+                def render(delta, last):
+                    chunk = {
+                        "id": "mock", "object": "chat.completion.chunk", "created": created, "model": model,
+                        "choices": [{"index": 0, "delta": {} if last else {"content": delta},
+                                     "finish_reason": "stop" if last else None}],
+                    }
+                    return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8")
+
+                self._stream(tokens(mock.profile.reply), render, "text/event-stream", b"data: [DONE]\n\n")
+
+            def _ollama_chat(self, body):
+                model = body.get("model", "mock")
+
+                def render(delta, last):
+                    line = {
+                        "model": model,
+                        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                        "message": {"role": "assistant", "content": delta},
+                        "done": last,
+                    }
+                    return (json.dumps(line, ensure_ascii=False) + "\n").encode("utf-8")
+
+                self._stream(tokens(mock.profile.reply), render, "application/x-ndjson")
+
+        return Handler
+
+
+def start_mock_providers(overrides=None, names=None, seed=0):
+    """Start a mock per provider; ``overrides`` as returned by ``parse_overrides``."""
+    servers = {}
+    for i, name in enumerate(names or DEFAULT_PROFILES):
+        profile = replace(DEFAULT_PROFILES.get(name, MockProfile()), **(overrides or {}).get(name, {}))
+        servers[name] = MockProviderServer(name, profile, seed=seed + i).start()
+    return servers
+
+
+def environment(servers):
+    """Settings that point the app at ``servers``."""
+    env = {"HTTP_PROVIDER_OVERRIDES": ",".join(f"{n}={s.url}" for n, s in servers.items() if n != "ollama")}
+    if "ollama" in servers:
+        env["OLLAMA_HOST"] = servers["ollama"].url
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--set", nargs="*", default=[], metavar="PROVIDER.FIELD=VALUE",
+                        help="override a profile, e.g. groq.ttft_ms=300 perplexity.error_rate=0.2")
+    args = parser.parse_args()
+
+    servers = start_mock_providers(parse_overrides(args.set))
+    for name, server in servers.items():
+        print(f"🧪 {name:<11} {server.url}  {server.profile}")
+    print("\nExport these to use them:")
+    for key, value in environment(servers).items():
+        print(f"export {key}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        for server in servers.values():
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+import threading
+import time
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Preallocated mono float32 ring buffer written from the audio callback thread.
+
+    Positions are absolute sample counts since the buffer was created, so readers
+    can keep a cursor without caring where the write head wrapped around.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        self._data = np.zeros(self.capacity, dtype=np.float32)
+        self._written = 0
+        self._cond = threading.Condition()
+
+    @property
+    def position(self) -> int:
+        """Total number of samples written so far."""
+        with self._cond:
+            return self._written
+
+    @property
+    def oldest(self) -> int:
+        """Oldest absolute position that is still held in the buffer."""
+        with self._cond:
+            return max(0, self._written - self.capacity)
+
+    def write(self, samples: np.ndarray):
+        n = len(samples)
+        if n >= self.capacity:
+            samples = samples[-self.capacity:]
+        with self._cond:
+            # Oversized writes keep only their tail, which lands where it would have anyway
+            start = (self._written + n - len(samples)) % self.capacity
+            head = min(len(samples), self.capacity - start)
+            self._data[start:start + head] = samples[:head]
+            if head < len(samples):
+                self._data[:len(samples) - head] = samples[head:]
+            self._written += n
+            self._cond.notify_all()
+
+    def wait_for(self, position: int, timeout: float = None) -> bool:
+        """Block until ``position`` samples have been written."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._written >= position, timeout=timeout)
+
+    def read_into(self, start: int, out: np.ndarray) -> int:
+        """Copy samples ``[start, start + len(out))`` into ``out``.
+
+        Returns the position actually read from, which is moved forward if the
+        requested range was already overwritten by the writer.
+        """
+        n = len(out)
+        with self._cond:
+            start = max(start, self._written - self.capacity)
+            if start + n > self._written:
+                raise ValueError("Requested samples have not been captured yet")
+            offset = start % self.capacity
+            head = min(n, self.capacity - offset)
+            out[:head] = self._data[offset:offset + head]
+            if head < n:
+                out[head:] = self._data[:n - head]
+        return start
+
+    def read(self, start: int, n: int) -> np.ndarray:
+        out = np.empty(int(n), dtype=np.float32)
+        self.read_into(start, out)
+        return out
+
+
+class MicrophoneStream:
+    """Callback-driven microphone capture into an ``AudioRingBuffer``.
+
+    The stream can be kept open across turns; ``frames()`` hands out fixed-size
+    frames as soon as they arrive so downstream stages don't wait for the whole
+    recording window.
+    """
+
+    def __init__(self, samplerate=16000, frame_ms=30, buffer_seconds=30, device=None):
+        self.samplerate = samplerate
+        self.frame_size = int(samplerate * frame_ms / 1000)
+        self.device = device
+        self.ring = AudioRingBuffer(int(samplerate * buffer_seconds))
+        self.overflows = 0
+        self._stream = None
+        self._lock = threading.Lock()
+        self._users = 0
+
+    @property
+    def buffer_seconds(self) -> float:
+        return self.ring.capacity / self.samplerate
+
+    @property
+    def active(self) -> bool:
+        return self._stream is not None and self._stream.active
+
+    def _callback(self, indata, frames, time_info, status):
+        if status:
+            self.overflows += 1
+        self.ring.write(indata[:, 0])
+
+    def start(self):
+        with self._lock:
+            self._users += 1
+            if self._stream is None:
+                import sounddevice as sd
+                self._stream = sd.InputStream(
+                    samplerate=self.samplerate,
+                    channels=1,
+                    dtype="float32",
+                    blocksize=self.frame_size,
+                    device=self.device,
+                    callback=self._callback,
+                )
+                self._stream.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users == 0 and self._stream is not None:
+                self._stream.stop()
+                self._stream.close()
+                self._stream = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def frames(self, duration=None, start=None, timeout=1.0):
+        """Yield consecutive ``frame_size`` float32 frames from the microphone.
+
+        The yielded array is reused between iterations; copy it if you need to
+        keep it. Iteration stops after ``duration`` seconds (if given) or when
+        the stream is closed.
+        """
+        pos = self.ring.position if start is None else start
+        end = None if duration is None else pos + int(duration * self.samplerate)
+        frame = np.empty(self.frame_size, dtype=np.float32)
+        while end is None or pos < end:
+            if not self.ring.wait_for(pos + self.frame_size, timeout=timeout):
+                if not self.active:
+                    return
+                continue
+            read_pos = self.ring.read_into(pos, frame)
+            if read_pos != pos:
+                print(f"⚠️ Audio consumer fell behind, dropped {read_pos - pos} samples")
+            pos = read_pos + self.frame_size
+            yield frame
+
+    def record(self, duration: float) -> np.ndarray:
+        """Capture ``duration`` seconds and return them as one contiguous array."""
+        n = int(duration * self.samplerate)
+        if n > self.ring.capacity:
+            raise ValueError(f"Recording of {duration}s does not fit in a {self.buffer_seconds:.0f}s buffer")
+        with self:
+            start = self.ring.position
+            for _ in self.frames(duration, start=start):
+                pass
+            return self.ring.read(start, n)
+
+
+class FileAudioSource(MicrophoneStream):
+    """Replays audio files into the ring buffer in place of a microphone.
+
+    Each time the source is opened (``start()`` by the first user) the next
+    file of ``paths`` is "spoken", followed by silence for as long as the
+    source stays open, so VAD endpointing behaves as it does live. Frames are
+    written at ``speed`` x real time; files are resampled to ``samplerate``.
+    """
+
+    def __init__(self, paths, samplerate=16000, frame_ms=30, buffer_seconds=30, speed=1.0, loop=True):
+        super().__init__(samplerate=samplerate, frame_ms=frame_ms, buffer_seconds=buffer_seconds)
+        self.clips = [self._load(path) for path in ([paths] if isinstance(paths, str) else paths)]
+        self.speed = speed
+        self.loop = loop
+        self.played = 0
+
+    def _load(self, path):
+        import soundfile as sf
+        audio, sr = sf.read(path, dtype="float32", always_2d=True)
+        audio = audio.mean(axis=1)
+        if sr != self.samplerate:
+            positions = np.arange(0, len(audio), sr / self.samplerate)
+            audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+        return audio
+
+    @property
+    def active(self) -> bool:
+        return self._stream is not None
+
+    def start(self):
+        with self._lock:
+            self._users += 1
+            if self._stream is None:
+                if not self.loop and self.played >= len(self.clips):
+                    raise EOFError("All audio files have been replayed")
+                clip = self.clips[self.played % len(self.clips)]
+                self.played += 1
+                stop = threading.Event()
+                thread = threading.Thread(target=self._feed, args=(clip, stop), name="file-audio", daemon=True)
+                self._stream = (thread, stop)
+                thread.start()
+        return self
+
+    def stop(self):
+        feeder = None
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            if self._users == 0 and self._stream is not None:
+                feeder, stop = self._stream
+                self._stream = None
+                stop.set()
+        if feeder is not None:
+            feeder.join()
+
+    def _feed(self, clip, stop):
+        frame = self.frame_size
+        silence = np.zeros(frame, dtype=np.float32)
+        interval = frame / self.samplerate / self.speed
+        next_at = time.monotonic()
+        pos = 0
+        while not stop.is_set():
+            chunk = clip[pos:pos + frame] if pos < len(clip) else silence
+            if len(chunk) < frame:
+                chunk = np.concatenate([chunk, silence[:frame - len(chunk)]])
+            pos += frame
+            self.ring.write(chunk)
+            next_at += interval
+            delay = next_at - time.monotonic()
+            if delay > 0:
+                stop.wait(delay)
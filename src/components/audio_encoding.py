@@ -0,0 +1,36 @@
+import io
+import numpy as np
+import soundfile as sf
+from config.settings import Settings
+
+
+class AudioEncoder:
+    """Encodes utterances for upload into in-memory buffers.
+
+    ``wav`` is int16 PCM, ``flac`` is lossless and roughly half the size, ``ogg``
+    is Opus (lossy, smallest). Each ``encode`` gets its own buffer, so one encoder
+    can serve concurrent sessions without their uploads overwriting each other.
+    """
+
+    FORMATS = {
+        "wav": ("WAV", "PCM_16"),
+        "flac": ("FLAC", "PCM_16"),
+        "ogg": ("OGG", "OPUS"),
+    }
+
+    def __init__(self, fmt: str = None):
+        self.format = (fmt or Settings.STT_UPLOAD_FORMAT).lower()
+        if self.format not in self.FORMATS:
+            raise ValueError(f"Unsupported upload format '{self.format}', expected one of {list(self.FORMATS)}")
+
+    @property
+    def filename(self) -> str:
+        return f"speech.{self.format}"
+
+    def encode(self, audio: np.ndarray, fs: int):
+        """Return ``(filename, file_obj)`` ready to pass as an SDK ``file=`` argument."""
+        container, subtype = self.FORMATS[self.format]
+        buf = io.BytesIO()
+        sf.write(buf, np.asarray(audio, dtype=np.float32), fs, format=container, subtype=subtype)
+        buf.seek(0)
+        return self.filename, buf
@@ -0,0 +1,250 @@
+import io
+import threading
+import time
+from collections import deque
+import numpy as np
+from config.settings import Settings
+
+
+def decode_audio(audio_bytes: bytes, fmt: str, samplerate: int = None, channels: int = 1):
+    """Decode an in-memory clip to ``(float32 [frames, channels], samplerate)``.
+
+    ``pcm`` means raw little-endian int16 at ``samplerate`` (``pcm_16000`` names
+    the rate itself, as in ElevenLabs' output formats); anything else goes
+    through libsndfile (WAV/FLAC/OGG and MP3 on libsndfile >= 1.1) with pydub as
+    the fallback for MP3 on older installs.
+    """
+    if fmt.startswith("pcm"):
+        if "_" in fmt:
+            samplerate = int(fmt.split("_", 1)[1])
+        samples = np.frombuffer(audio_bytes, dtype="<i2").astype(np.float32) / 32768.0
+        return samples.reshape(-1, channels), samplerate
+    try:
+        import soundfile as sf
+        data, sr = sf.read(io.BytesIO(audio_bytes), dtype="float32", always_2d=True)
+        return data, sr
+    except Exception:
+        from pydub import AudioSegment
+        segment = AudioSegment.from_file(io.BytesIO(audio_bytes), format=fmt)
+        scale = float(1 << (8 * segment.sample_width - 1))
+        samples = np.array(segment.get_array_of_samples(), dtype=np.float32) / scale
+        return samples.reshape(-1, segment.channels), segment.frame_rate
+
+
+class Playback:
+    """Handle for one queued clip; ``done`` is set once it has actually been heard."""
+
+    def __init__(self, frames: int, samplerate: int, channel=None):
+        self.frames = frames
+        self.samplerate = samplerate
+        self.channel = channel
+        self.done = threading.Event()
+        self.stopping = threading.Event()
+        self.cancelled = False
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.samplerate if self.samplerate else 0.0
+
+    def wait(self, timeout=None) -> bool:
+        return self.done.wait(timeout)
+
+    def _start(self):
+        self.started_at = time.monotonic()
+
+    def _finish(self, cancelled=False):
+        self.cancelled = cancelled
+        self.finished_at = time.monotonic()
+        self.done.set()
+
+
+def _matches(handle, channel):
+    return channel is None or handle.channel is channel
+
+
+class AudioPlayer:
+    """Plays decoded clips through a ``sounddevice.OutputStream`` in order.
+
+    Clips are queued and written from a single player thread, so overlapping
+    turns never talk over each other. ``stop()`` cuts the current clip within
+    one block and drops everything still queued; given a ``channel`` it only
+    touches that channel's clips.
+    """
+
+    block_frames = 1024
+
+    def __init__(self, device=None):
+        self.device = device
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._current = None
+        self._stream = None
+        self._stream_format = None
+        self._thread = threading.Thread(target=self._run, name="audio-player", daemon=True)
+        self._thread.start()
+
+    def play(self, audio_bytes: bytes, fmt: str, wait=True, samplerate=None, channel=None) -> Playback:
+        samples, sr = decode_audio(audio_bytes, fmt, samplerate=samplerate)
+        return self.play_samples(samples, sr, wait=wait, channel=channel)
+
+    def play_samples(self, samples: np.ndarray, samplerate: int, wait=True, channel=None) -> Playback:
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim == 1:
+            samples = samples.reshape(-1, 1)
+        handle = Playback(len(samples), samplerate, channel)
+        with self._cond:
+            self._queue.append((samples, samplerate, handle))
+            self._cond.notify()
+        if wait:
+            handle.wait()
+        return handle
+
+    def stop(self, timeout=1.0, channel=None) -> bool:
+        """Interrupt the current clip and discard queued ones (only ``channel``'s, if given).
+
+        Blocks until the device has gone quiet (at most one block plus the
+        abort), returning ``False`` if that took longer than ``timeout``.
+        """
+        with self._cond:
+            dropped = [item for item in self._queue if _matches(item[2], channel)]
+            self._queue = deque(item for item in self._queue if not _matches(item[2], channel))
+            current = self._current
+            if current is not None and _matches(current, channel):
+                current.stopping.set()
+            else:
+                current = None
+        for _, _, handle in dropped:
+            handle._finish(cancelled=True)
+        return current is None or current.wait(timeout)
+
+    def is_playing(self, channel=None) -> bool:
+        """Whether a clip (only ``channel``'s, if given) is being heard or still queued."""
+        with self._cond:
+            current = self._current
+            if current is not None and _matches(current, channel) and not current.done.is_set():
+                return True
+            return any(_matches(item[2], channel) for item in self._queue)
+
+    def _open(self, samplerate, channels):
+        import sounddevice as sd
+        if self._stream is not None and self._stream_format == (samplerate, channels):
+            return self._stream
+        self._close()
+        self._stream = sd.OutputStream(samplerate=samplerate, channels=channels, dtype="float32", device=self.device)
+        self._stream.start()
+        self._stream_format = (samplerate, channels)
+        return self._stream
+
+    def _close(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+            self._stream_format = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                samples, sr, handle = self._queue.popleft()
+                self._current = handle
+            try:
+                stream = self._open(sr, samples.shape[1])
+                handle._start()
+                for i in range(0, len(samples), self.block_frames):
+                    if handle.stopping.is_set():
+                        break
+                    stream.write(samples[i:i + self.block_frames])
+                if handle.stopping.is_set():
+                    # Drop what is still buffered in the device
+                    stream.abort()
+                    stream.start()
+                else:
+                    # write() returns once data is buffered; wait until it has been heard
+                    time.sleep(stream.latency)
+            except Exception as e:
+                print(f"⚠️ Audio playback failed: {e}")
+                self._close()
+            with self._cond:
+                self._current = None
+            handle._finish(cancelled=handle.stopping.is_set())
+
+
+class AudioChannel:
+    """One session's view of a shared player.
+
+    Clips still play in order with every other session's, but ``stop()``
+    (e.g. on barge-in) only cuts this session's.
+    """
+
+    def __init__(self, player):
+        self.player = player
+
+    def play(self, audio_bytes: bytes, fmt: str, wait=True, samplerate=None) -> Playback:
+        return self.player.play(audio_bytes, fmt, wait=wait, samplerate=samplerate, channel=self)
+
+    def play_samples(self, samples: np.ndarray, samplerate: int, wait=True) -> Playback:
+        return self.player.play_samples(samples, samplerate, wait=wait, channel=self)
+
+    def stop(self, timeout=1.0) -> bool:
+        return self.player.stop(timeout, channel=self)
+
+    def is_playing(self) -> bool:
+        return self.player.is_playing(channel=self)
+
+
+class NullAudioSink:
+    """Drop-in ``AudioPlayer`` replacement for headless runs and benchmarks.
+
+    Decodes like the real player but discards the audio; with ``realtime=True``
+    it sleeps for the clip duration so timings match a real device.
+    """
+
+    def __init__(self, realtime=False):
+        self.realtime = realtime
+        self.clips = 0
+        self.frames = 0
+        self.bytes = 0
+        self._playing = set()
+        self._lock = threading.Lock()
+
+    def play(self, audio_bytes: bytes, fmt: str, wait=True, samplerate=None, channel=None) -> Playback:
+        self.bytes += len(audio_bytes)
+        samples, sr = decode_audio(audio_bytes, fmt, samplerate=samplerate)
+        return self.play_samples(samples, sr, wait=wait, channel=channel)
+
+    def play_samples(self, samples: np.ndarray, samplerate: int, wait=True, channel=None) -> Playback:
+        handle = Playback(len(samples), samplerate, channel)
+        handle._start()
+        self.clips += 1
+        self.frames += len(samples)
+        if self.realtime:
+            with self._lock:
+                self._playing.add(handle)
+            try:
+                handle.stopping.wait(handle.duration)
+            finally:
+                with self._lock:
+                    self._playing.discard(handle)
+        handle._finish(cancelled=handle.stopping.is_set())
+        return handle
+
+    def stop(self, timeout=1.0, channel=None) -> bool:
+        with self._lock:
+            for handle in self._playing:
+                if _matches(handle, channel):
+                    handle.stopping.set()
+        return True
+
+    def is_playing(self, channel=None) -> bool:
+        with self._lock:
+            return any(_matches(handle, channel) for handle in self._playing)
+
+
+def create_audio_player():
+    """Player for ``Settings.AUDIO_OUTPUT``: ``device`` (speakers) or ``null``."""
+    if Settings.AUDIO_OUTPUT == "null":
+        return NullAudioSink()
+    return AudioPlayer()
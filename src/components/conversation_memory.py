@@ -0,0 +1,147 @@
+import math
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import Settings
+
+SUMMARY_PROMPT = (
+    "Update the running summary of a travel-assistant conversation. Keep destinations, dates, "
+    "budgets, preferences and open questions; drop small talk. Reply with the summary only."
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 UTF-8 bytes per token; errs high for Devanagari)."""
+    return math.ceil(len(text.encode("utf-8")) / 4) + 4 if text else 0
+
+
+def get_summary_executor() -> ThreadPoolExecutor:
+    """Process-wide summarizer threads, shared by every ``ConversationMemory``."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=Settings.MEMORY_SUMMARY_WORKERS,
+                                           thread_name_prefix="memory-summary")
+    return _executor
+
+
+class ConversationMemory:
+    """Token-budgeted chat history with incremental background summarization.
+
+    ``messages()`` returns the system prompt, a running summary of older
+    turns, as many recent turns as still fit ``budget_tokens`` and the new
+    query, so prompt size stops growing after a few turns. Turns that no
+    longer fit are folded into the summary by ``summarize`` on a background
+    thread; until that finishes they are simply left out, never waited for.
+    At most one summary per memory is in flight, so a shared pool of
+    summarizer threads serves every session.
+    """
+
+    def __init__(self, summarize=None, budget_tokens=None, summary_tokens=None, system_prompt=""):
+        # summarize(previous_summary, [(user, assistant), ...]) -> new summary
+        self.summarize = summarize
+        self.budget_tokens = budget_tokens or Settings.MEMORY_TOKEN_BUDGET
+        self.summary_tokens = summary_tokens or Settings.MEMORY_SUMMARY_TOKENS
+        self.system_prompt = system_prompt
+        self.summary = ""
+        self._turns = []  # (user, assistant, tokens), oldest first, not yet in the summary
+        self._lock = threading.Lock()
+        self._pending = None
+        self._generation = 0  # bumped by clear() so a late summary is discarded
+
+    def __len__(self):
+        return len(self._turns)
+
+    def add_turn(self, user: str, assistant: str):
+        if not user or not assistant:
+            return
+        tokens = estimate_tokens(user) + estimate_tokens(assistant)
+        with self._lock:
+            self._turns.append((user, assistant, tokens))
+        self._maybe_compact()
+
+    def clear(self):
+        with self._lock:
+            self._turns.clear()
+            self.summary = ""
+            self._generation += 1
+
+    def _window_budget(self):
+        # Room for recent turns once the prompt, summary and a typical query are in
+        return self.budget_tokens - estimate_tokens(self.system_prompt) - self.summary_tokens - 64
+
+    def _split(self, turns, budget):
+        """Index of the oldest turn that still fits ``budget`` (newest turns kept first)."""
+        used = 0
+        for i in range(len(turns) - 1, -1, -1):
+            used += turns[i][2]
+            if used > budget:
+                return i + 1
+        return 0
+
+    def _maybe_compact(self):
+        if self.summarize is None:
+            return
+        with self._lock:
+            if self._pending is not None and not self._pending.done():
+                return
+            cut = self._split(self._turns, self._window_budget())
+            if cut == 0:
+                return
+            folded = [(u, a) for u, a, _ in self._turns[:cut]]
+            previous = self.summary
+            self._pending = get_summary_executor().submit(self._compact, previous, folded, cut, self._generation)
+
+    def _compact(self, previous, folded, cut, generation):
+        try:
+            summary = self.summarize(previous, folded)
+        except Exception as e:
+            print(f"⚠️ Conversation summary failed, keeping the old one: {e}")
+            return
+        # Never let the summary itself grow without bound
+        limit = self.summary_tokens * 4
+        summary = summary.strip()
+        if len(summary.encode("utf-8")) > limit:
+            summary = summary.encode("utf-8")[:limit].decode("utf-8", "ignore")
+        with self._lock:
+            if generation != self._generation:
+                return
+            self.summary = summary
+            del self._turns[:cut]
+            self._pending = None
+        # More turns may have overflowed while we were summarizing
+        self._maybe_compact()
+
+    def messages(self, query: str):
+        """Chat messages for ``query`` that fit the token budget."""
+        with self._lock:
+            summary = self.summary
+            budget = self.budget_tokens - estimate_tokens(self.system_prompt) - estimate_tokens(summary)
+            budget -= estimate_tokens(query)
+            recent = self._turns[self._split(self._turns, budget):]
+
+        messages = [{"role": "system", "content": self.system_prompt}] if self.system_prompt else []
+        if summary:
+            messages.append({"role": "system", "content": f"Conversation so far: {summary}"})
+        for user, assistant, _ in recent:
+            messages.append({"role": "user", "content": user})
+            messages.append({"role": "assistant", "content": assistant})
+        messages.append({"role": "user", "content": query})
+        return messages
+
+    def approx_bytes(self) -> int:
+        """Memory held by the summary and the turns not yet folded into it."""
+        with self._lock:
+            turns = sum(sys.getsizeof(turn) + sum(sys.getsizeof(part) for part in turn) for turn in self._turns)
+            return sys.getsizeof(self) + sys.getsizeof(self.summary) + sys.getsizeof(self._turns) + turns
+
+    def prompt_tokens(self, query: str) -> int:
+        return sum(estimate_tokens(m["content"]) for m in self.messages(query))
+
+    def wait(self, timeout=None):
+        """Block until background summarization has caught up (tests, shutdown)."""
+        while (pending := self._pending) is not None and not pending.done():
+            pending.result(timeout)
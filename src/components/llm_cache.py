@@ -0,0 +1,175 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from config.settings import Settings
+
+# Common Hinglish spelling variants mapped to one canonical romanization.
+# Variants that are also English words ("me", "h") are left out: rewriting
+# them would change English queries
+_HINGLISH_VARIANTS = {
+    "kia": "kya", "kyaa": "kya",
+    "hain": "hai", "hae": "hai",
+    "mai": "mein", "mei": "mein", "mien": "mein",
+    "nahin": "nahi", "nai": "nahi", "nhi": "nahi", "nahee": "nahi",
+    "acha": "accha", "achha": "accha", "achchha": "accha",
+    "kese": "kaise", "kaisey": "kaise", "kayse": "kaise",
+    "btao": "batao", "bataao": "batao", "bataiye": "batao", "bataye": "batao",
+    "jana": "jaana", "jaane": "jaana",
+    "ghumna": "ghoomna", "ghoomne": "ghoomna", "ghumne": "ghoomna",
+    "dekhne": "dekhna", "dikhna": "dekhna",
+    "kahan": "kaha", "kahaan": "kaha",
+    "sbse": "sabse",
+}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def normalize_query(text: str) -> str:
+    """Case/whitespace/punctuation-insensitive form of a user query.
+
+    Punctuation and symbols are removed by Unicode category so Devanagari
+    vowel signs survive, and common Hinglish spellings are unified.
+    """
+    text = unicodedata.normalize("NFKC", text).lower()
+    text = "".join(" " if unicodedata.category(ch)[0] in "PS" else ch for ch in text)
+    # "goaaa" -> "goa", "plsss" -> "pls"
+    text = re.sub(r"(.)\1{2,}", r"\1", text)
+    return " ".join(_HINGLISH_VARIANTS.get(word, word) for word in text.split())
+
+
+class InMemoryCacheBackend:
+    """Thread-safe LRU dict with per-entry expiry."""
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or Settings.LLM_CACHE_MAX_ENTRIES
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at and expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCacheBackend:
+    """Persistent LRU cache in a single SQLite file, shared across processes."""
+
+    def __init__(self, path=None, max_entries=None):
+        self.path = path or Settings.LLM_CACHE_PATH
+        self.max_entries = max_entries or Settings.LLM_CACHE_MAX_ENTRIES
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache(last_used)")
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires_at = row
+            if expires_at and expires_at < now:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key, value, ttl=None):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, now),
+            )
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                "SELECT key FROM llm_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+
+class LLMResponseCache:
+    """Answers keyed on (model, system prompt, normalized query) with a TTL."""
+
+    def __init__(self, backend, ttl=None):
+        self.backend = backend
+        self.ttl = Settings.LLM_CACHE_TTL_SECONDS if ttl is None else ttl
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model, system_prompt, query) -> str:
+        raw = "\x1f".join([model, system_prompt, normalize_query(query)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, model, system_prompt, query):
+        value = self.backend.get(self.key(model, system_prompt, query))
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, model, system_prompt, query, response):
+        if response and response.strip():
+            self.backend.set(self.key(model, system_prompt, query), response, ttl=self.ttl)
+
+    def metrics(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.backend),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def get_llm_cache():
+    """Process-wide response cache for ``Settings.LLM_CACHE_BACKEND``, or ``None``."""
+    global _cache
+    backend = Settings.LLM_CACHE_BACKEND
+    if backend == "none":
+        return None
+    with _cache_lock:
+        if _cache is None:
+            if backend == "sqlite":
+                _cache = LLMResponseCache(SQLiteCacheBackend())
+            else:
+                _cache = LLMResponseCache(InMemoryCacheBackend())
+    return _cache
@@ -1,41 +1,267 @@
-import requests
-import ollama
-from groq import Groq
+import asyncio
+import importlib.util
+import json
+import os
+import threading
+import time
 from config.settings import Settings
+from src.core.tracing import span
+from src.core.transport import get_transport
+from src.core.utils import get_background_loop
+from src.components.llm_router import LLMRouter
+from src.components.llm_cache import get_llm_cache
+from src.components.local_llm import get_local_llm, local_llm_configured
+from src.components.semantic_cache import get_semantic_cache, loaded_semantic_cache, preload_semantic_cache
+from src.components.conversation_memory import SUMMARY_PROMPT
+
+SYSTEM_MESSAGE = "You are a helpful travel assistant. Keep responses concise and factual."
+PERPLEXITY_URL = "https://api.perplexity.ai/chat/completions"
+OLLAMA_MODEL = "llama2"
+PERPLEXITY_MODEL = "llama-3.1-8b-instruct"
+
+def _async_groq():
+    from groq import AsyncGroq
+    transport = get_transport()
+    return AsyncGroq(
+        api_key=Settings.GROQ_API_KEY,
+        http_client=transport.async_client("groq"),
+        timeout=transport.timeout,
+    )
 
 class LLMEngine:
     def __init__(self):
-        try:
-            self.client = Groq(api_key=Settings.GROQ_API_KEY)
-            # ✅ Use latest Groq supported model
-            self.model = "llama-3.1-8b-instant"
-            self.primary = True
-        except Exception:
-            self.primary = False
-
-    def query(self, prompt: str):
-        system_message = "You are a helpful travel assistant. Keep responses concise and factual."
+        self.transport = get_transport()
+        # ✅ Use latest Groq supported model
+        self.model = "llama-3.1-8b-instant"
+        self.primary = bool(Settings.GROQ_API_KEY) and importlib.util.find_spec("groq") is not None
+        self.cache = get_llm_cache()
+        # The embedding model loads in the background; lookups skip it until it is ready
+        preload_semantic_cache()
+        # In-process model shared by every session: answers even when all providers are down
+        self.local = None
+        if local_llm_configured():
+            self.local = get_local_llm()
+            # Weights load in the background without holding up readiness: the
+            # fallback is only needed once the providers fail, and until then
+            # a request simply waits for the load (or the router moves on)
+            threading.Thread(target=self._warm_local, name="local-llm-preload", daemon=True).start()
+        elif Settings.LOCAL_LLM_ENABLED:
+            print("⚠️ Local LLM fallback off: needs llama_cpp and LOCAL_LLM_MODEL_PATH (or LOCAL_LLM_DOWNLOAD=true)")
+        # Import the Groq SDK off the startup path (the async client itself is per event loop)
+        self._warming = threading.Thread(target=self._warm, name="llm-preload", daemon=True)
+        self._warming.start()
+
+        sources = {}
         if self.primary:
-            resp = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_message},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.0,  # Lower temperature for more consistent responses
-                max_tokens=150
-            )
-            return resp.choices[0].message.content
-        else:
+            sources["groq"] = self._astream_groq
+        # Local Ollama needs no key; it simply fails fast when it isn't running
+        sources["ollama"] = self._astream_ollama
+        if Settings.PERPLEXITY_API_KEY:
+            sources["perplexity"] = self._astream_perplexity
+        if self.local is not None:
+            sources["local"] = self.local.astream
+        self.router = LLMRouter(sources)
+
+    @property
+    def semantic_cache(self):
+        return loaded_semantic_cache()
+
+    def _warm(self):
+        if self.primary:
+            import groq  # noqa: F401
+
+    def _warm_local(self):
+        try:
+            # Prefill the travel prompt once; every request then starts from its KV state
+            self.local.load(prime=[SYSTEM_MESSAGE])
+        except Exception as e:
+            print(f"⚠️ Local LLM failed to load: {e}")
+
+    @property
+    def ready(self) -> bool:
+        """Whether background loads (SDK import, semantic cache model) have finished.
+
+        The local fallback model is not waited for.
+        """
+        semantic = not Settings.SEMANTIC_CACHE_ENABLED or loaded_semantic_cache() is not None
+        return semantic and not self._warming.is_alive()
+
+    def wait_ready(self):
+        self._warming.join()
+        get_semantic_cache()
+
+    @property
+    def async_client(self):
+        """AsyncGroq client for the running event loop."""
+        return self.transport.sdk_client("groq", _async_groq)
+
+    def _cache_namespace(self, backend):
+        """Cache namespace for answers from ``backend``: different models are kept apart."""
+        models = {
+            "groq": self.model,
+            "ollama": OLLAMA_MODEL,
+            "perplexity": PERPLEXITY_MODEL,
+            "local": os.path.basename(Settings.LOCAL_LLM_MODEL_PATH) or Settings.LOCAL_LLM_FILE,
+        }
+        return f"{backend}:{models[backend]}"
+
+    @property
+    def preferred(self):
+        """Backend the router tries first; only its answers are cached and served from cache."""
+        return next(iter(self.router.sources))
+
+    @property
+    def cache_model(self):
+        return self._cache_namespace(self.preferred)
+
+    def _cached(self, prompt, route=None):
+        route = {} if route is None else route
+        if self.cache:
+            cached = self.cache.get(self.cache_model, SYSTEM_MESSAGE, prompt)
+            if cached is not None:
+                route["winner"] = "cache"
+                return cached
+        if self.semantic_cache:
+            cached = self.semantic_cache.lookup(prompt, namespace=f"{self.cache_model}\x1f{SYSTEM_MESSAGE}")
+            if cached is not None:
+                route["winner"] = "semantic-cache"
+                return cached
+        return None
+
+    def _remember(self, prompt, response, winner):
+        # A hedge or fallback answer is not what the preferred model would have said
+        if winner != self.preferred:
+            return
+        namespace = self._cache_namespace(winner)
+        if self.cache:
+            self.cache.put(namespace, SYSTEM_MESSAGE, prompt, response)
+        if self.semantic_cache:
+            self.semantic_cache.add(prompt, response, namespace=f"{namespace}\x1f{SYSTEM_MESSAGE}")
+
+    def query(self, prompt: str, memory=None):
+        route = {}
+        with span("llm.query") as s:
+            try:
+                response = "".join(self.stream_query(prompt, memory, route))
+            finally:
+                if route.get("winner"):
+                    s.set(provider=route["winner"])
+            s.set(bytes=len(response.encode("utf-8")))
+        return response
+
+    def stream_query(self, prompt: str, memory=None, route=None):
+        """Yield the response as text deltas from whichever backend answers first.
+
+        Runs ``astream_query`` on the shared background loop, so synchronous
+        callers get the same hedged routing; ``route`` is filled in the same way.
+        """
+        yield from get_background_loop().iterate(self.astream_query(prompt, memory, route))
+
+    async def astream_query(self, prompt: str, memory=None, route=None):
+        """Async iterator of text deltas, routed and hedged across backends by ``LLMRouter``.
+
+        With a ``ConversationMemory`` the earlier turns (summary + recent
+        window) are sent along and the new turn is recorded afterwards.
+        ``route``, if given, gets ``winner`` (a backend, ``cache`` or
+        ``semantic-cache``) and ``ttft`` (seconds from call to first delta).
+        It belongs to this call, unlike state on the engine every session shares.
+        """
+        route = {} if route is None else route
+        with span("llm.stream") as s:
+            total = 0
             try:
-                # Try Ollama locally
-                return ollama.chat(model="llama2", messages=[{"role": "user", "content": prompt}])["message"]["content"]
-            except Exception:
-                # Fallback to Perplexity API
-                headers = {
-                    "Authorization": f"Bearer {Settings.PERPLEXITY_API_KEY}",
-                    "Content-Type": "application/json",
-                }
-                data = {"model": "llama-3.1-8b-instruct", "messages": [{"role": "user", "content": prompt}]}
-                r = requests.post("https://api.perplexity.ai/chat/completions", headers=headers, json=data)
-                return r.json()["choices"][0]["message"]["content"]
+                async for delta in self._answer(prompt, memory, route):
+                    total += len(delta.encode("utf-8"))
+                    yield delta
+            finally:
+                s.set(bytes=total)
+                if route.get("winner"):
+                    s.set(provider=route["winner"])
+                if route.get("ttft") is not None:
+                    s.set(first_item_ms=round(route["ttft"] * 1000, 3))
+
+    async def _answer(self, prompt, memory, route):
+        start = time.monotonic()
+        # Answers to follow-ups depend on the conversation, so only a fresh one may use the cache
+        fresh = memory is None or (len(memory) == 0 and not memory.summary)
+        cached = await asyncio.to_thread(self._cached, prompt, route) if fresh else None
+        if cached is not None:
+            route["ttft"] = time.monotonic() - start
+            if memory is not None:
+                memory.add_turn(prompt, cached)
+            yield cached
+            return
+
+        if memory is not None:
+            messages = memory.messages(prompt)
+        else:
+            messages = [{"role": "system", "content": SYSTEM_MESSAGE}, {"role": "user", "content": prompt}]
+        parts = []
+        async for delta in self.router.astream(messages, route):
+            if not parts:
+                route["ttft"] = time.monotonic() - start
+            parts.append(delta)
+            yield delta
+        response = "".join(parts)
+        if memory is not None:
+            memory.add_turn(prompt, response)
+        if fresh:
+            await asyncio.to_thread(self._remember, prompt, response, route.get("winner"))
+
+    def summarize(self, previous_summary, turns):
+        """Fold ``turns`` into ``previous_summary``; used by ``ConversationMemory`` off the hot path."""
+        transcript = "\n".join(f"User: {user}\nAssistant: {assistant}" for user, assistant in turns)
+        messages = [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": f"Summary so far: {previous_summary or '(none)'}\n\nNew turns:\n{transcript}"},
+        ]
+        # Kept out of the routing stats: summaries are long prompts nobody is waiting on
+        return "".join(get_background_loop().iterate(self.router.astream(messages, record=False)))
+
+    def metrics(self) -> dict:
+        """Routing decisions and per-backend p50/p95 time-to-first-token (plus local model stats)."""
+        metrics = self.router.metrics()
+        if self.local is not None:
+            metrics["local"] = self.local.metrics()
+        return metrics
+
+    async def _astream_groq(self, messages):
+        stream = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.0,
+            max_tokens=150,
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices:
+                yield chunk.choices[0].delta.content
+
+    async def _astream_ollama(self, messages):
+        import ollama
+        client = ollama.AsyncClient()
+        async for chunk in await client.chat(model=OLLAMA_MODEL, messages=messages, stream=True):
+            yield chunk["message"]["content"]
+
+    async def _astream_perplexity(self, messages):
+        headers = {
+            "Authorization": f"Bearer {Settings.PERPLEXITY_API_KEY}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+        }
+        data = {
+            "model": PERPLEXITY_MODEL,
+            "messages": messages,
+            "stream": True,
+        }
+        async with self.transport.async_client("perplexity").stream("POST", PERPLEXITY_URL, headers=headers, json=data) as r:
+            r.raise_for_status()
+            async for line in r.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[len("data:"):].strip()
+                if payload == "[DONE]":
+                    break
+                choices = json.loads(payload).get("choices") or []
+                if choices:
+                    yield choices[0].get("delta", {}).get("content")
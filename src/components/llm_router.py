@@ -0,0 +1,226 @@
+import asyncio
+import threading
+import time
+from collections import deque
+import numpy as np
+from config.settings import Settings
+
+
+class ProviderStats:
+    """Rolling time-to-first-token and error rate for one backend."""
+
+    def __init__(self, window=None):
+        window = window or Settings.LLM_STATS_WINDOW
+        self.ttfts = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)  # True = answered, False = failed
+        self.requests = 0
+        self.errors = 0
+        self.wins = 0
+        self.cancelled = 0
+
+    def record_success(self, ttft):
+        self.ttfts.append(ttft)
+        self.outcomes.append(True)
+
+    def record_error(self):
+        self.errors += 1
+        self.outcomes.append(False)
+
+    def record_censored(self, waited):
+        """A cancelled request that had waited ``waited`` seconds without a token.
+
+        Its real TTFT is at least that long, so the wait is kept as a
+        (lower-bound) sample; otherwise a backend that has slowed down keeps
+        the percentiles from when it was fast.
+        """
+        self.ttfts.append(waited)
+
+    def percentile(self, q):
+        return float(np.percentile(self.ttfts, q)) if self.ttfts else None
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def expected_latency(self, prior):
+        """Median TTFT inflated by the recent failure rate (unknown backends get ``prior``)."""
+        p50 = self.percentile(50)
+        latency = prior if p50 is None else p50
+        return latency / max(0.05, 1.0 - self.error_rate)
+
+    def metrics(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.error_rate,
+            "wins": self.wins,
+            "cancelled": self.cancelled,
+            "p50_ms": None if not self.ttfts else self.percentile(50) * 1000,
+            "p95_ms": None if not self.ttfts else self.percentile(95) * 1000,
+        }
+
+
+class LLMRouter:
+    """Latency-aware routing with hedged requests across LLM backends.
+
+    Backends are tried in order of expected time-to-first-token. If the
+    first hasn't produced a token by the hedge deadline (its own p95, or a
+    default until enough samples exist), the next-best backend is started as
+    well; whichever yields a token first wins and the rest are cancelled.
+    A backend that fails before answering hands over to the next one
+    immediately.
+    """
+
+    min_samples = 10
+
+    def __init__(self, sources, hedge=None, percentile=None, default_deadline=None, min_deadline=None):
+        # sources: ordered {name: request (e.g. chat messages) -> async iterator of text deltas}
+        self.sources = dict(sources)
+        self.hedge = Settings.LLM_HEDGE_ENABLED if hedge is None else hedge
+        self.percentile = Settings.LLM_HEDGE_PERCENTILE if percentile is None else percentile
+        self.default_deadline = (Settings.LLM_HEDGE_DEFAULT_MS if default_deadline is None else default_deadline) / 1000
+        self.min_deadline = (Settings.LLM_HEDGE_MIN_MS if min_deadline is None else min_deadline) / 1000
+        self.stats = {name: ProviderStats() for name in self.sources}
+        self.decisions = {"turns": 0, "hedged": 0, "hedge_won": 0, "failover": 0}
+        self.last_route = None
+        self._lock = threading.Lock()
+
+    def rank(self):
+        """Backend names, best expected TTFT first (configured order breaks ties)."""
+        order = list(self.sources)
+        return sorted(order, key=lambda name: (self.stats[name].expected_latency(self.default_deadline), order.index(name)))
+
+    def deadline(self, name):
+        """How long to wait for ``name``'s first token before hedging."""
+        stats = self.stats[name]
+        if len(stats.ttfts) < self.min_samples:
+            return self.default_deadline
+        return max(self.min_deadline, stats.percentile(self.percentile))
+
+    async def astream(self, prompt, route=None, record=True):
+        """Yield text deltas from the winning backend.
+
+        The decision is recorded in ``route`` (if given) and ``last_route``.
+        With ``record=False`` (background work such as summaries) the request
+        is routed the same way but leaves the stats and decisions untouched.
+        """
+        ranked = self.rank()
+        stats = self.stats if record else {name: ProviderStats() for name in self.sources}
+        decisions = self.decisions if record else dict.fromkeys(self.decisions, 0)
+        queue = asyncio.Queue()
+        tasks = {}
+        began = {}
+        launched = []
+        route = {} if route is None else route
+        route.update({"order": ranked, "launched": launched, "winner": None, "hedged": False, "ttft": None})
+        if record:
+            self.last_route = route
+        start = time.monotonic()
+
+        async def run(name):
+            first = True
+            try:
+                async for delta in self.sources[name](prompt):
+                    if not delta:
+                        continue
+                    if first:
+                        first = False
+                        await queue.put((name, "ttft", time.monotonic() - began[name]))
+                    await queue.put((name, "delta", delta))
+                await queue.put((name, "done", None))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await queue.put((name, "error", e))
+
+        def launch():
+            name = ranked[len(launched)]
+            launched.append(name)
+            with self._lock:
+                stats[name].requests += 1
+            began[name] = time.monotonic()
+            tasks[name] = asyncio.create_task(run(name))
+            return began[name] + self.deadline(name)
+
+        with self._lock:
+            decisions["turns"] += 1
+        hedge_at = launch()
+        winner = None
+        try:
+            while True:
+                timeout = None
+                if winner is None and self.hedge and len(launched) < len(ranked):
+                    timeout = max(0.0, hedge_at - time.monotonic())
+                try:
+                    name, kind, item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    route["hedged"] = True
+                    with self._lock:
+                        decisions["hedged"] += 1
+                    hedge_at = launch()
+                    continue
+
+                if winner is None:
+                    if kind == "ttft":
+                        # First token: this backend wins, the others are cancelled
+                        winner = name
+                        route["winner"] = name
+                        route["ttft"] = time.monotonic() - start
+                        with self._lock:
+                            stats[name].record_success(item)
+                            stats[name].wins += 1
+                            if name != launched[0]:
+                                decisions["hedge_won" if route["hedged"] else "failover"] += 1
+                        self._cancel_others(tasks, name, stats, began)
+                        continue
+                    if kind == "error":
+                        with self._lock:
+                            stats[name].record_error()
+                        print(f"⚠️ {name} failed before answering: {item}")
+                        tasks.pop(name)
+                        if tasks:
+                            continue
+                        if len(launched) < len(ranked):
+                            hedge_at = launch()
+                            continue
+                        raise item
+                    # Finished without any text; count it as an answer so we don't hang
+                    winner = route["winner"] = name
+                    self._cancel_others(tasks, name, stats, began)
+                    return
+
+                if name != winner:
+                    continue
+                if kind == "done":
+                    return
+                if kind == "error":
+                    with self._lock:
+                        stats[name].record_error()
+                    # Text has already been yielded, so we can't switch backends mid-answer
+                    raise item
+                yield item
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    def _cancel_others(self, tasks, winner, stats, began):
+        now = time.monotonic()
+        for name in [n for n in tasks if n != winner]:
+            tasks.pop(name).cancel()
+            waited = now - began[name]
+            with self._lock:
+                stats[name].cancelled += 1
+                # Only a wait past its own hedge deadline says the loser is slower than
+                # we thought; a hedge that had barely started says nothing about it
+                if waited >= self.deadline(name):
+                    stats[name].record_censored(waited)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "decisions": dict(self.decisions),
+                "ranking": self.rank(),
+                "providers": {name: stats.metrics() for name, stats in self.stats.items()},
+                "last_route": dict(self.last_route) if self.last_route else None,
+            }
@@ -0,0 +1,244 @@
+import asyncio
+import importlib.util
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+import numpy as np
+from config.settings import Settings
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+class LocalLLMBusy(RuntimeError):
+    """The local model's request queue is full; callers should use another backend."""
+
+
+class LlamaCppModel:
+    """A quantized GGUF instruct model in-process via llama-cpp-python.
+
+    The KV state right after each system prompt is saved once, so a request
+    with a known system prompt starts from that state and only prefills its
+    own turns. Not thread-safe: ``LocalLLM`` owns it from one worker thread.
+    """
+
+    def __init__(self, path=None, threads=None, context=None, max_prefixes=4, download=None):
+        path = path or Settings.LOCAL_LLM_MODEL_PATH
+        download = Settings.LOCAL_LLM_DOWNLOAD if download is None else download
+        if not path and not download:
+            # Never pull a multi-GB model just because the fallback was switched on
+            raise RuntimeError("No local LLM model: set LOCAL_LLM_MODEL_PATH, or LOCAL_LLM_DOWNLOAD=true "
+                               f"to fetch {Settings.LOCAL_LLM_FILE} from {Settings.LOCAL_LLM_REPO}")
+        from llama_cpp import Llama
+        options = dict(n_ctx=context or Settings.LOCAL_LLM_CONTEXT, n_threads=threads, verbose=False)
+        if path:
+            self.name = os.path.basename(path)
+            self.llm = Llama(model_path=path, **options)
+        else:
+            self.name = Settings.LOCAL_LLM_FILE
+            self.llm = Llama.from_pretrained(repo_id=Settings.LOCAL_LLM_REPO, filename=Settings.LOCAL_LLM_FILE, **options)
+        self.max_prefixes = max_prefixes
+        self._prefixes = OrderedDict()  # system prompt -> KV state after it
+        self._system = None  # system prompt the context currently starts with
+        self.prefix_hits = 0
+
+    def prime(self, system: str):
+        """Prefill ``system`` alone and keep the resulting KV state."""
+        self.llm.reset()
+        self.llm.create_chat_completion([{"role": "system", "content": system}], max_tokens=1)
+        self._prefixes[system] = self.llm.save_state()
+        self._system = system
+        while len(self._prefixes) > self.max_prefixes:
+            self._prefixes.popitem(last=False)
+
+    def reset(self, prefixes=False):
+        """Clear the context, and with ``prefixes`` the saved system-prompt states too."""
+        self.llm.reset()
+        self._system = None
+        if prefixes:
+            self._prefixes.clear()
+
+    def stream(self, messages, max_tokens, temperature):
+        system = messages[0]["content"] if messages and messages[0]["role"] == "system" else None
+        if system is None:
+            self._system = None
+        elif system != self._system:
+            if system in self._prefixes:
+                # Only a restored state counts as a hit; a context that still starts with
+                # this prompt is left to llama.cpp's own longest-matching-prefix reuse
+                self._prefixes.move_to_end(system)
+                self.llm.load_state(self._prefixes[system])
+                self._system = system
+                self.prefix_hits += 1
+            else:
+                self.prime(system)
+        chunks = self.llm.create_chat_completion(messages, max_tokens=max_tokens, temperature=temperature, stream=True)
+        for chunk in chunks:
+            delta = chunk["choices"][0]["delta"].get("content")
+            if delta:
+                yield delta
+
+
+class _Request:
+    __slots__ = ("messages", "emit", "cancelled", "queued_at")
+
+    def __init__(self, messages, emit):
+        self.messages = messages
+        self.emit = emit
+        self.cancelled = threading.Event()
+        self.queued_at = time.perf_counter()
+
+
+class LocalLLM:
+    """One shared local model serving chat requests from a bounded queue.
+
+    A single worker thread owns the model and generates one answer at a
+    time, using all ``threads`` for it; up to ``max_queue`` further requests
+    wait their turn and anything beyond that is rejected with
+    ``LocalLLMBusy`` so the router can fail over instead of piling up.
+    """
+
+    def __init__(self, model=None, max_queue=None, max_tokens=150, temperature=0.0):
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.error = None
+        self.load_seconds = None
+        self.requests = 0
+        self.rejected = 0
+        self.tokens = 0
+        self.decode_seconds = 0.0
+        self.ttfts = deque(maxlen=Settings.LLM_STATS_WINDOW)
+        self._queue = queue.Queue(maxsize=Settings.LOCAL_LLM_MAX_QUEUE if max_queue is None else max_queue)
+        self._load_lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._worker_lock = threading.Lock()
+        self._worker = None
+
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None
+
+    def load(self, prime=()):
+        """Load the model once (thread-safe) and prefill the given system prompts."""
+        if self.model is None:
+            with self._load_lock:
+                if self.model is None:
+                    threads = Settings.LOCAL_LLM_THREADS or os.cpu_count() or 1
+                    print(f"🔄 Loading local LLM ({threads} threads)...")
+                    start = time.monotonic()
+                    try:
+                        model = LlamaCppModel(threads=threads)
+                    except Exception as e:
+                        self.error = e
+                        raise
+                    self.load_seconds = time.monotonic() - start
+                    self.model = model
+                    print(f"✅ Local LLM '{model.name}' ready in {self.load_seconds:.1f}s")
+        with self._model_lock:
+            for system in prime:
+                self.model.prime(system)
+        return self.model
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._work, name="local-llm", daemon=True)
+                self._worker.start()
+
+    def submit(self, messages, emit) -> _Request:
+        """Queue ``messages``; ``emit`` is called from the worker with each delta, then ``None``
+        (done) or an exception."""
+        if self.error is not None:
+            raise RuntimeError(f"Local LLM failed to load: {self.error}")
+        self._ensure_worker()
+        request = _Request(messages, emit)
+        try:
+            self._queue.put_nowait(request)
+        except queue.Full:
+            with self._stats_lock:
+                self.rejected += 1
+            raise LocalLLMBusy(f"{self._queue.maxsize} requests already waiting for the local LLM")
+        return request
+
+    async def astream(self, messages):
+        """Async iterator of text deltas; leaving early cancels generation at the next token."""
+        loop = asyncio.get_running_loop()
+        deltas = asyncio.Queue()
+
+        def emit(item):
+            try:
+                loop.call_soon_threadsafe(deltas.put_nowait, item)
+            except RuntimeError:
+                pass  # The consumer's loop is gone
+
+        request = self.submit(messages, emit)
+        try:
+            while (item := await deltas.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            request.cancelled.set()
+
+    def _work(self):
+        while True:
+            request = self._queue.get()
+            if request.cancelled.is_set():
+                request.emit(None)
+                continue
+            try:
+                self._generate(request)
+                request.emit(None)
+            except Exception as e:
+                request.emit(e)
+
+    def _generate(self, request):
+        model = self.load()
+        first_at = None
+        tokens = 0
+        with self._model_lock:
+            for delta in model.stream(request.messages, self.max_tokens, self.temperature):
+                if request.cancelled.is_set():
+                    break
+                if first_at is None:
+                    first_at = time.perf_counter()
+                tokens += 1
+                request.emit(delta)
+        with self._stats_lock:
+            self.requests += 1
+            if first_at is not None:
+                self.ttfts.append(first_at - request.queued_at)
+                self.tokens += tokens - 1
+                self.decode_seconds += time.perf_counter() - first_at
+
+    def metrics(self) -> dict:
+        with self._stats_lock:
+            ttfts = list(self.ttfts)
+            return {
+                "requests": self.requests,
+                "rejected": self.rejected,
+                "queued": self._queue.qsize(),
+                "prefix_hits": getattr(self.model, "prefix_hits", 0),
+                "ttft_p50_ms": float(np.percentile(ttfts, 50)) * 1000 if ttfts else None,
+                # Decode speed after the first token (which the TTFT already covers)
+                "tokens_per_s": self.tokens / self.decode_seconds if self.decode_seconds else None,
+            }
+
+
+def local_llm_configured() -> bool:
+    """Whether the local fallback is enabled, installed and has a model it may load."""
+    return (Settings.LOCAL_LLM_ENABLED and importlib.util.find_spec("llama_cpp") is not None
+            and bool(Settings.LOCAL_LLM_MODEL_PATH or Settings.LOCAL_LLM_DOWNLOAD))
+
+
+def get_local_llm() -> LocalLLM:
+    """Process-wide local model; it loads on first use or via ``load``."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = LocalLLM()
+    return _engine
@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+import numpy as np
+from config.settings import Settings
+from src.components.tts_pipeline import split_sentences
+
+SAMPLE_RATE = 16000
+# Raw little-endian int16 mono; the rate travels in the name like ElevenLabs' output formats
+PCM_FORMAT = f"pcm_{SAMPLE_RATE}"
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def to_pcm16(samples) -> bytes:
+    """float32 samples in [-1, 1] → little-endian int16 bytes."""
+    samples = np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0)
+    return (samples * 32767.0).astype("<i2").tobytes()
+
+
+def load_speaker_embedding(path=None, index=None) -> np.ndarray:
+    """The 512-d x-vector SpeechT5 speaks with, cached as ``.npy`` after the first download."""
+    path = path or Settings.LOCAL_TTS_SPEAKER_PATH
+    if os.path.exists(path):
+        return np.load(path).astype(np.float32)
+    from datasets import load_dataset
+    index = Settings.LOCAL_TTS_SPEAKER_INDEX if index is None else index
+    xvectors = load_dataset("Matthijs/cmu-arctic-xvectors", split="validation")
+    embedding = np.asarray(xvectors[index]["xvector"], dtype=np.float32)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    np.save(path, embedding)
+    return embedding
+
+
+class SpeechT5Voice:
+    """SpeechT5 acoustic model + HiFi-GAN vocoder on CPU with one fixed speaker."""
+
+    samplerate = SAMPLE_RATE
+
+    def __init__(self, model_name=None, vocoder_name=None, speaker_path=None, threads=None):
+        import torch
+        from transformers import SpeechT5ForTextToSpeech, SpeechT5HifiGan, SpeechT5Processor
+        self._torch = torch
+        if threads:
+            # Process-wide in torch; the semantic-cache encoder shares these threads
+            torch.set_num_threads(threads)
+        model_name = model_name or Settings.LOCAL_TTS_MODEL
+        self.processor = SpeechT5Processor.from_pretrained(model_name)
+        self.model = SpeechT5ForTextToSpeech.from_pretrained(model_name).eval()
+        self.vocoder = SpeechT5HifiGan.from_pretrained(vocoder_name or Settings.LOCAL_TTS_VOCODER).eval()
+        self.speaker = torch.from_numpy(load_speaker_embedding(speaker_path)).unsqueeze(0)
+
+    def __call__(self, text: str) -> np.ndarray:
+        inputs = self.processor(text=text, return_tensors="pt")
+        with self._torch.inference_mode():
+            speech = self.model.generate_speech(inputs["input_ids"], self.speaker, vocoder=self.vocoder)
+        return speech.numpy().astype(np.float32)
+
+
+class LocalTTS:
+    """One shared local voice with a bounded number of concurrent syntheses.
+
+    The model is loaded once per process (``load`` is thread-safe) and every
+    session's TTS uses it. Long text is synthesized sentence by sentence so
+    ``stream`` can hand out the first PCM chunk while the rest is generated.
+    """
+
+    def __init__(self, voice=None, workers=None, threads=None):
+        cores = os.cpu_count() or 1
+        self.workers = workers or Settings.LOCAL_TTS_WORKERS or 1
+        self.threads = threads or Settings.LOCAL_TTS_THREADS or max(1, cores // self.workers)
+        self.voice = voice
+        self.load_seconds = None
+        self.sentences = 0
+        self.audio_seconds = 0.0
+        self.compute_seconds = 0.0
+        self._load_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers)
+
+    @property
+    def loaded(self) -> bool:
+        return self.voice is not None
+
+    @property
+    def samplerate(self) -> int:
+        return getattr(self.voice, "samplerate", SAMPLE_RATE)
+
+    def load(self, warmup=True):
+        """Load the voice once (thread-safe) and synthesize a word to warm it up."""
+        if self.voice is not None:
+            return self.voice
+        with self._load_lock:
+            if self.voice is None:
+                print(f"🔄 Loading local TTS '{Settings.LOCAL_TTS_MODEL}' ({self.threads} threads)...")
+                start = time.monotonic()
+                voice = SpeechT5Voice(threads=self.threads)
+                if warmup:
+                    voice("Hello.")
+                self.load_seconds = time.monotonic() - start
+                self.voice = voice
+                print(f"✅ Local TTS ready in {self.load_seconds:.1f}s")
+        return self.voice
+
+    def synthesize(self, text: str) -> np.ndarray:
+        """float32 audio at ``samplerate`` for one sentence."""
+        voice = self.load()
+        with self._slots:
+            start = time.perf_counter()
+            audio = voice(text)
+            elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.sentences += 1
+            self.compute_seconds += elapsed
+            self.audio_seconds += len(audio) / self.samplerate
+        return audio
+
+    def stream(self, text: str):
+        """Yield int16 PCM chunks, one per sentence of ``text``."""
+        for sentence in split_sentences(text):
+            yield to_pcm16(self.synthesize(sentence))
+
+    def synthesize_pcm(self, text: str) -> bytes:
+        return b"".join(self.stream(text))
+
+    def metrics(self) -> dict:
+        with self._stats_lock:
+            return {
+                "sentences": self.sentences,
+                "audio_seconds": self.audio_seconds,
+                "compute_seconds": self.compute_seconds,
+                # Below 1.0 the voice speaks faster than it is heard
+                "real_time_factor": self.compute_seconds / self.audio_seconds if self.audio_seconds else None,
+            }
+
+
+def get_local_tts() -> LocalTTS:
+    """Process-wide local voice; the model itself loads on first use or via ``load``."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = LocalTTS()
+    return _engine
@@ -1,50 +1,45 @@
 # src/components/openai_stt.py
 from openai import OpenAI
-import sounddevice as sd
-import numpy as np
-import io
-import tempfile
-import wave
 from dotenv import load_dotenv
 import os
 
+from src.components.audio_capture import MicrophoneStream
+from src.components.audio_encoding import AudioEncoder
+from src.core.transport import get_transport
+
 load_dotenv()
 
 class OpenAISTT:
     def __init__(self):
-        self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        transport = get_transport()
+        self.client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=transport.client("openai"),
+            timeout=transport.timeout,
+        )
+        self.mic = MicrophoneStream(samplerate=16000)
+        self.encoder = AudioEncoder()
         print("✅ OpenAI STT Ready (v1.0+)")
 
     def record_and_transcribe(self, duration=15):
         print(f"🎙️ Recording for {duration} seconds...")
-        audio = sd.rec(int(duration * 16000), samplerate=16000, channels=1, dtype='float32')
-        sd.wait()
+        if duration > self.mic.buffer_seconds:
+            self.mic = MicrophoneStream(samplerate=16000, buffer_seconds=duration)
+        audio = self.mic.record(duration)
         print("✅ Recording finished")
         
-        # Save to temporary WAV file
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            with wave.open(tmp_file.name, 'wb') as wav_file:
-                wav_file.setnchannels(1)
-                wav_file.setsampwidth(2)
-                wav_file.setframerate(16000)
-                wav_file.writeframes((audio * 32767).astype(np.int16).tobytes())
-            
-            print("📝 Transcribing with OpenAI Whisper API...")
-            
-            # New v1.0+ API syntax
-            with open(tmp_file.name, "rb") as audio_file:
-                transcript = self.client.audio.transcriptions.create(
-                    model="whisper-1",
-                    file=audio_file,
-                    language="hi",  # Hindi
-                    response_format="text"
-                )
-            
-            # Clean up temporary file
-            os.unlink(tmp_file.name)
-            
-            print(f"👉 Result: {transcript}")
-            return transcript
+        print("📝 Transcribing with OpenAI Whisper API...")
+        
+        # New v1.0+ API syntax
+        transcript = self.client.audio.transcriptions.create(
+            model="whisper-1",
+            file=self.encoder.encode(audio, 16000),
+            language="hi",  # Hindi
+            response_format="text"
+        )
+        
+        print(f"👉 Result: {transcript}")
+        return transcript
 
 # Usage
 if __name__ == "__main__":
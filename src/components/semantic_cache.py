@@ -0,0 +1,281 @@
+import threading
+import numpy as np
+from config.settings import Settings
+
+_cache = None
+_cache_lock = threading.Lock()
+_preload = None
+
+
+class SentenceEmbedder:
+    """Small multilingual sentence encoder on CPU (mean-pooled, L2-normalized)."""
+
+    def __init__(self, model_name=None, threads=None):
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+        self._torch = torch
+        self.model_name = model_name or Settings.SEMANTIC_CACHE_MODEL
+        if threads:
+            torch.set_num_threads(threads)
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+        self.model = AutoModel.from_pretrained(self.model_name).eval()
+        self.dim = self.model.config.hidden_size
+
+    def embed(self, texts) -> np.ndarray:
+        batch = self.tokenizer(list(texts), padding=True, truncation=True, max_length=64, return_tensors="pt")
+        with self._torch.inference_mode():
+            hidden = self.model(**batch).last_hidden_state
+            mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1e-9)
+            pooled = self._torch.nn.functional.normalize(pooled, dim=-1)
+        return pooled.numpy().astype(np.float32)
+
+
+class VectorIndex:
+    """Fixed-capacity cosine index over unit vectors with LRU slot reuse.
+
+    Small indexes are searched exhaustively. Past ``ivf_min`` entries a
+    k-means coarse quantizer is trained so single lookups only score the
+    ``nprobe`` closest lists. New entries are appended to their nearest list
+    and the quantizer is retrained once the index has doubled.
+    Batch lookups probe the centroids for every query in one matrix product
+    and score each probed list once for all the queries that chose it.
+    Every entry carries an integer ``label``; searches given one only score
+    entries with that label, so a nearer entry under another label never
+    hides a match.
+    """
+
+    def __init__(self, dim, capacity, nprobe=8, ivf_min=4096):
+        self.dim = dim
+        self.capacity = capacity
+        self.nprobe = nprobe
+        self.ivf_min = ivf_min
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._labels = np.zeros(capacity, dtype=np.int64)
+        self._tick = 0
+        self._size = 0
+        self._centroids = None
+        self._list_slots = None  # slots sorted by coarse list
+        self._list_offsets = None
+        self._pending = None  # per-list slots added since the last training
+        self._pending_count = 0
+        self._trained_size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _touch(self, slot):
+        self._tick += 1
+        self._last_used[slot] = self._tick
+
+    def add(self, vector: np.ndarray, label=0):
+        """Store ``vector``; returns ``(slot, evicted)`` where ``evicted`` is a reused slot or ``None``."""
+        evicted = None
+        if self._size < self.capacity:
+            slot = self._size
+            self._size += 1
+        else:
+            slot = int(np.argmin(self._last_used[:self._size]))
+            evicted = slot
+        self._vectors[slot] = vector
+        self._labels[slot] = label
+        self._touch(slot)
+        if self._centroids is None:
+            if self._size >= self.ivf_min:
+                self.train()
+        elif self._pending_count >= self._trained_size:
+            self.train()
+        else:
+            # A reused slot stays listed under its old centroid too; that only adds a candidate
+            self._pending[int(np.argmax(self._centroids @ vector))].append(slot)
+            self._pending_count += 1
+        return slot, evicted
+
+    def train(self, iterations=8, seed=0):
+        """Fit the coarse quantizer on the current entries."""
+        n = self._size
+        nlist = max(1, int(4 * np.sqrt(n)))
+        rng = np.random.default_rng(seed)
+        sample = self._vectors[rng.choice(n, size=min(n, nlist * 32), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assign, kind="stable")
+            counts = np.bincount(assign, minlength=nlist)
+            filled = counts > 0
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[filled]
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            centroids[filled] = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-9)
+        assign = np.argmax(self._vectors[:n] @ centroids.T, axis=1)
+        self._list_slots = np.argsort(assign, kind="stable")
+        self._list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=nlist))])
+        self._centroids = centroids
+        self._pending = [[] for _ in range(nlist)]
+        self._pending_count = 0
+        self._trained_size = n
+
+    def _list(self, c):
+        """Slots filed under coarse list ``c``, including those added since training."""
+        slots = self._list_slots[self._list_offsets[c]:self._list_offsets[c + 1]]
+        if self._pending[c]:
+            slots = np.concatenate([slots, np.asarray(self._pending[c], dtype=np.int64)])
+        return slots
+
+    def _labelled(self, slots, label):
+        return slots if label is None else slots[self._labels[slots] == label]
+
+    def _candidates(self, vector):
+        if self._centroids is None:
+            return np.arange(self._size)
+        nprobe = min(self.nprobe, len(self._centroids))
+        probe = np.argpartition(self._centroids @ vector, -nprobe)[-nprobe:]
+        return np.concatenate([self._list(c) for c in probe])
+
+    def search(self, vector: np.ndarray, label=None):
+        """Best ``(slot, cosine)`` for one unit vector among entries with ``label``
+        (any, if ``None``), or ``(None, -1.0)`` when there are none."""
+        candidates = self._labelled(self._candidates(vector), label)
+        if not len(candidates):
+            return None, -1.0
+        scores = self._vectors[candidates] @ vector
+        i = int(np.argmax(scores))
+        best, score = int(candidates[i]), float(scores[i])
+        self._touch(best)
+        return best, score
+
+    def search_batch(self, vectors: np.ndarray, label=None):
+        """Best slot and cosine for each row of ``vectors`` among entries with
+        ``label`` (slot -1 when nothing was found)."""
+        n = len(vectors)
+        if self._centroids is None:
+            slots = self._labelled(np.arange(self._size), label)
+            if not len(slots):
+                return np.full(n, -1), np.full(n, -1.0, dtype=np.float32)
+            scores = vectors @ self._vectors[slots].T
+            top = np.argmax(scores, axis=1)
+            best, best_scores = slots[top], scores[np.arange(n), top]
+        else:
+            nprobe = min(self.nprobe, len(self._centroids))
+            probes = np.argpartition(vectors @ self._centroids.T, -nprobe, axis=1)[:, -nprobe:]
+            # (list, query) pairs grouped by list, so each list is read once per batch
+            lists = probes.ravel()
+            queries = np.repeat(np.arange(n), nprobe)
+            order = np.argsort(lists, kind="stable")
+            lists, queries = lists[order], queries[order]
+            bounds = np.concatenate([[0], np.flatnonzero(np.diff(lists)) + 1, [len(lists)]])
+            best = np.full(n, -1, dtype=np.int64)
+            best_scores = np.full(n, -1.0, dtype=np.float32)
+            for lo, hi in zip(bounds[:-1], bounds[1:]):
+                slots = self._labelled(self._list(lists[lo]), label)
+                if not len(slots):
+                    continue
+                rows = queries[lo:hi]
+                scores = vectors[rows] @ self._vectors[slots].T
+                top = np.argmax(scores, axis=1)
+                top_scores = scores[np.arange(len(rows)), top]
+                better = (top_scores > best_scores[rows]) | (best[rows] < 0)
+                best[rows[better]] = slots[top[better]]
+                best_scores[rows[better]] = top_scores[better]
+        for slot in best:
+            if slot >= 0:
+                self._touch(int(slot))
+        return best, best_scores
+
+
+class SemanticCache:
+    """Returns a past answer when a new query is a close paraphrase of an old one."""
+
+    def __init__(self, embedder=None, threshold=None, capacity=None):
+        self.embedder = embedder or SentenceEmbedder()
+        self.threshold = Settings.SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.index = VectorIndex(self.embedder.dim, capacity or Settings.SEMANTIC_CACHE_MAX_ENTRIES)
+        self._entries = {}  # slot -> (namespace, answer)
+        self._labels = {}  # namespace -> index label
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _match(self, slot, score, namespace):
+        if slot is None or slot < 0 or score < self.threshold:
+            return None
+        entry = self._entries.get(int(slot))
+        if entry is None or entry[0] != namespace:
+            return None
+        return entry[1]
+
+    def lookup(self, query: str, namespace=""):
+        vector = self.embedder.embed([query])[0]
+        with self._lock:
+            label = self._labels.get(namespace)
+            slot, score = self.index.search(vector, label) if label is not None else (None, -1.0)
+            answer = self._match(slot, score, namespace)
+            if answer is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return answer
+
+    def lookup_batch(self, queries, namespace=""):
+        vectors = self.embedder.embed(queries)
+        with self._lock:
+            label = self._labels.get(namespace)
+            if label is None:
+                slots, scores = np.full(len(queries), -1), np.full(len(queries), -1.0)
+            else:
+                slots, scores = self.index.search_batch(vectors, label)
+            answers = [self._match(slot, score, namespace) for slot, score in zip(slots, scores)]
+            found = sum(answer is not None for answer in answers)
+            self.hits += found
+            self.misses += len(answers) - found
+        return answers
+
+    def add(self, query: str, answer: str, namespace=""):
+        if not answer or not answer.strip():
+            return
+        vector = self.embedder.embed([query])[0]
+        with self._lock:
+            label = self._labels.setdefault(namespace, len(self._labels))
+            slot, _ = self.index.add(vector, label)
+            self._entries[slot] = (namespace, answer)
+
+    def metrics(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.index),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def get_semantic_cache():
+    """Process-wide semantic cache, or ``None`` when disabled or the model can't load."""
+    global _cache
+    if not Settings.SEMANTIC_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = SemanticCache()
+            except Exception as e:
+                print(f"⚠️ Semantic cache disabled: {e}")
+                Settings.SEMANTIC_CACHE_ENABLED = False
+                return None
+    return _cache
+
+
+def preload_semantic_cache():
+    """Load the embedding model on a background thread; ``get_semantic_cache`` waits for it."""
+    global _preload
+    if not Settings.SEMANTIC_CACHE_ENABLED or _cache is not None:
+        return
+    with _cache_lock:
+        if _preload is None:
+            _preload = threading.Thread(target=get_semantic_cache, name="semantic-cache-preload", daemon=True)
+            _preload.start()
+
+
+def loaded_semantic_cache():
+    """The cache if it is enabled and already loaded, else ``None`` (never blocks)."""
+    return _cache if Settings.SEMANTIC_CACHE_ENABLED else None
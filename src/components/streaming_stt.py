@@ -0,0 +1,156 @@
+import asyncio
+import re
+from dataclasses import dataclass
+import numpy as np
+from config.settings import Settings
+
+
+@dataclass
+class Hypothesis:
+    committed: str  # stable text that will not change any more
+    partial: str  # latest guess for the audio after the committed prefix
+    is_final: bool = False
+
+    @property
+    def text(self) -> str:
+        return f"{self.committed} {self.partial}".strip()
+
+
+def _norm(word: str) -> str:
+    return re.sub(r"[^\w]", "", word.lower())
+
+
+class StreamingTranscriber:
+    """Incremental Faster-Whisper transcription over a sliding window.
+
+    Audio is decoded every ``step_seconds``. Words that two consecutive
+    hypotheses agree on are committed and the audio behind them is dropped
+    from the window, so committed speech is never decoded again.
+    """
+
+    def __init__(self, pool, samplerate=16000, language="hi", step_seconds=None,
+                 window_seconds=None, on_partial=None):
+        self.pool = pool
+        self.samplerate = samplerate
+        self.language = language
+        self.step = int((step_seconds or Settings.STREAMING_STT_STEP_SECONDS) * samplerate)
+        self.on_partial = on_partial
+        self._window = np.zeros(int((window_seconds or Settings.STREAMING_STT_WINDOW_SECONDS) * samplerate),
+                                dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self._filled = 0
+        self._offset = 0  # samples already dropped in front of the window
+        self._pending = 0  # samples fed since the last decode
+        self._committed = []  # [(start, end, word)] with absolute sample positions
+        self._tentative = []
+
+    @property
+    def committed_text(self) -> str:
+        return "".join(word for _, _, word in self._committed).strip()
+
+    def feed(self, audio: np.ndarray):
+        """Append audio; returns a new ``Hypothesis`` when a decode ran, else ``None``."""
+        audio = np.asarray(audio, dtype=np.float32)
+        while len(audio):
+            space = len(self._window) - self._filled
+            if space == 0:
+                self._commit(self._tentative)
+                if self._filled == len(self._window):
+                    # Nothing stable to cut at; drop the oldest half rather than stall
+                    self._trim(len(self._window) // 2)
+                continue
+            n = min(space, len(audio))
+            self._window[self._filled:self._filled + n] = audio[:n]
+            self._filled += n
+            self._pending += n
+            audio = audio[n:]
+        if self._pending >= self.step:
+            return self._decode(final=False)
+        return None
+
+    def finish(self) -> Hypothesis:
+        """Decode whatever is left and commit it all."""
+        return self._decode(final=True)
+
+    def stream(self, chunks):
+        """Generator over ``chunks`` yielding partial hypotheses and a final one."""
+        for chunk in chunks:
+            hypothesis = self.feed(chunk)
+            if hypothesis is not None:
+                yield hypothesis
+        yield self.finish()
+
+    async def astream(self, chunks):
+        """Async ``stream`` over an async iterable of audio chunks.
+
+        Only the feeds that trigger a decode (and ``finish``) leave the event
+        loop for a worker thread; buffering a frame is cheap enough inline.
+        """
+        async for chunk in chunks:
+            if self._pending + len(chunk) >= self.step:
+                hypothesis = await asyncio.to_thread(self.feed, chunk)
+            else:
+                hypothesis = self.feed(chunk)
+            if hypothesis is not None:
+                yield hypothesis
+        yield await asyncio.to_thread(self.finish)
+
+    def _decode(self, final: bool) -> Hypothesis:
+        self._pending = 0
+        words = self._run() if self._filled else []
+        if final:
+            self._commit(words)
+            self._tentative = []
+        else:
+            agreed = 0
+            for old, new in zip(self._tentative, words):
+                if _norm(old[2]) != _norm(new[2]):
+                    break
+                agreed += 1
+            self._commit(words[:agreed])
+            self._tentative = words[agreed:]
+        hypothesis = Hypothesis(
+            committed=self.committed_text,
+            partial="".join(word for _, _, word in self._tentative).strip(),
+            is_final=final,
+        )
+        if self.on_partial:
+            self.on_partial(hypothesis)
+        return hypothesis
+
+    def _run(self):
+        prompt = self.committed_text[-200:] or None
+        with self.pool.acquire() as model:
+            segments, _ = model.transcribe(
+                self._window[:self._filled],
+                language=self.language,
+                beam_size=1,
+                word_timestamps=True,
+                condition_on_previous_text=False,
+                initial_prompt=prompt,
+            )
+            words = []
+            for segment in segments:
+                for word in segment.words or []:
+                    start = self._offset + int(word.start * self.samplerate)
+                    end = self._offset + int(word.end * self.samplerate)
+                    words.append((start, end, word.word))
+        return words
+
+    def _commit(self, words):
+        if not words:
+            return
+        self._committed.extend(words)
+        self._tentative = self._tentative[len(words):] if self._tentative[:len(words)] == words else []
+        self._trim(words[-1][1] - self._offset)
+
+    def _trim(self, cut: int):
+        cut = max(0, min(cut, self._filled))
+        if cut == 0:
+            return
+        remaining = self._filled - cut
+        self._window[:remaining] = self._window[cut:self._filled]
+        self._filled = remaining
+        self._offset += cut
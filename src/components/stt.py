@@ -1,42 +1,176 @@
-import sounddevice as sd
+import asyncio
+import importlib.util
+import threading
 import numpy as np
-from groq import Groq
-from faster_whisper import WhisperModel
 from config.settings import Settings
+from src.core.tracing import traced
+from src.core.transport import get_transport
+from src.components.audio_capture import MicrophoneStream
+from src.components.vad import VADEndpointer
+from src.components.audio_encoding import AudioEncoder
+from src.components.whisper_pool import get_whisper_pool, preload_whisper
+from src.components.whisper_batching import get_batch_scheduler
+from src.components.streaming_stt import StreamingTranscriber
+
+
+def _async_groq():
+    from groq import AsyncGroq
+    transport = get_transport()
+    return AsyncGroq(
+        api_key=Settings.GROQ_API_KEY,
+        http_client=transport.async_client("groq"),
+        timeout=transport.timeout,
+    )
+
+
+def _backend(stt):
+    return "groq" if stt.primary else "faster-whisper"
+
+
+def _audio_bytes(args, result):
+    return args[1].nbytes
+
 
 class STT:
     def __init__(self):
-        self.client = Groq(api_key=Settings.GROQ_API_KEY)
-        try:
-            # Test Groq Whisper
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._warming = None
+        if Settings.GROQ_API_KEY and importlib.util.find_spec("groq") is not None:
             self.model = "whisper-large-v3"
             self.primary = True
-        except Exception as e:
-            print("⚠️ Falling back to Faster-Whisper:", e)
-            self.model = WhisperModel("medium")
+            # The Groq SDK is slow to import; the client is built off the startup path
+            self._warming = threading.Thread(target=self.wait_ready, name="stt-client-preload", daemon=True)
+        else:
+            print("⚠️ Falling back to Faster-Whisper:",
+                  "groq not installed" if Settings.GROQ_API_KEY else "GROQ_API_KEY not configured")
+            # Shared across every STT instance; loads and warms up in the background
+            self.model = preload_whisper()
             self.primary = False
+        # Utterances from concurrent sessions are decoded together by the local backend
+        self.batcher = None if self.primary else get_batch_scheduler()
+        self.mic = None
+        # Endpointers keep VAD state, so each thread (session) gets its own
+        self._local = threading.local()
+        self.encoder = AudioEncoder()
+        if self._warming is not None:
+            self._warming.start()
 
+    @property
+    def client(self):
+        with self._client_lock:
+            if self._client is None:
+                from groq import Groq
+                transport = get_transport()
+                self._client = Groq(
+                    api_key=Settings.GROQ_API_KEY,
+                    http_client=transport.client("groq"),
+                    timeout=transport.timeout,
+                )
+        return self._client
+
+    @property
+    def ready(self) -> bool:
+        """False while the Groq client or local Faster-Whisper model is still loading in the background."""
+        return self._client is not None if self.primary else self.model.model is not None
+
+    def wait_ready(self):
+        if self.primary:
+            self.client
+        else:
+            self.model.load()
+
+    @property
+    def async_client(self):
+        """AsyncGroq client for the running event loop."""
+        return get_transport().sdk_client("groq", _async_groq)
+
+    def microphone(self, fs=16000, min_seconds=0):
+        """Return the shared input stream, growing its ring buffer if needed."""
+        seconds = max(Settings.AUDIO_BUFFER_SECONDS, min_seconds)
+        if self.mic is None or self.mic.samplerate != fs or self.mic.buffer_seconds < seconds:
+            if self.mic is not None and self.mic.active:
+                raise RuntimeError("Microphone is in use, cannot resize its buffer")
+            self.mic = MicrophoneStream(
+                samplerate=fs,
+                frame_ms=Settings.AUDIO_FRAME_MS,
+                buffer_seconds=seconds,
+            )
+        return self.mic
+
+    def stream(self, duration=None, fs=16000, start=None):
+        """Yield fixed-size microphone frames as they are captured.
+
+        ``start`` is an absolute ring-buffer position to replay from, e.g. the
+        onset of speech that interrupted the assistant."""
+        mic = self.microphone(fs)
+        with mic:
+            yield from mic.frames(duration, start=start)
+
+    @traced("stt.record", payload=lambda args, result: result[0].nbytes)
     def record(self, duration=10, fs=16000):
         print("🎙️ Recording...")
-        audio = sd.rec(int(duration * fs), samplerate=fs, channels=1, dtype='float32')
-        sd.wait()
-        return audio.flatten(), fs
+        audio = self.microphone(fs, min_seconds=duration).record(duration)
+        return audio, fs
+
+    @traced("stt.listen", payload=lambda args, result: result.audio.nbytes if result is not None else 0)
+    def listen(self, max_duration=15, fs=16000, on_audio=None, start=None):
+        """Record until the speaker goes quiet; returns an ``Utterance`` or ``None``."""
+        endpointer = getattr(self._local, "endpointer", None)
+        if endpointer is None or endpointer.samplerate != fs:
+            endpointer = self._local.endpointer = VADEndpointer(samplerate=fs)
+        print("🎙️ Listening...")
+        return endpointer.listen(self.stream(max_duration, fs, start), max_duration, on_audio=on_audio)
 
+    def streaming_transcriber(self, fs=16000, on_partial=None):
+        """Incremental transcriber for the local backend, ``None`` when using Groq."""
+        if self.primary:
+            return None
+        return StreamingTranscriber(self.model, samplerate=fs, language="hi", on_partial=on_partial)
+
+    @traced("stt.transcribe", provider=_backend, payload=_audio_bytes)
     def transcribe(self, audio, fs=16000):
         if self.primary:
-            with open("temp.wav", "wb") as f:
-                import soundfile as sf
-                sf.write(f, audio, fs)
             resp = self.client.audio.transcriptions.create(
-                file=open("temp.wav", "rb"),
+                file=self.encoder.encode(audio, fs),
                 model=self.model,
                 language="hi"
             )
             return resp.text
+        elif self.batcher is not None:
+            return self.batcher.transcribe(audio)
         else:
-            text, info = self.model.transcribe(audio, beam_size=5, language="hi")
-            # Optional Urdu → Hindi remap
-            if info.language == "ur":
-                info.language = "hi"
-            return text
+            return self._transcribe_local(audio)
+
+    def _transcribe_local(self, audio):
+        text, info = self.model.transcribe(audio, beam_size=5, language="hi")
+        # Optional Urdu → Hindi remap
+        if info.language == "ur":
+            info.language = "hi"
+        return text
 
+    def transcribe_files(self, paths, output, workers=None):
+        """Batch-transcribe recorded audio files into JSONL with the local Faster-Whisper model.
+
+        Runs in a process pool (one model per worker) and resumes if ``output``
+        already holds some of the files; see ``src.pipeline.batch_transcribe``.
+        """
+        from src.pipeline.batch_transcribe import BatchTranscriber
+        pool = get_whisper_pool()
+        transcriber = BatchTranscriber(model_size=pool.size, workers=workers, device=pool.device,
+                                       compute_type=pool.compute_type, language="hi")
+        return transcriber.run(paths, output)
+
+    @traced("stt.transcribe", provider=_backend, payload=_audio_bytes)
+    async def atranscribe(self, audio, fs=16000):
+        """Async ``transcribe``: awaits Groq directly, runs Faster-Whisper in a worker thread."""
+        if self.primary:
+            resp = await self.async_client.audio.transcriptions.create(
+                file=self.encoder.encode(audio, fs),
+                model=self.model,
+                language="hi"
+            )
+            return resp.text
+        if self.batcher is not None:
+            return await self.batcher.atranscribe(audio)
+        return await asyncio.to_thread(self._transcribe_local, audio)
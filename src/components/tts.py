@@ -1,152 +1,399 @@
-import os
+import asyncio
+import importlib.util
+import inspect
+import threading
+import time
 from config.settings import Settings
+from src.components.audio_player import create_audio_player
+from src.components.local_tts import PCM_FORMAT, get_local_tts
+from src.components.tts_cache import DEFAULT_PHRASES, get_tts_cache
+from src.components.tts_pipeline import split_sentences
+from src.core.circuit_breaker import CircuitBreaker, get_health_monitor
+from src.core.tracing import span, traced
+from src.core.transport import get_transport
+
+TTSOPENAI_URL = "https://api.ttsopenai.com/v1"
+ELEVENLABS_URL = "https://api.elevenlabs.io/v1"
+# Remote providers (SDK clients, health probes, disk cache)
+CLOUD_PROVIDERS = ("ttsopenai", "elevenlabs")
+# Providers that return audio bytes (pipelined); the rest play directly
+AUDIO_PROVIDERS = CLOUD_PROVIDERS + ("local",)
+AUDIO_FORMATS = {"ttsopenai": "mp3", "elevenlabs": "mp3", "local": PCM_FORMAT}
 
 class TTS:
     def __init__(self):
-        self.primary = None
-        self.fallback_used = False
+        self.player = create_audio_player()
+        self.cache = get_tts_cache()
+        self.transport = get_transport()
+        self.voice_id = "JBFqnCBsd6RMkjVDRZzb"  # Using your original voice ID
+        self.model_id = "eleven_multilingual_v2"
+        # Every usable provider in order of preference, each behind its own breaker
+        self.providers = []
+        self.breakers = {}
+        self._clients = {}
+        self._clients_lock = threading.Lock()
+        self.local = None
+
+        # Try TTSOpenAI first; SDK clients are built lazily (see ``_client``)
+        if not Settings.TTSOPENAI_API_KEY:
+            print("⚠️ TTSOpenAI not available: API key not configured")
+        elif importlib.util.find_spec("openai") is None:
+            print("⚠️ TTSOpenAI not available: openai not installed")
+        else:
+            self._add_provider("ttsopenai", probe=self._probe_ttsopenai)
+            print("✅ TTSOpenAI available for TTS")
+
+        # Fallback to ElevenLabs
+        if not Settings.ELEVENLABS_API_KEY:
+            print("⚠️ ElevenLabs not available: API key not configured")
+        elif importlib.util.find_spec("elevenlabs") is None:
+            print("⚠️ ElevenLabs not available: elevenlabs not installed")
+        else:
+            self._add_provider("elevenlabs", probe=self._probe_elevenlabs)
+            print("✅ ElevenLabs available for TTS")
 
-        # Try TTSOpenAI first
+        # Offline fallback → neural voice on CPU, shared by every session
+        if not Settings.LOCAL_TTS_ENABLED:
+            print("⚠️ Local TTS disabled")
+        elif any(importlib.util.find_spec(name) is None for name in ("torch", "transformers")):
+            print("⚠️ Local TTS not available: torch/transformers not installed")
+        else:
+            self.local = get_local_tts()
+            self._add_provider("local")
+            print("✅ Local SpeechT5 TTS available")
+
+        # Last fallback → System TTS
         try:
-            from openai import OpenAI
-            # Check if API key is provided
-            if hasattr(Settings, 'TTSOPENAI_API_KEY') and Settings.TTSOPENAI_API_KEY:
-                self.ttsopenai_client = OpenAI(
-                    api_key=Settings.TTSOPENAI_API_KEY,
-                    base_url="https://api.ttsopenai.com/v1"
-                )
-                # Test the connection with a simple call
-                self.primary = "ttsopenai"
-                print("✅ Using TTSOpenAI for TTS")
-            else:
-                print("⚠️ TTSOpenAI API key not found")
-                raise Exception("TTSOpenAI API key not configured")
+            # Try pyttsx3 for system TTS (no API required)
+            import pyttsx3
+            self.tts_engine = pyttsx3.init()
+            self._add_provider("system")
+            print("✅ System TTS available as final fallback")
         except Exception as e:
-            print(f"⚠️ TTSOpenAI not available: {e}")
-            self.primary = None
+            print(f"⚠️ System TTS not available: {e}")
+            if not self.providers:
+                print("❌ No TTS services available")
 
-        # Fallback to ElevenLabs
-        if not self.primary:
-            try:
-                from elevenlabs.client import ElevenLabs
-                # Check if API key is provided
-                if hasattr(Settings, 'ELEVENLABS_API_KEY') and Settings.ELEVENLABS_API_KEY:
-                    self.eleven = ElevenLabs(api_key=Settings.ELEVENLABS_API_KEY)
-                    self.voice_id = "JBFqnCBsd6RMkjVDRZzb"  # Using your original voice ID
-                    self.model_id = "eleven_multilingual_v2"
-                    self.primary = "elevenlabs"
-                    print("✅ Using ElevenLabs as TTS fallback")
+        if self.primary:
+            print(f"✅ Using {self.primary} for TTS")
+        # Importing the SDKs (and loading a local voice) is slow; do it off the startup path
+        self._warming = threading.Thread(target=self.wait_ready, name="tts-client-preload", daemon=True)
+        self._warming.start()
+
+    def _client(self, provider):
+        """Synchronous SDK client for a cloud provider, created on first use."""
+        with self._clients_lock:
+            client = self._clients.get(provider)
+            if client is None:
+                if provider == "ttsopenai":
+                    from openai import OpenAI
+                    client = OpenAI(
+                        api_key=Settings.TTSOPENAI_API_KEY,
+                        base_url=TTSOPENAI_URL,
+                        http_client=self.transport.client("ttsopenai"),
+                        timeout=self.transport.timeout,
+                    )
                 else:
-                    print("⚠️ ElevenLabs API key not found")
-                    raise Exception("ElevenLabs API key not configured")
+                    client = self._elevenlabs_client()
+                self._clients[provider] = client
+        return client
+
+    @property
+    def ttsopenai_client(self):
+        return self._client("ttsopenai")
+
+    @property
+    def eleven(self):
+        return self._client("elevenlabs")
+
+    @property
+    def _preload_local(self) -> bool:
+        """Load the local voice up front when it speaks first; as a fallback it loads on first use."""
+        return self.local is not None and (Settings.LOCAL_TTS_PRELOAD or self.providers[0] == "local")
+
+    @property
+    def ready(self) -> bool:
+        """False while cloud SDK clients (or the local voice) are still loading in the background."""
+        clients = all(name in self._clients for name in self.providers if name in CLOUD_PROVIDERS)
+        return clients and (self.local.loaded if self._preload_local else True)
+
+    def wait_ready(self):
+        for name in self.providers:
+            if name in CLOUD_PROVIDERS:
+                try:
+                    self._client(name)
+                except Exception as e:
+                    print(f"⚠️ TTS {name} client failed to load: {e}")
+                    self.breakers[name].record_failure(e)
+        if self._preload_local:
+            try:
+                self.local.load()
             except Exception as e:
-                print(f"⚠️ ElevenLabs not available: {e}")
-                self.primary = None
+                print(f"⚠️ Local TTS failed to load: {e}")
+                self.breakers["local"].record_failure(e)
+
+    def _add_provider(self, name, probe=None):
+        breaker = CircuitBreaker(f"TTS {name}", probe=probe)
+        self.providers.append(name)
+        self.breakers[name] = breaker
+        get_health_monitor().register(breaker)
+
+    @property
+    def primary(self):
+        """Most preferred provider whose circuit isn't open."""
+        for name in self.providers:
+            if self.breakers[name].available:
+                return name
+        return None
+
+    def _candidates(self, audio_only=False, exclude=()):
+        """Providers to try for one request, skipping open circuits without waiting on them."""
+        for name in self.providers:
+            if (audio_only and name not in AUDIO_PROVIDERS) or name in exclude:
+                continue
+            if self.breakers[name].allow():
+                yield name
 
-        # Last fallback → System TTS or Hugging Face
-        if not self.primary:
+    def _probe_ttsopenai(self):
+        r = self.transport.client("ttsopenai").get(
+            f"{TTSOPENAI_URL}/models", headers={"Authorization": f"Bearer {Settings.TTSOPENAI_API_KEY}"}
+        )
+        return r.status_code < 500
+
+    def _probe_elevenlabs(self):
+        r = self.transport.client("elevenlabs").get(
+            f"{ELEVENLABS_URL}/models", headers={"xi-api-key": Settings.ELEVENLABS_API_KEY}
+        )
+        return r.status_code < 500
+
+    def _elevenlabs_client(self):
+        from elevenlabs.client import ElevenLabs
+        return ElevenLabs(
+            api_key=Settings.ELEVENLABS_API_KEY,
+            httpx_client=self.transport.client("elevenlabs"),
+        )
+
+    def _cache_key(self, text: str, provider=None):
+        provider = provider or self.primary
+        if provider == "ttsopenai":
+            return self.cache.key(provider, "alloy", "tts-1", "mp3", text)
+        if provider == "elevenlabs":
+            return self.cache.key(provider, self.voice_id, self.model_id, "mp3_44100_128", text)
+        return None
+
+    def _cached(self, text, provider):
+        key = self._cache_key(text, provider) if self.cache else None
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return key, cached
+        return key, None
+
+    def synthesize(self, text: str, exclude=()):
+        """Return ``(audio_bytes, format)`` from the first healthy cloud or local
+        provider not in ``exclude``, or ``None`` when only system TTS (direct
+        playback) is left.
+
+        Cloud clips are served from the shared disk cache when possible."""
+        for provider in self._candidates(audio_only=True, exclude=exclude):
+            key, cached = self._cached(text, provider)
+            if cached is not None:
+                # Didn't exercise the provider; leave a half-open trial for real traffic
+                self.breakers[provider].release()
+                return cached, "mp3"
             try:
-                # Try pyttsx3 for system TTS (no API required)
-                import pyttsx3
-                self.tts_engine = pyttsx3.init()
-                self.primary = "system"
-                print("✅ Using System TTS as final fallback")
+                with span("tts.synthesize", provider=provider) as request:
+                    audio_bytes = self._request_audio(text, provider)
+                    request.set(bytes=len(audio_bytes or b""))
             except Exception as e:
-                print(f"⚠️ System TTS not available: {e}")
-                try:
-                    from transformers import pipeline
-                    import torch
-                    self.tts = pipeline("text-to-speech", model="microsoft/speecht5_tts")
-                    self.primary = "huggingface"
-                    print("✅ Using Hugging Face TTS as final fallback")
-                except Exception as e:
-                    print(f"❌ No TTS services available: {e}")
-                    self.primary = None
+                print(f"⚠️ TTS {provider} failed, failing over: {e}")
+                self.breakers[provider].record_failure(e)
+                continue
+            self.breakers[provider].record_success()
+            if key and audio_bytes:
+                self.cache.put(key, audio_bytes)
+            return audio_bytes, AUDIO_FORMATS[provider]
+        return None
+
+    def _request_audio(self, text: str, provider=None):
+        provider = provider or self.primary
+        if provider == "ttsopenai":
+            response = self.ttsopenai_client.audio.speech.create(
+                model="tts-1",
+                voice="alloy",
+                input=text
+            )
+            return response.read()
+
+        if provider == "elevenlabs":
+            response = self.eleven.text_to_speech.convert(
+                text=text,
+                voice_id=self.voice_id,
+                model_id=self.model_id,
+                output_format="mp3_44100_128",
+            )
+            # Convert generator to bytes
+            return b"".join(response)
+
+        if provider == "local":
+            return self.local.synthesize_pcm(text)
+
+        return None
+
+    def _async_client(self, provider):
+        """Async SDK client for ``provider`` on the running event loop."""
+        def build():
+            if provider == "ttsopenai":
+                from openai import AsyncOpenAI
+                return AsyncOpenAI(
+                    api_key=Settings.TTSOPENAI_API_KEY,
+                    base_url=TTSOPENAI_URL,
+                    http_client=self.transport.async_client("ttsopenai"),
+                    timeout=self.transport.timeout,
+                )
+            from elevenlabs.client import AsyncElevenLabs
+            return AsyncElevenLabs(
+                api_key=Settings.ELEVENLABS_API_KEY,
+                httpx_client=self.transport.async_client("elevenlabs"),
+            )
+        return self.transport.sdk_client(provider, build)
 
-    def speak(self, text: str):
-        if not self.primary:
+    async def _arequest_audio(self, text, provider):
+        if provider == "local":
+            return await asyncio.to_thread(self.local.synthesize_pcm, text)
+        client = self._async_client(provider)
+        if provider == "ttsopenai":
+            response = await client.audio.speech.create(model="tts-1", voice="alloy", input=text)
+            return response.content
+        stream = client.text_to_speech.convert(
+            text=text,
+            voice_id=self.voice_id,
+            model_id=self.model_id,
+            output_format="mp3_44100_128",
+        )
+        if inspect.isawaitable(stream):
+            stream = await stream
+        return b"".join([chunk async for chunk in stream])
+
+    async def asynthesize(self, text: str):
+        """Async ``synthesize`` using the async TTSOpenAI/ElevenLabs clients."""
+        for provider in self._candidates(audio_only=True):
+            key, cached = self._cached(text, provider)
+            if cached is not None:
+                self.breakers[provider].release()
+                return cached, "mp3"
+            try:
+                with span("tts.synthesize", provider=provider) as request:
+                    audio_bytes = await self._arequest_audio(text, provider)
+                    request.set(bytes=len(audio_bytes or b""))
+            except asyncio.CancelledError:
+                self.breakers[provider].release()
+                raise
+            except Exception as e:
+                print(f"⚠️ TTS {provider} failed, failing over: {e}")
+                self.breakers[provider].record_failure(e)
+                continue
+            self.breakers[provider].record_success()
+            if key and audio_bytes:
+                await asyncio.to_thread(self.cache.put, key, audio_bytes)
+            return audio_bytes, AUDIO_FORMATS[provider]
+        return None
+
+    def preseed(self, phrases=DEFAULT_PHRASES):
+        """Make sure the fixed greetings/prompts are in the audio cache."""
+        provider = self.primary
+        if not self.cache or self._cache_key("", provider) is None:
+            return 0
+        added = self.cache.seed(
+            phrases,
+            lambda phrase: self._cache_key(phrase, provider),
+            lambda phrase: self._request_audio(phrase, provider),
+        )
+        if added:
+            print(f"✅ Pre-cached {added} TTS phrases")
+        return added
+
+    @traced("tts.speak", provider=lambda self: self.primary, payload=lambda args, result: len(args[1].encode("utf-8")))
+    def speak(self, text: str, exclude=()):
+        """Speak ``text`` with the first provider that works, skipping those in ``exclude``."""
+        if not self.providers:
             print("❌ No TTS service available")
             return
 
-        try:
-            if self.primary == "ttsopenai":
-                response = self.ttsopenai_client.audio.speech.create(
-                    model="tts-1",
-                    voice="alloy",
-                    input=text
-                )
-                audio_bytes = response.read()
-                self._play_audio(audio_bytes, "mp3")
-                
-            elif self.primary == "elevenlabs":
-                response = self.eleven.text_to_speech.convert(
-                    text=text,
-                    voice_id=self.voice_id,
-                    model_id=self.model_id,
-                    output_format="mp3_44100_128",
-                )
-                # Convert generator to bytes
-                audio_bytes = b"".join(response)
-                self._play_audio(audio_bytes, "mp3")
-                
-            elif self.primary == "system":
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
-                
-            elif self.primary == "huggingface":
-                # Simple fallback - just print for now
-                print(f"🔊 [TTS would say]: {text}")
-                
-        except Exception as e:
-            print(f"❌ TTS error with {self.primary}: {e}")
-            # Try to fallback to next available service
-            self._fallback_speak(text)
-
-    def _fallback_speak(self, text: str):
-        """Fallback mechanism if primary TTS fails"""
-        if self.fallback_used:
-            print("❌ Fallback already used, cannot recover")
+        exclude = tuple(exclude)
+        if self.primary == "local" and "local" not in exclude:
+            rest = self._speak_local(text)
+            if rest == "":
+                return
+            if rest is not None:
+                # The sentences before the failure were heard; the local voice just failed
+                text, exclude = rest, exclude + ("local",)
+
+        result = self.synthesize(text, exclude=exclude)
+        if result is not None:
+            self._play_audio(*result)
             return
-            
-        self.fallback_used = True
-        
-        if self.primary == "ttsopenai":
-            print("🔄 Falling back to ElevenLabs...")
+
+        # No provider returned audio: speak directly with the system engine
+        for provider in self._candidates(exclude=exclude):
+            if provider in AUDIO_PROVIDERS:
+                self.breakers[provider].release()
+                continue
             try:
-                from elevenlabs.client import ElevenLabs
-                if hasattr(Settings, 'ELEVENLABS_API_KEY') and Settings.ELEVENLABS_API_KEY:
-                    self.eleven = ElevenLabs(api_key=Settings.ELEVENLABS_API_KEY)
-                    self.voice_id = "JBFqnCBsd6RMkjVDRZzb"
-                    self.model_id = "eleven_multilingual_v2"
-                    self.primary = "elevenlabs"
-                    self.speak(text)
-                    return
+                self.tts_engine.say(text)
+                self.tts_engine.runAndWait()
+                self.breakers[provider].record_success()
+                return
             except Exception as e:
-                print(f"❌ ElevenLabs fallback failed: {e}")
-        
-        # Final fallback to system TTS
-        print("🔄 Falling back to System TTS...")
+                print(f"❌ TTS error with {provider}: {e}")
+                self.breakers[provider].record_failure(e)
+        print(f"🔊 [TTS would say]: {text}")
+
+    def speak_direct(self, text: str):
+        """Speak ``text`` through direct-playback providers only, for when every
+        audio provider has already failed on it."""
+        return self.speak(text, exclude=AUDIO_PROVIDERS)
+
+    def _speak_local(self, text: str):
+        """Play the local voice sentence by sentence, queueing each chunk as soon as it is ready.
+
+        Returns the text still to be spoken: ``""`` once it has all been
+        played, the sentences from the failed one on if synthesis broke off,
+        or ``None`` if the local circuit is open and nothing was tried.
+        """
+        breaker = self.breakers["local"]
+        if not breaker.allow():
+            return None
+        sentences = split_sentences(text)
+        played = 0
+        last = None
         try:
-            import pyttsx3
-            self.tts_engine = pyttsx3.init()
-            self.primary = "system"
-            self.speak(text)
+            with span("tts.synthesize", provider="local") as request:
+                # LocalTTS.stream yields one chunk per sentence of the same split
+                for pcm in self.local.stream(text):
+                    if last is None:
+                        request.set(first_chunk_ms=(time.perf_counter() - request.start) * 1000)
+                    last = self.player.play(pcm, PCM_FORMAT, wait=False)
+                    played += 1
         except Exception as e:
-            print(f"❌ System TTS fallback failed: {e}")
-            print(f"🔊 [TTS would say]: {text}")
+            print(f"⚠️ TTS local failed after {played} of {len(sentences)} sentences, failing over: {e}")
+            breaker.record_failure(e)
+            if last is not None:
+                last.wait()
+            return " ".join(sentences[played:])
+        breaker.record_success()
+        if last is not None:
+            last.wait()
+        return ""
+
+    def health(self):
+        """Breaker state of every provider, in order of preference."""
+        return [self.breakers[name].snapshot() for name in self.providers]
 
+    @traced("tts.play", payload=lambda args, result: len(args[1]))
     def _play_audio(self, audio_bytes: bytes, format: str):
-        """Play audio bytes using appropriate player"""
-        filename = f"response.{format}"
-        with open(filename, "wb") as f:
-            f.write(audio_bytes)
-        
-        # Cross-platform audio playback
+        """Decode and play audio bytes in-process; returns once playback has finished"""
         try:
-            if os.name == 'nt':  # Windows
-                os.system(f"start {filename}")
-            elif os.name == 'posix':  # macOS/Linux
-                os.system(f"open {filename}" if sys.platform == "darwin" else f"xdg-open {filename}")
+            return self.player.play(audio_bytes, format)
         except Exception as e:
-            print(f"⚠️ Could not auto-play audio: {e}")
-            print(f"💡 Audio saved as: {filename}")
\ No newline at end of file
+            print(f"⚠️ Could not play audio: {e}")
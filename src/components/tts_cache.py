@@ -0,0 +1,156 @@
+import hashlib
+import mmap
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from config.settings import Settings
+
+# Phrases the assistant says on every session; seeded once so they never hit the API again
+DEFAULT_PHRASES = [
+    "Hello! I am your ZenTravel AI assistant. How can I help you with your travel plans today?",
+    "Sorry, I didn't catch that. Could you please repeat?",
+    "Sorry, something went wrong. Please try again.",
+]
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace so trivial variants share a clip."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+
+class TTSAudioCache:
+    """Content-addressed, size-bounded LRU cache of synthesized clips on disk.
+
+    Clips are stored as ``<sha256>.bin``; recency is kept in memory and mirrored
+    to file mtimes so the LRU order survives restarts. Reads are memory-mapped.
+    """
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or Settings.TTS_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else Settings.TTS_CACHE_MAX_MB * 1024 * 1024
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # key -> size, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_served = 0
+        self.evictions = 0
+        self._load_index()
+
+    @staticmethod
+    def key(provider, voice_id, model_id, output_format, text) -> str:
+        raw = "\x1f".join([str(provider), str(voice_id), str(model_id), str(output_format), normalize_text(text)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.bin")
+
+    def _load_index(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".bin"):
+                continue
+            stat = os.stat(os.path.join(self.directory, name))
+            entries.append((stat.st_mtime, name[:-4], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self.total_bytes += size
+
+    def get(self, key):
+        """Return a read-only ``mmap`` of the clip, or ``None`` on a miss."""
+        with self._lock:
+            size = self._index.get(key)
+            if size is None:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                clip = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)
+        except (OSError, ValueError):
+            # Deleted behind our back or empty; treat as a miss
+            with self._lock:
+                if self._index.pop(key, None) is not None:
+                    self.total_bytes -= size
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+            self.bytes_served += size
+        return clip
+
+    def put(self, key, data: bytes):
+        if not data or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            old = self._index.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old
+            self._index[key] = len(data)
+            self.total_bytes += len(data)
+            self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def seed(self, phrases, key_fn, synthesize_fn):
+        """Synthesize and store any ``phrases`` not already cached."""
+        added = 0
+        for phrase in phrases:
+            key = key_fn(phrase)
+            with self._lock:
+                if key in self._index:
+                    continue
+            result = synthesize_fn(phrase)
+            if result:
+                self.put(key, result)
+                added += 1
+        return added
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hit_rate,
+                "bytes_served": self.bytes_served,
+                "evictions": self.evictions,
+            }
+
+
+def get_tts_cache():
+    """Process-wide cache shared by every TTS instance, or ``None`` if disabled."""
+    global _cache
+    if not Settings.TTS_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = TTSAudioCache()
+    return _cache
@@ -0,0 +1,259 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import Settings
+
+# Sentence enders, including Devanagari danda/double danda and the "|" that
+# Hinglish typists use in place of a danda
+_TERMINALS = ".!?…।॥|\n"
+_SOFT = ",;:—"
+_CLOSERS = "\"')]}”’"
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "sr", "jr", "rs", "vs", "etc", "e.g", "i.e", "approx", "no", "km"}
+
+
+class SentenceChunker:
+    """Splits streamed text into speakable chunks at sentence/clause boundaries.
+
+    The first chunk is released at the first sentence end so audio can start
+    early; later chunks are at least ``min_chars`` long. Clauses are split at
+    ``, ; : —`` once a chunk reaches ``soft_chars`` and anything longer than
+    ``max_chars`` is cut at a word boundary.
+    """
+
+    def __init__(self, min_chars=None, soft_chars=None, max_chars=None):
+        self.min_chars = Settings.TTS_CHUNK_MIN_CHARS if min_chars is None else min_chars
+        self.soft_chars = Settings.TTS_CHUNK_SOFT_CHARS if soft_chars is None else soft_chars
+        self.max_chars = Settings.TTS_CHUNK_MAX_CHARS if max_chars is None else max_chars
+        self._buf = ""
+        self._emitted = 0
+
+    def feed(self, text: str) -> list:
+        self._buf += text or ""
+        return self._drain(final=False)
+
+    def flush(self) -> list:
+        chunks = self._drain(final=True)
+        rest = self._buf.strip()
+        self._buf = ""
+        if rest:
+            chunks.append(rest)
+            self._emitted += 1
+        return chunks
+
+    def _drain(self, final: bool) -> list:
+        chunks = []
+        while True:
+            cut = self._find_cut(final)
+            if cut is None:
+                return chunks
+            chunk = self._buf[:cut].strip()
+            self._buf = self._buf[cut:]
+            if chunk:
+                chunks.append(chunk)
+                self._emitted += 1
+
+    def _find_cut(self, final: bool):
+        buf = self._buf
+        min_chars = 1 if self._emitted == 0 else self.min_chars
+        i = 0
+        while i < len(buf):
+            ch = buf[i]
+            if ch in _TERMINALS:
+                j = i + 1
+                while j < len(buf) and buf[j] != "\n" and (buf[j] in _TERMINALS or buf[j] in _CLOSERS):
+                    j += 1
+                if j == len(buf) and not final:
+                    # Need the next character to tell "3.5" or "Rs." from a sentence end
+                    break
+                boundary = ch == "\n" or j == len(buf) or buf[j].isspace()
+                if boundary and not (ch == "." and self._is_abbreviation(buf, i)):
+                    if len(buf[:j].strip()) >= min_chars:
+                        return j
+                i = j
+                continue
+            if ch in _SOFT and i + 1 >= self.soft_chars and i + 1 < len(buf) and buf[i + 1].isspace():
+                return i + 1
+            i += 1
+
+        if len(buf) > self.max_chars:
+            space = buf.rfind(" ", 0, self.max_chars)
+            return space if space > 0 else self.max_chars
+        return None
+
+    @staticmethod
+    def _is_abbreviation(buf: str, dot: int) -> bool:
+        words = buf[:dot].split()
+        if not words:
+            return False
+        word = words[-1].lstrip("(\"'").lower()
+        return word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+
+def split_sentences(text: str, **kwargs) -> list:
+    chunker = SentenceChunker(**kwargs)
+    return chunker.feed(text) + chunker.flush()
+
+
+class PipelinedTTS:
+    """Speaks a stream of text chunk by chunk while later chunks synthesize.
+
+    Up to ``max_parallel`` chunks are synthesized concurrently; playback runs
+    on its own thread and always follows the original chunk order. Clips go to
+    ``player`` (e.g. a session's ``AudioChannel``), defaulting to ``tts.player``.
+    """
+
+    def __init__(self, tts, max_parallel=None, player=None):
+        self.tts = tts
+        self._player = player
+        self.max_parallel = max_parallel or Settings.TTS_MAX_PARALLEL
+        self.first_audio_at = None
+        self.last_ttfa = None
+        self.cancelled_chunks = 0
+
+    @property
+    def player(self):
+        return self._player or self.tts.player
+
+    def speak(self, text: str):
+        return self.speak_stream([text])
+
+    def speak_stream(self, deltas) -> str:
+        """Speak text deltas (e.g. from ``LLMEngine.stream_query``); returns the full text."""
+        start = time.monotonic()
+        self.first_audio_at = None
+        self.last_ttfa = None
+        chunker = SentenceChunker()
+        spoken = []
+        # Bounded: the producer blocks once max_parallel chunks are waiting to play
+        playback = queue.Queue(maxsize=self.max_parallel)
+        player = threading.Thread(target=self._playback_loop, args=(playback, start), daemon=True)
+        player.start()
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix="tts-synth") as pool:
+            def submit(chunk):
+                future = pool.submit(self.tts.synthesize, chunk)
+                playback.put((chunk, future))
+
+            try:
+                for delta in deltas:
+                    spoken.append(delta)
+                    for chunk in chunker.feed(delta):
+                        submit(chunk)
+                for chunk in chunker.flush():
+                    submit(chunk)
+            finally:
+                playback.put(None)
+                player.join()
+
+        return "".join(spoken)
+
+    def _stamp_first_audio(self, first, start):
+        """TTFA is when the player starts the first clip, not when its synthesis finished."""
+        if self.first_audio_at is None and first is not None and first.started_at is not None:
+            self.first_audio_at = first.started_at
+            self.last_ttfa = self.first_audio_at - start
+
+    def _playback_loop(self, playback, start):
+        first = last = None
+        while True:
+            item = playback.get()
+            if item is None:
+                break
+            chunk, future = item
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ TTS error with {self.tts.primary}: {e}")
+                result = None
+            try:
+                if result is None:
+                    # Every audio provider already failed this chunk: only direct playback is left
+                    if last is not None:
+                        last.wait()
+                    self.tts.speak_direct(chunk)
+                else:
+                    # Queue on the player and go decode the next chunk while this one plays
+                    audio_bytes, fmt = result
+                    last = self.player.play(audio_bytes, fmt, wait=False)
+                    first = first or last
+            except Exception as e:
+                print(f"⚠️ Playback failed for chunk: {e}")
+            self._stamp_first_audio(first, start)
+        if last is not None:
+            last.wait()
+        self._stamp_first_audio(first, start)
+
+    async def aspeak_stream(self, deltas) -> str:
+        """Async ``speak_stream`` over an async iterator of text deltas.
+
+        Synthesis tasks sit in a bounded ``asyncio.Queue`` between the
+        generation and playback stages, so at most ``max_parallel`` chunks are
+        in flight ahead of the one playing.
+        """
+        start = time.monotonic()
+        self.first_audio_at = None
+        self.last_ttfa = None
+        chunks = asyncio.Queue(maxsize=self.max_parallel)
+
+        async def generate():
+            chunker = SentenceChunker()
+            spoken = []
+            pending = []
+            try:
+                async for delta in deltas:
+                    spoken.append(delta)
+                    for chunk in chunker.feed(delta):
+                        task = asyncio.create_task(self.tts.asynthesize(chunk))
+                        pending.append(task)
+                        await chunks.put((chunk, task))
+                for chunk in chunker.flush():
+                    task = asyncio.create_task(self.tts.asynthesize(chunk))
+                    pending.append(task)
+                    await chunks.put((chunk, task))
+            except BaseException:
+                # Interrupted (e.g. barge-in): drop synthesis nobody will hear and stop generating
+                self.cancelled_chunks += sum(task.cancel() for task in pending)
+                if hasattr(deltas, "aclose"):
+                    await deltas.aclose()
+                raise
+            await chunks.put(None)
+            return "".join(spoken)
+
+        async def play():
+            first = last = None
+            while (item := await chunks.get()) is not None:
+                chunk, task = item
+                try:
+                    result = await task
+                except Exception as e:
+                    print(f"❌ TTS error with {self.tts.primary}: {e}")
+                    result = None
+                try:
+                    if result is None:
+                        if last is not None:
+                            await asyncio.to_thread(last.wait)
+                        await asyncio.to_thread(self.tts.speak_direct, chunk)
+                    else:
+                        audio_bytes, fmt = result
+                        last = await asyncio.to_thread(self.player.play, audio_bytes, fmt, False)
+                        first = first or last
+                except Exception as e:
+                    print(f"⚠️ Playback failed for chunk: {e}")
+                self._stamp_first_audio(first, start)
+            if last is not None:
+                await asyncio.to_thread(last.wait)
+            self._stamp_first_audio(first, start)
+
+        generating = asyncio.create_task(generate())
+        playing = asyncio.create_task(play())
+        try:
+            text = await generating
+            await playing
+        except BaseException:
+            generating.cancel()
+            playing.cancel()
+            await asyncio.gather(generating, playing, return_exceptions=True)
+            raise
+        return text
@@ -0,0 +1,195 @@
+import time
+from dataclasses import dataclass
+import numpy as np
+from config.settings import Settings
+
+
+class SileroVAD:
+    """Speech probability per 512-sample window (16 kHz) using silero-vad."""
+
+    window_size = 512
+
+    def __init__(self, samplerate=16000):
+        import torch
+        from silero_vad import load_silero_vad
+        self._torch = torch
+        self.samplerate = samplerate
+        self.window_size = 512 if samplerate == 16000 else 256
+        self.model = load_silero_vad()
+
+    def reset(self):
+        self.model.reset_states()
+
+    def __call__(self, window: np.ndarray) -> float:
+        with self._torch.no_grad():
+            return self.model(self._torch.from_numpy(window), self.samplerate).item()
+
+
+class EnergyVAD:
+    """RMS energy detector used when silero-vad/torch are not available."""
+
+    window_size = 480
+
+    def __init__(self, samplerate=16000, floor=0.01):
+        self.samplerate = samplerate
+        self.floor = floor
+
+    def reset(self):
+        pass
+
+    def __call__(self, window: np.ndarray) -> float:
+        rms = float(np.sqrt(np.mean(window * window)))
+        return min(1.0, rms / (2 * self.floor))
+
+
+def load_vad(samplerate=16000):
+    try:
+        return SileroVAD(samplerate)
+    except Exception as e:
+        print(f"⚠️ Silero VAD not available, using energy detector: {e}")
+        return EnergyVAD(samplerate)
+
+
+@dataclass
+class Utterance:
+    audio: np.ndarray
+    samplerate: int
+    speech_ended_at: float  # time.monotonic() when the last voiced window was captured
+    endpointed_at: float  # time.monotonic() when the trailing silence closed the turn
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / self.samplerate
+
+
+class VADEndpointer:
+    """Ends an utterance after a stretch of trailing silence.
+
+    Frames are copied into a preallocated buffer, so the caller can reuse its
+    frame arrays. Leading and trailing silence are trimmed down to ``pad_ms``.
+    """
+
+    def __init__(self, vad=None, samplerate=16000, threshold=None, silence_ms=None,
+                 min_speech_ms=None, pad_ms=None):
+        self.samplerate = samplerate
+        self.vad = vad or load_vad(samplerate)
+        self.threshold = Settings.VAD_THRESHOLD if threshold is None else threshold
+        self.silence_ms = Settings.VAD_SILENCE_MS if silence_ms is None else silence_ms
+        self.min_speech_ms = Settings.VAD_MIN_SPEECH_MS if min_speech_ms is None else min_speech_ms
+        self.pad_ms = Settings.VAD_PAD_MS if pad_ms is None else pad_ms
+        self._buffer = np.zeros(0, dtype=np.float32)
+
+    def _samples(self, ms):
+        return int(self.samplerate * ms / 1000)
+
+    def listen(self, frames, max_duration: float, on_audio=None):
+        """Consume ``frames`` until end of speech; ``None`` if nobody spoke.
+
+        ``on_audio`` receives the utterance incrementally (from the padded speech
+        start onwards) while it is still being spoken.
+        """
+        capacity = int(max_duration * self.samplerate)
+        if len(self._buffer) < capacity:
+            self._buffer = np.zeros(capacity, dtype=np.float32)
+        buf = self._buffer
+        window = self.vad.window_size
+        self.vad.reset()
+
+        filled = 0
+        scanned = 0
+        run = 0
+        speech_start = None
+        last_voiced = None
+        speech_ended_at = None
+        emitted = None
+        pad = self._samples(self.pad_ms)
+        silence_limit = self._samples(self.silence_ms)
+        min_speech = self._samples(self.min_speech_ms)
+
+        for frame in frames:
+            n = min(len(frame), capacity - filled)
+            buf[filled:filled + n] = frame[:n]
+            filled += n
+            now = time.monotonic()
+
+            while scanned + window <= filled:
+                voiced = self.vad(buf[scanned:scanned + window]) >= self.threshold
+                scanned += window
+                if voiced:
+                    run += window
+                    last_voiced = scanned
+                    speech_ended_at = now
+                    if speech_start is None and run >= min_speech:
+                        speech_start = scanned - run
+                else:
+                    run = 0
+
+            if on_audio is not None and speech_start is not None:
+                if emitted is None:
+                    emitted = max(0, speech_start - pad)
+                on_audio(buf[emitted:filled])
+                emitted = filled
+
+            if speech_start is not None and filled - last_voiced >= silence_limit:
+                break
+            if filled >= capacity:
+                break
+
+        if speech_start is None:
+            return None
+
+        start = max(0, speech_start - pad)
+        end = min(filled, last_voiced + pad)
+        return Utterance(
+            audio=buf[start:end].copy(),
+            samplerate=self.samplerate,
+            speech_ended_at=speech_ended_at,
+            endpointed_at=time.monotonic(),
+        )
+
+
+class BargeInDetector:
+    """Watches the live microphone while the assistant is talking.
+
+    Uses a stricter threshold and a minimum speech run than the endpointer so
+    that speaker bleed and short noises don't interrupt playback.
+    """
+
+    def __init__(self, vad=None, samplerate=16000, threshold=None, min_speech_ms=None):
+        self.samplerate = samplerate
+        self.vad = vad or load_vad(samplerate)
+        self.threshold = Settings.BARGE_IN_THRESHOLD if threshold is None else threshold
+        self.min_speech_ms = Settings.BARGE_IN_MIN_SPEECH_MS if min_speech_ms is None else min_speech_ms
+        self.detected_at = None
+
+    def watch(self, mic, stop, start=None):
+        """Block until the user starts talking or ``stop`` (a ``threading.Event``) is set.
+
+        Returns the absolute ring-buffer position where speech began, or
+        ``None`` if stopped first. ``detected_at`` records when it fired.
+        """
+        window = self.vad.window_size
+        min_speech = int(self.samplerate * self.min_speech_ms / 1000)
+        self.vad.reset()
+        self.detected_at = None
+        pos = mic.ring.position if start is None else start  # absolute position of buf[0]
+        buf = np.zeros(window + mic.frame_size, dtype=np.float32)
+        filled = 0
+        run = 0
+        for frame in mic.frames(start=pos):
+            if stop.is_set():
+                return None
+            buf[filled:filled + len(frame)] = frame
+            filled += len(frame)
+            while filled >= window:
+                if self.vad(buf[:window]) >= self.threshold:
+                    run += window
+                    if run >= min_speech:
+                        self.detected_at = time.monotonic()
+                        return pos + window - run
+                else:
+                    run = 0
+                buf[:filled - window] = buf[window:filled]
+                filled -= window
+                pos += window
+        return None
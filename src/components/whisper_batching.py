@@ -0,0 +1,152 @@
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+import numpy as np
+from config.settings import Settings
+from src.components.whisper_pool import get_whisper_pool
+
+SAMPLE_RATE = 16000
+# Silence between concatenated utterances so no window straddles two speakers
+_GAP = np.zeros(SAMPLE_RATE // 2, dtype=np.float32)
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class WhisperBatchScheduler:
+    """Dynamic batching in front of the local Whisper model.
+
+    Utterances submitted from concurrent sessions are gathered for up to
+    ``max_wait_ms`` (or until ``max_batch`` are waiting) and decoded in one
+    batched call; each caller gets its own text back through a future.
+    ``max_wait_ms`` is the latency a lone request may pay to find company,
+    so it trades single-session latency for throughput under load.
+    """
+
+    def __init__(self, pool=None, max_batch=None, max_wait_ms=None, language="hi", beam_size=5, batch_fn=None):
+        self.pool = pool or get_whisper_pool()
+        self.max_batch = max_batch or Settings.WHISPER_BATCH_SIZE
+        self.max_wait = (Settings.WHISPER_BATCH_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+        self.language = language
+        self.beam_size = beam_size
+        self.batch_fn = batch_fn or self._transcribe_batch
+        self._pipeline = None
+        self._queue = queue.Queue()
+        self.batches = 0
+        self.items = 0
+        self.queue_wait = 0.0
+        self._lock = threading.Lock()
+        # One batcher per model worker, so batches also run side by side
+        self._threads = [
+            threading.Thread(target=self._run, name=f"whisper-batcher-{i}", daemon=True)
+            for i in range(getattr(self.pool, "workers", 1))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, audio: np.ndarray) -> Future:
+        """Queue one utterance (16 kHz float32); the future resolves to its text."""
+        future = Future()
+        self._queue.put((np.asarray(audio, dtype=np.float32), future, time.monotonic()))
+        return future
+
+    def transcribe(self, audio, timeout=None) -> str:
+        return self.submit(audio).result(timeout)
+
+    async def atranscribe(self, audio) -> str:
+        return await asyncio.wrap_future(self.submit(audio))
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            # Whatever queued up while the last batch ran joins without waiting
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.monotonic()
+            audios = [audio for audio, _, _ in batch]
+            try:
+                texts = list(self.batch_fn(audios))
+                if len(texts) != len(batch):
+                    raise RuntimeError(f"batch of {len(batch)} utterances decoded to {len(texts)} texts")
+            except Exception as e:
+                # Every caller gets the error; none is left waiting on its future
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            with self._lock:
+                self.batches += 1
+                self.items += len(batch)
+                self.queue_wait += sum(started - queued for _, _, queued in batch)
+            for (_, future, _), text in zip(batch, texts):
+                future.set_result(text)
+
+    def _batched_pipeline(self):
+        if self._pipeline is None:
+            from faster_whisper import BatchedInferencePipeline
+            self._pipeline = BatchedInferencePipeline(model=self.pool.load())
+        return self._pipeline
+
+    def _transcribe_batch(self, audios):
+        """Decode several utterances in one batched pass.
+
+        The utterances are laid end to end and passed as explicit clips, so
+        faster-whisper batches them through the encoder/decoder together;
+        segments are mapped back to their utterance by start time.
+        """
+        if len(audios) == 1:
+            return [self.pool.transcribe(audios[0], beam_size=self.beam_size, language=self.language)[0]]
+
+        parts, clips, bounds = [], [], []
+        position = 0
+        for audio in audios:
+            parts += [audio, _GAP]
+            clips.append({"start": position / SAMPLE_RATE, "end": (position + len(audio)) / SAMPLE_RATE})
+            bounds.append((position + len(audio)) / SAMPLE_RATE)
+            position += len(audio) + len(_GAP)
+
+        texts = [[] for _ in audios]
+        with self.pool.acquire():
+            segments, _ = self._batched_pipeline().transcribe(
+                np.concatenate(parts),
+                language=self.language,
+                beam_size=self.beam_size,
+                batch_size=len(audios),
+                vad_filter=False,
+                clip_timestamps=clips,
+                without_timestamps=True,
+            )
+            for segment in segments:
+                index = int(np.searchsorted(bounds, segment.start, side="right"))
+                texts[min(index, len(audios) - 1)].append(segment.text)
+        return ["".join(pieces).strip() for pieces in texts]
+
+    def metrics(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": self.items / self.batches if self.batches else 0.0,
+            "mean_queue_ms": self.queue_wait / self.items * 1000 if self.items else 0.0,
+        }
+
+
+def get_batch_scheduler():
+    """Process-wide batching scheduler for the default Whisper model, or ``None`` if disabled."""
+    global _scheduler
+    if Settings.WHISPER_BATCH_SIZE <= 1:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = WhisperBatchScheduler()
+    return _scheduler
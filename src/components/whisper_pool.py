@@ -0,0 +1,109 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+from config.settings import Settings
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _default_device():
+    try:
+        import ctranslate2
+        return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+    except Exception:
+        return "cpu"
+
+
+class WhisperModelPool:
+    """One shared faster-whisper model with a bounded number of concurrent workers.
+
+    CTranslate2 runs ``num_workers`` decodes in parallel on a single copy of
+    the weights, so sessions share memory and are only limited by the semaphore.
+    """
+
+    def __init__(self, size, device, compute_type, workers, cpu_threads):
+        self.size = size
+        self.device = device
+        self.compute_type = compute_type
+        self.workers = workers
+        self.cpu_threads = cpu_threads
+        self.model = None
+        self.load_seconds = None
+        self._load_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(workers)
+
+    @property
+    def key(self):
+        return (self.size, self.device, self.compute_type)
+
+    def load(self, warmup=True):
+        """Load the model once (thread-safe) and run a dummy decode to warm it up."""
+        if self.model is not None:
+            return self.model
+        with self._load_lock:
+            if self.model is None:
+                from faster_whisper import WhisperModel
+                print(f"🔄 Loading Faster-Whisper '{self.size}' ({self.device}/{self.compute_type}, "
+                      f"{self.workers} workers x {self.cpu_threads} threads)...")
+                start = time.monotonic()
+                model = WhisperModel(
+                    self.size,
+                    device=self.device,
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                    num_workers=self.workers,
+                )
+                if warmup:
+                    segments, _ = model.transcribe(np.zeros(16000, dtype=np.float32), beam_size=1, language="hi")
+                    list(segments)
+                self.load_seconds = time.monotonic() - start
+                self.model = model
+                print(f"✅ Faster-Whisper ready in {self.load_seconds:.1f}s")
+        return self.model
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        """Reserve one decode worker for the duration of the block."""
+        model = self.load()
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No Faster-Whisper worker free after {timeout}s")
+        try:
+            yield model
+        finally:
+            self._slots.release()
+
+    def transcribe(self, audio, **kwargs):
+        """Transcribe ``audio`` and return ``(text, info)``."""
+        with self.acquire() as model:
+            segments, info = model.transcribe(audio, **kwargs)
+            # Segments are decoded lazily, so consume them while holding the worker
+            text = "".join(segment.text for segment in segments).strip()
+        return text, info
+
+
+def get_whisper_pool(size=None, device=None, compute_type=None, workers=None) -> WhisperModelPool:
+    """Return the process-wide pool for this model configuration, creating it on first use."""
+    size = size or Settings.WHISPER_MODEL_SIZE
+    device = device or Settings.WHISPER_DEVICE or _default_device()
+    compute_type = compute_type or Settings.WHISPER_COMPUTE_TYPE or ("int8" if device == "cpu" else "float16")
+    key = (size, device, compute_type)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            cores = os.cpu_count() or 1
+            workers = workers or Settings.WHISPER_WORKERS or max(1, min(4, cores // 4))
+            cpu_threads = max(1, cores // workers)
+            pool = WhisperModelPool(size, device, compute_type, workers, cpu_threads)
+            _pools[key] = pool
+    return pool
+
+
+def preload_whisper(**kwargs):
+    """Load and warm the default model in the background at startup."""
+    pool = get_whisper_pool(**kwargs)
+    thread = threading.Thread(target=pool.load, name="whisper-preload", daemon=True)
+    thread.start()
+    return pool
@@ -0,0 +1,146 @@
+import threading
+import time
+from config.settings import Settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one provider.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    callers skip the provider without waiting on it. It stays open for an
+    exponentially growing backoff. If a health ``probe`` is given, the probe
+    (not user traffic) decides when to try again: a passing probe moves the
+    breaker to half-open. Without a probe it goes half-open when the backoff
+    expires. In half-open exactly one real request is let through; its
+    outcome closes or re-opens the breaker.
+    """
+
+    def __init__(self, name, probe=None, failure_threshold=None, backoff=None, max_backoff=None):
+        self.name = name
+        self.probe = probe
+        self.failure_threshold = failure_threshold or Settings.BREAKER_FAILURE_THRESHOLD
+        self.base_backoff = Settings.BREAKER_BACKOFF_SECONDS if backoff is None else backoff
+        self.max_backoff = Settings.BREAKER_MAX_BACKOFF_SECONDS if max_backoff is None else max_backoff
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.retry_at = 0.0
+        self.last_error = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may go to this provider right now."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if self.probe is not None or time.monotonic() < self.retry_at:
+                    return False
+                self.state = HALF_OPEN
+                self._trial = False
+            if self._trial:
+                return False
+            self._trial = True
+            return True
+
+    @property
+    def available(self) -> bool:
+        """Non-consuming check: ``True`` unless the breaker is open."""
+        return self.state != OPEN
+
+    def release(self):
+        """Give back a request allowed by ``allow()`` that never reached the provider."""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"✅ {self.name} recovered, circuit closed")
+            self.state = CLOSED
+            self.failures = 0
+            self.opened = 0
+            self._trial = False
+
+    def record_failure(self, error=None):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error) if error is not None else None
+            self._trial = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open()
+
+    def _open(self):
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** self.opened)
+        self.opened += 1
+        self.state = OPEN
+        self.retry_at = time.monotonic() + backoff
+        print(f"🔌 {self.name} circuit open for {backoff:.0f}s: {self.last_error}")
+
+    def run_probe(self):
+        """Called by the health monitor once the backoff has expired."""
+        try:
+            healthy = self.probe()
+        except Exception as e:
+            healthy = False
+            self.last_error = str(e)
+        with self._lock:
+            if self.state != OPEN:
+                return
+            if healthy:
+                self.state = HALF_OPEN
+                self._trial = False
+            else:
+                self._open()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "state": self.state,
+                "failures": self.failures,
+                "retry_in": max(0.0, self.retry_at - time.monotonic()) if self.state == OPEN else 0.0,
+                "last_error": self.last_error,
+            }
+
+
+class HealthMonitor:
+    """Daemon thread that probes open breakers whose backoff has expired."""
+
+    def __init__(self, interval=None):
+        self.interval = interval or Settings.HEALTH_PROBE_INTERVAL_SECONDS
+        self._breakers = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+
+    def register(self, breaker):
+        if breaker.probe is None:
+            return
+        with self._lock:
+            self._breakers.append(breaker)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                due = [b for b in self._breakers if b.state == OPEN and time.monotonic() >= b.retry_at]
+            for breaker in due:
+                breaker.run_probe()
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Process-wide health monitor, started on first use."""
+    global _monitor
+    with _monitor_lock:
+        if _monitor is None:
+            _monitor = HealthMonitor()
+    return _monitor
@@ -0,0 +1,325 @@
+import contextvars
+import functools
+import inspect
+import json
+import math
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from config.settings import Settings
+
+_turn_id = contextvars.ContextVar("turn_id", default=None)
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+class Histogram:
+    """HDR-style log-linear histogram of durations in seconds.
+
+    Each power of two from 1 µs up is split into ``sub_buckets`` linear
+    buckets, so any percentile is within ~1/sub_buckets relative error while
+    recording is one ``frexp`` and a list increment.
+    """
+
+    min_value = 1e-6
+
+    def __init__(self, sub_buckets=32, max_exponent=32):
+        self.sub_buckets = sub_buckets
+        self.counts = [0] * (sub_buckets * max_exponent)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def _index(self, value):
+        mantissa, exponent = math.frexp(max(value, self.min_value) / self.min_value)  # mantissa in [0.5, 1)
+        index = (exponent - 1) * self.sub_buckets + int((mantissa - 0.5) * 2 * self.sub_buckets)
+        return min(index, len(self.counts) - 1)
+
+    def _upper_bound(self, index):
+        exponent, sub = divmod(index, self.sub_buckets)
+        return self.min_value * 2 ** exponent * (1 + (sub + 1) / self.sub_buckets)
+
+    def record(self, value):
+        index = self._index(value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+
+    def percentile(self, q):
+        with self._lock:
+            if not self.count:
+                return None
+            target = max(1, math.ceil(self.count * q / 100))
+            seen = 0
+            for index, n in enumerate(self.counts):
+                seen += n
+                if seen >= target:
+                    return min(self._upper_bound(index), self.max)
+        return self.max
+
+
+class Span:
+    """One timed stage; ``start``/``duration`` come from the monotonic ``perf_counter``."""
+
+    __slots__ = ("name", "turn_id", "wall", "start", "duration", "attrs")
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.turn_id = _turn_id.get()
+        self.attrs = attrs
+        self.wall = time.time()
+        self.start = time.perf_counter()
+        self.duration = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self):
+        return {"ts": round(self.wall, 6), "turn": self.turn_id, "span": self.name, "duration_ms": round(self.duration * 1000, 3), **self.attrs}
+
+
+class Tracer:
+    """Collects spans into per-stage histograms and, optionally, a JSONL file.
+
+    File writes happen on a background thread so a span costs a couple of
+    ``perf_counter`` calls, a histogram increment and a queue put.
+    """
+
+    def __init__(self, path=None, keep=1000):
+        self.path = Settings.TRACE_PATH if path is None else path
+        self.histograms = {}
+        self.recent = deque(maxlen=keep)
+        self._lock = threading.Lock()
+        self._queue = None
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._queue = queue.SimpleQueue()
+            threading.Thread(target=self._write_loop, name="trace-writer", daemon=True).start()
+
+    def span(self, name, **attrs):
+        return _SpanContext(self, name, attrs)
+
+    def record(self, name, seconds, **attrs):
+        """Record a duration measured elsewhere (e.g. end of speech → first audio)."""
+        span = Span(name, attrs)
+        span.start -= seconds
+        self.finish(span)
+
+    def finish(self, span):
+        span.duration = time.perf_counter() - span.start
+        key = (span.name, span.attrs.get("provider"))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+        histogram.record(span.duration)
+        self.recent.append(span)
+        if self._queue is not None:
+            self._queue.put(span)
+
+    def _write_loop(self):
+        while True:
+            spans = [self._queue.get()]
+            while not self._queue.empty():
+                spans.append(self._queue.get())
+            self._file.write("".join(json.dumps(s.to_dict(), ensure_ascii=False, default=str) + "\n" for s in spans))
+            self._file.flush()
+
+    def summary(self):
+        """``{(stage, provider): {count, p50_ms, p95_ms, p99_ms, max_ms}}``."""
+        report = {}
+        for key, h in list(self.histograms.items()):
+            report[key] = {
+                "count": h.count,
+                "p50_ms": h.percentile(50) * 1000,
+                "p95_ms": h.percentile(95) * 1000,
+                "p99_ms": h.percentile(99) * 1000,
+                "max_ms": h.max * 1000,
+            }
+        return report
+
+    def prometheus(self):
+        """Prometheus text exposition: one summary per (stage, provider)."""
+        lines = [
+            "# HELP zen_stage_seconds Time spent in each pipeline stage",
+            "# TYPE zen_stage_seconds summary",
+        ]
+        for (stage, provider), h in sorted(self.histograms.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+            labels = f'stage="{stage}"' + (f',provider="{provider}"' if provider else "")
+            for q in (0.5, 0.95, 0.99):
+                lines.append(f'zen_stage_seconds{{{labels},quantile="{q}"}} {h.percentile(q * 100):.6f}')
+            lines.append(f"zen_stage_seconds_sum{{{labels}}} {h.sum:.6f}")
+            lines.append(f"zen_stage_seconds_count{{{labels}}} {h.count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port=None):
+        """Serve ``/metrics`` in Prometheus format on a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        tracer = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") != "/metrics":
+                    self.send_error(404)
+                    return
+                body = tracer.prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("0.0.0.0", port or Settings.METRICS_PORT), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        print(f"📈 Metrics at http://localhost:{server.server_address[1]}/metrics")
+        return server
+
+
+class _SpanContext:
+    __slots__ = ("tracer", "span")
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.span = Span(name, attrs)
+
+    def __enter__(self):
+        self.span.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.span.attrs["error"] = exc_type.__name__
+        self.tracer.finish(self.span)
+        return False
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer; starts the metrics endpoint if ``METRICS_PORT`` is set."""
+    global _tracer
+    if _tracer is not None:
+        return _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer()
+            if Settings.METRICS_PORT:
+                try:
+                    _tracer.serve()
+                except OSError as e:
+                    print(f"⚠️ Metrics endpoint not started: {e}")
+    return _tracer
+
+
+def span(name, **attrs):
+    """``with span("llm.query", provider="groq") as s: ...; s.set(bytes=n)``"""
+    return get_tracer().span(name, **attrs)
+
+
+class trace_turn:
+    """Give every span inside the block (including tasks and threads it starts) one turn ID."""
+
+    def __init__(self, turn_id=None):
+        self.turn_id = turn_id or uuid.uuid4().hex[:12]
+        self._token = None
+        self._span = None
+
+    def __enter__(self):
+        self._token = _turn_id.set(self.turn_id)
+        self._span = span("turn")
+        self._span.__enter__()
+        return self.turn_id
+
+    def __exit__(self, *exc):
+        try:
+            self._span.__exit__(*exc)
+        finally:
+            _turn_id.reset(self._token)
+        return False
+
+
+def _size(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def traced(name, provider=None, payload=None):
+    """Decorator that records a span per call.
+
+    ``provider(self)`` labels the span with the backend that served the call
+    (read when the call returns); ``payload(args, result)`` gives its payload
+    size in bytes, defaulting to the size of the result. Works on plain,
+    async and async-generator functions.
+    """
+
+    def label(s, args):
+        if provider is not None and args:
+            value = provider(args[0])
+            if value:
+                s.set(provider=value)
+
+    def record_payload(s, args, result):
+        size = payload(args, result) if payload else _size(result)
+        if size is not None:
+            s.set(bytes=size)
+
+    def decorate(fn):
+        if inspect.isasyncgenfunction(fn):
+            @functools.wraps(fn)
+            async def agen_wrapper(*args, **kwargs):
+                with span(name) as s:
+                    total = 0
+                    try:
+                        async for item in fn(*args, **kwargs):
+                            if "first_item_ms" not in s.attrs:
+                                s.set(first_item_ms=round((time.perf_counter() - s.start) * 1000, 3))
+                            total += _size(item) or 0
+                            yield item
+                    finally:
+                        s.set(bytes=total)
+                        label(s, args)
+            return agen_wrapper
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(name) as s:
+                    try:
+                        result = await fn(*args, **kwargs)
+                    finally:
+                        label(s, args)
+                    record_payload(s, args, result)
+                    return result
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name) as s:
+                try:
+                    result = fn(*args, **kwargs)
+                finally:
+                    label(s, args)
+                record_payload(s, args, result)
+                return result
+        return wrapper
+
+    return decorate
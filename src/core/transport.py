@@ -0,0 +1,197 @@
+import asyncio
+import threading
+import weakref
+import httpx
+from config.settings import Settings
+
+# Provider origins and default connection-pool sizes
+PROVIDERS = {
+    "groq": ("https://api.groq.com", 10),
+    "openai": ("https://api.openai.com", 10),
+    "ttsopenai": ("https://api.ttsopenai.com", 4),
+    "elevenlabs": ("https://api.elevenlabs.io", 4),
+    "perplexity": ("https://api.perplexity.ai", 4),
+}
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def _parse_limits(spec: str) -> dict:
+    """``"groq=8,elevenlabs=2"`` -> ``{"groq": 8, "elevenlabs": 2}``."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        limits[name.strip().lower()] = int(value)
+    return limits
+
+
+def _parse_overrides(spec: str) -> dict:
+    """``"groq=http://127.0.0.1:9001"`` -> ``{"groq": "http://127.0.0.1:9001"}``."""
+    overrides = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, origin = item.partition("=")
+        overrides[name.strip().lower()] = origin.strip()
+    return overrides
+
+
+def _redirect(origin: str):
+    """Request hook that sends every request to ``origin`` (scheme, host, port), keeping the path."""
+    target = httpx.URL(origin)
+
+    def rewrite(request):
+        request.url = request.url.copy_with(scheme=target.scheme, host=target.host, port=target.port)
+        request.headers["Host"] = target.netloc.decode("ascii")
+    return rewrite
+
+
+class HTTPTransport:
+    """Pooled keep-alive ``httpx`` clients, one pool per provider.
+
+    Every SDK client (Groq, OpenAI, TTSOpenAI, ElevenLabs) and the raw
+    Perplexity calls are handed these clients, so a TCP+TLS handshake is paid
+    once per connection instead of once per request. HTTP/2 is used when the
+    ``h2`` package is installed. Async clients are bound to an event loop, so
+    one is kept per (provider, loop). ``overrides`` sends a provider's traffic
+    to another origin, e.g. a local mock server in benchmarks.
+    """
+
+    def __init__(self, timeout=None, limits=None, http2=None, overrides=None):
+        self.timeout = timeout or httpx.Timeout(
+            Settings.HTTP_READ_TIMEOUT,
+            connect=Settings.HTTP_CONNECT_TIMEOUT,
+            pool=Settings.HTTP_CONNECT_TIMEOUT,
+        )
+        self.limits = {name: size for name, (_, size) in PROVIDERS.items()}
+        self.limits.update(_parse_limits(Settings.HTTP_PROVIDER_LIMITS) if limits is None else limits)
+        self.http2 = (Settings.HTTP2_ENABLED and _http2_available()) if http2 is None else http2
+        self.overrides = _parse_overrides(Settings.HTTP_PROVIDER_OVERRIDES) if overrides is None else overrides
+        self._clients = {}
+        self._async_clients = weakref.WeakKeyDictionary()  # loop -> {provider: client}
+        self._sdk_clients = weakref.WeakKeyDictionary()  # loop -> {name: SDK client}
+        self._lock = threading.Lock()
+
+    def _options(self, provider, asynchronous=False):
+        size = self.limits.get(provider, Settings.HTTP_MAX_CONNECTIONS)
+        options = {
+            "timeout": self.timeout,
+            "limits": httpx.Limits(
+                max_connections=size,
+                max_keepalive_connections=size,
+                keepalive_expiry=Settings.HTTP_KEEPALIVE_SECONDS,
+            ),
+            "http2": self.http2,
+        }
+        if provider in self.overrides:
+            rewrite = _redirect(self.overrides[provider])
+            if asynchronous:
+                async def arewrite(request):
+                    rewrite(request)
+                options["event_hooks"] = {"request": [arewrite]}
+            else:
+                options["event_hooks"] = {"request": [rewrite]}
+        return options
+
+    def client(self, provider: str) -> httpx.Client:
+        """Shared synchronous client for ``provider``."""
+        with self._lock:
+            client = self._clients.get(provider)
+            if client is None:
+                client = httpx.Client(**self._options(provider))
+                self._clients[provider] = client
+        return client
+
+    def async_client(self, provider: str) -> httpx.AsyncClient:
+        """Shared async client for ``provider`` on the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, {})
+            client = clients.get(provider)
+            if client is None:
+                client = httpx.AsyncClient(**self._options(provider, asynchronous=True))
+                clients[provider] = client
+        return client
+
+    def sdk_client(self, name: str, factory):
+        """SDK client wrapping ``async_client`` for the running event loop.
+
+        ``factory()`` builds it on first use on each loop; caching the SDK
+        client once per component would pin the first loop's HTTP client.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._sdk_clients.get(loop, {}).get(name)
+        if client is None:
+            # Built outside the lock: the factory calls async_client()
+            built = factory()
+            with self._lock:
+                client = self._sdk_clients.setdefault(loop, {}).setdefault(name, built)
+        return client
+
+    def preconnect(self, providers=None):
+        """Open a warm connection to each provider so the first turn skips the handshake.
+
+        Any HTTP response counts as success; the status code doesn't matter.
+        Returns the providers that connected.
+        """
+        connected = []
+        threads = []
+        for provider in providers or configured_providers():
+            def warm(provider=provider):
+                try:
+                    self.client(provider).head(PROVIDERS[provider][0])
+                    connected.append(provider)
+                except Exception as e:
+                    print(f"⚠️ Could not pre-connect to {provider}: {e}")
+            thread = threading.Thread(target=warm, name=f"preconnect-{provider}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        for thread in threads:
+            thread.join()
+        return connected
+
+    async def apreconnect(self, providers=None):
+        """Async ``preconnect`` that warms the clients of the running loop."""
+        async def warm(provider):
+            try:
+                await self.async_client(provider).head(PROVIDERS[provider][0])
+                return provider
+            except Exception as e:
+                print(f"⚠️ Could not pre-connect to {provider}: {e}")
+        results = await asyncio.gather(*(warm(p) for p in providers or configured_providers()))
+        return [provider for provider in results if provider]
+
+    def close(self):
+        with self._lock:
+            clients, self._clients = self._clients, {}
+        for client in clients.values():
+            client.close()
+
+
+def configured_providers():
+    """Providers that have an API key set."""
+    keys = {
+        "groq": Settings.GROQ_API_KEY,
+        "openai": Settings.OPENAI_API_KEY,
+        "ttsopenai": Settings.TTSOPENAI_API_KEY,
+        "elevenlabs": Settings.ELEVENLABS_API_KEY,
+        "perplexity": Settings.PERPLEXITY_API_KEY,
+    }
+    return [name for name, key in keys.items() if key]
+
+
+def get_transport() -> HTTPTransport:
+    """Process-wide transport shared by every provider client."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = HTTPTransport()
+    return _transport
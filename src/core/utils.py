@@ -0,0 +1,46 @@
+import asyncio
+import threading
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+class BackgroundEventLoop:
+    """An asyncio event loop running forever on a daemon thread.
+
+    Lets synchronous callers (Streamlit scripts, CLI) hand coroutines to one
+    shared loop instead of starting a thread per request.
+    """
+
+    def __init__(self, name="zen-event-loop"):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, coro):
+        """Schedule ``coro`` on the loop; returns a ``concurrent.futures.Future``."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Run ``coro`` on the loop and block until it finishes."""
+        return self.submit(coro).result(timeout)
+
+    def iterate(self, agen):
+        """Consume an async iterator on the loop from synchronous code."""
+        try:
+            while True:
+                try:
+                    yield self.run(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.run(agen.aclose())
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """Process-wide background loop, started on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = BackgroundEventLoop()
+    return _loop
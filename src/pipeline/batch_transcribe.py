@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Offline batch transcription of recorded calls with Faster-Whisper.
+
+Files are stream-decoded, split into speech chunks with the VAD, and the
+chunks are spread over a process pool (one ``WhisperModel`` per worker).
+Each file becomes one JSONL line with segment timestamps, written in input
+order; rerunning with the same output skips files already done.
+
+    python -m src.pipeline.batch_transcribe recordings/ -o transcripts.jsonl
+    python -m src.pipeline.batch_transcribe recordings/ --workers 1 2 4   # throughput sweep
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from config.settings import Settings
+from src.components.vad import load_vad
+
+AUDIO_EXTENSIONS = (".wav", ".flac", ".ogg", ".mp3")
+SAMPLE_RATE = 16000
+
+_model = None  # per-worker WhisperModel, set by _init_worker
+
+
+def find_audio_files(root, extensions=AUDIO_EXTENSIONS):
+    """Audio files under ``root`` (or ``root`` itself), in a stable sorted order."""
+    if os.path.isfile(root):
+        return [root]
+    found = []
+    for dirpath, _, filenames in os.walk(root):
+        found.extend(os.path.join(dirpath, name) for name in filenames if name.lower().endswith(extensions))
+    return sorted(found)
+
+
+def iter_audio_blocks(path, samplerate=SAMPLE_RATE, block_seconds=10):
+    """Decode ``path`` block by block as mono float32 at ``samplerate``."""
+    import soundfile as sf
+    with sf.SoundFile(path) as f:
+        ratio = samplerate / f.samplerate
+        consumed = 0  # source frames read so far
+        emitted = 0  # output samples produced so far
+        for block in f.blocks(blocksize=int(block_seconds * f.samplerate), dtype="float32", always_2d=True):
+            mono = block.mean(axis=1)
+            if f.samplerate != samplerate:
+                # Linear resampling on the global timeline, so block edges line up
+                end = int((consumed + len(mono)) * ratio)
+                positions = np.arange(emitted, end) / ratio - consumed
+                mono = np.interp(positions, np.arange(len(mono)), mono).astype(np.float32)
+                emitted = end
+            consumed += len(block)
+            yield mono
+
+
+class SpeechChunker:
+    """Cuts a stream of audio into speech chunks at pauses, for batch decoding.
+
+    A chunk closes after ``min_silence_ms`` of silence, or at the longest
+    pause once it reaches ``max_chunk_seconds``. Leading/trailing silence
+    is trimmed to ``pad_ms``.
+    """
+
+    def __init__(self, vad=None, samplerate=SAMPLE_RATE, threshold=None, min_silence_ms=None,
+                 max_chunk_seconds=None, pad_ms=None):
+        self.samplerate = samplerate
+        self.vad = vad or load_vad(samplerate)
+        self.threshold = Settings.VAD_THRESHOLD if threshold is None else threshold
+        self.min_silence = int(samplerate * (Settings.BATCH_MIN_SILENCE_MS if min_silence_ms is None else min_silence_ms) / 1000)
+        self.max_chunk = int(samplerate * (max_chunk_seconds or Settings.BATCH_MAX_CHUNK_SECONDS))
+        self.pad = int(samplerate * (Settings.VAD_PAD_MS if pad_ms is None else pad_ms) / 1000)
+        self.reset()
+
+    def reset(self):
+        self.vad.reset()
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._offset = 0  # absolute sample index of _audio[0]
+        self._scanned = 0
+        self._speech_start = None
+        self._last_voiced = None
+        self._best_cut = None  # (silence length, position) of the longest pause in the chunk
+        self._floor = 0  # end of the previous chunk; padding never reaches back past it
+
+    def feed(self, block):
+        """Add audio; returns finished ``(start_sample, audio)`` chunks."""
+        self._audio = np.concatenate([self._audio, block])
+        window = self.vad.window_size
+        chunks = []
+        while self._scanned + window <= len(self._audio):
+            pos = self._scanned
+            voiced = self.vad(self._audio[pos:pos + window]) >= self.threshold
+            self._scanned += window
+            if voiced:
+                if self._speech_start is None:
+                    self._speech_start = pos
+                    self._best_cut = None
+                elif self._last_voiced is not None and pos - self._last_voiced > 0:
+                    gap = pos - self._last_voiced
+                    if self._best_cut is None or gap >= self._best_cut[0]:
+                        self._best_cut = (gap, self._last_voiced + gap // 2)
+                self._last_voiced = self._scanned
+            elif self._speech_start is not None and self._scanned - self._last_voiced >= self.min_silence:
+                chunks.append(self._cut(self._last_voiced + self.pad))
+                continue
+            if self._speech_start is not None and self._scanned - self._speech_start >= self.max_chunk:
+                cut = self._best_cut[1] if self._best_cut else self._scanned
+                chunks.append(self._cut(cut, resume_at=cut))
+        self._trim()
+        return chunks
+
+    def flush(self):
+        """Return the final chunk, if the stream ended mid-speech."""
+        chunks = []
+        if self._speech_start is not None:
+            chunks.append(self._cut(min(len(self._audio), self._last_voiced + self.pad)))
+        self.reset()
+        return chunks
+
+    def _cut(self, end, resume_at=None):
+        start = max(self._floor, self._speech_start - self.pad)
+        end = min(end, len(self._audio))
+        chunk = (self._offset + start, self._audio[start:end].copy())
+        self._floor = end
+        if resume_at is None:
+            self._speech_start = None
+            self._last_voiced = None
+        else:
+            # Forced split inside speech: the rest of the chunk continues from the cut
+            self._speech_start = resume_at
+            self._last_voiced = max(self._last_voiced, resume_at)
+        self._best_cut = None
+        return chunk
+
+    def _trim(self):
+        # Keep only what a future chunk may still need (speech start minus padding)
+        keep_from = self._scanned - self.pad if self._speech_start is None else self._speech_start - self.pad
+        keep_from = max(0, keep_from)
+        if keep_from:
+            self._audio = self._audio[keep_from:]
+            self._offset += keep_from
+            self._scanned -= keep_from
+            if self._speech_start is not None:
+                self._speech_start -= keep_from
+            if self._last_voiced is not None:
+                self._last_voiced -= keep_from
+            if self._best_cut is not None:
+                self._best_cut = (self._best_cut[0], self._best_cut[1] - keep_from)
+            self._floor = max(0, self._floor - keep_from)
+
+
+def _init_worker(size, device, compute_type, cpu_threads):
+    global _model
+    from faster_whisper import WhisperModel
+    _model = WhisperModel(size, device=device, compute_type=compute_type, cpu_threads=cpu_threads, num_workers=1)
+
+
+def _transcribe_chunk(audio, offset, language, beam_size):
+    segments, _ = _model.transcribe(audio, beam_size=beam_size, language=language)
+    return [
+        {"start": round(offset + s.start, 2), "end": round(offset + s.end, 2), "text": s.text.strip()}
+        for s in segments
+    ]
+
+
+def load_completed(output):
+    """Files already transcribed in ``output``; drops a half-written last line."""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    valid_bytes = 0
+    with open(output, "rb") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["file"])
+            except (ValueError, KeyError):
+                break
+            if not line.endswith(b"\n"):
+                break
+            valid_bytes += len(line)
+    if valid_bytes != os.path.getsize(output):
+        with open(output, "r+b") as f:
+            f.truncate(valid_bytes)
+    return done
+
+
+class BatchTranscriber:
+    """Transcribes many files with a pool of single-model worker processes."""
+
+    def __init__(self, model_size=None, workers=None, cpu_threads=None, device="cpu", compute_type="int8",
+                 language="hi", beam_size=5, vad=None, executor=None):
+        cores = os.cpu_count() or 1
+        self.model_size = model_size or Settings.WHISPER_MODEL_SIZE
+        self.workers = workers or Settings.BATCH_WORKERS or cores
+        # Split the cores between workers instead of letting each one grab them all
+        self.cpu_threads = cpu_threads or max(1, cores // self.workers)
+        self.device = device
+        self.compute_type = compute_type
+        self.language = language
+        self.beam_size = beam_size
+        self.vad = vad
+        self.executor = executor
+
+    def _executor(self):
+        return self.executor or ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.model_size, self.device, self.compute_type, self.cpu_threads),
+        )
+
+    def run(self, paths, output, root=None):
+        """Transcribe ``paths`` into ``output`` (JSONL), skipping files already there.
+
+        Returns a report with audio seconds, wall seconds and throughput in
+        audio-hours per wall-hour.
+        """
+        if root is None:
+            root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths]) if paths else "."
+        done = load_completed(output)
+        todo = [p for p in paths if os.path.relpath(p, root) not in done]
+        if done:
+            print(f"⏩ Resuming: {len(paths) - len(todo)} of {len(paths)} files already transcribed")
+
+        chunker = SpeechChunker(self.vad)
+        max_in_flight = self.workers * 2
+        pending = deque()  # ("chunk", future) / ("end", record) in submission order
+        current = []
+        audio_seconds = 0.0
+        files = 0
+        start = time.monotonic()
+        executor = self._executor()
+
+        def drain(limit):
+            nonlocal files
+            while pending and (sum(kind == "chunk" for kind, _ in pending) > limit or pending[0][0] == "end"):
+                kind, item = pending.popleft()
+                if kind == "chunk":
+                    current.extend(item.result())
+                    continue
+                item["segments"] = list(current)
+                item["text"] = " ".join(s["text"] for s in current if s["text"])
+                current.clear()
+                out.write(json.dumps(item, ensure_ascii=False) + "\n")
+                out.flush()
+                files += 1
+                print(f"📝 {item['file']}: {item['duration']:.1f}s of audio")
+
+        try:
+            with open(output, "a", encoding="utf-8") as out:
+                for path in todo:
+                    samples = 0
+                    for block in iter_audio_blocks(path):
+                        samples += len(block)
+                        for offset, audio in chunker.feed(block):
+                            pending.append(("chunk", executor.submit(
+                                _transcribe_chunk, audio, offset / SAMPLE_RATE, self.language, self.beam_size)))
+                            drain(max_in_flight)
+                    for offset, audio in chunker.flush():
+                        pending.append(("chunk", executor.submit(
+                            _transcribe_chunk, audio, offset / SAMPLE_RATE, self.language, self.beam_size)))
+                    pending.append(("end", {"file": os.path.relpath(path, root), "duration": samples / SAMPLE_RATE}))
+                    audio_seconds += samples / SAMPLE_RATE
+                    drain(max_in_flight)
+                drain(0)
+        finally:
+            if self.executor is None:
+                executor.shutdown(cancel_futures=True)
+
+        wall = time.monotonic() - start
+        return {
+            "files": files,
+            "workers": self.workers,
+            "cpu_threads": self.cpu_threads,
+            "audio_seconds": audio_seconds,
+            "wall_seconds": wall,
+            "audio_hours_per_hour": audio_seconds / wall if wall else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="audio files or directories")
+    parser.add_argument("-o", "--output", default="transcripts.jsonl")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0],
+                        help="worker processes; several values run a throughput sweep")
+    parser.add_argument("--cpu-threads", type=int, default=0)
+    parser.add_argument("--model", default=None)
+    parser.add_argument("--language", default="hi")
+    parser.add_argument("--beam-size", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = sorted({p for root in args.inputs for p in find_audio_files(root)})
+    if not paths:
+        parser.error("no audio files found")
+
+    sweep = len(args.workers) > 1
+    reports = []
+    for workers in args.workers:
+        transcriber = BatchTranscriber(model_size=args.model, workers=workers or None,
+                                       cpu_threads=args.cpu_threads or None, language=args.language,
+                                       beam_size=args.beam_size)
+        if sweep:
+            # Every run of a sweep starts from scratch
+            with tempfile.TemporaryDirectory() as tmp:
+                reports.append(transcriber.run(paths, os.path.join(tmp, "out.jsonl")))
+        else:
+            reports.append(transcriber.run(paths, args.output))
+
+    print(f"{'workers':>8} {'threads':>8} {'audio h':>8} {'wall s':>8} {'audio-h / wall-h':>17}")
+    for r in reports:
+        print(f"{r['workers']:>8} {r['cpu_threads']:>8} {r['audio_seconds'] / 3600:>8.2f} "
+              f"{r['wall_seconds']:>8.1f} {r['audio_hours_per_hour']:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
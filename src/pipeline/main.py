@@ -1,45 +1,287 @@
 from src.components.stt import STT
-from src.components.llm_engine import LLMEngine
+from src.components.llm_engine import LLMEngine, SYSTEM_MESSAGE
+from src.components.conversation_memory import ConversationMemory
+from src.components.audio_player import AudioChannel
 from src.components.tts import TTS
+from src.components.tts_pipeline import PipelinedTTS
+from src.components.vad import BargeInDetector
+from config.settings import Settings
+from src.core.tracing import get_tracer, trace_turn
+from src.core.transport import get_transport
+import sys
+import asyncio
+import threading
 import time
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
+
+def warm_up(tts):
+    """Start-up work that shouldn't delay the first prompt."""
+    # Fill the audio cache with fixed prompts without delaying startup
+    threading.Thread(target=tts.preseed, name="tts-preseed", daemon=True).start()
+    if Settings.HTTP_PRECONNECT:
+        # Pay the TCP+TLS handshakes now rather than on the first turn
+        threading.Thread(target=get_transport().preconnect, name="http-preconnect", daemon=True).start()
+
+def build_components(stt=None, llm=None, tts=None):
+    """Construct whichever of STT, LLM and TTS weren't passed in, concurrently.
+
+    Their SDK imports, client setup and provider checks overlap instead of
+    adding up; model weights keep loading in the background afterwards (see
+    ``ConversationalAgent.wait_ready``).
+    """
+    given = {"stt": stt, "llm": llm, "tts": tts}
+    factories = {name: factory for name, factory in (("stt", STT), ("llm", LLMEngine), ("tts", TTS))
+                 if given[name] is None}
+    if not Settings.STARTUP_PARALLEL_INIT or len(factories) < 2:
+        return {**given, **{name: factory() for name, factory in factories.items()}}
+    with ThreadPoolExecutor(max_workers=len(factories), thread_name_prefix="component-init") as pool:
+        futures = {name: pool.submit(factory) for name, factory in factories.items()}
+    return {**given, **{name: future.result() for name, future in futures.items()}}
 
 class ConversationalAgent:
-    def __init__(self):
-        print("🔄 Initializing ZenTravel AI Assistant...")
-        self.stt = STT()
-        self.llm = LLMEngine()
-        self.tts = TTS()
-        print("✅ All components initialized successfully!")
+    def __init__(self, stt=None, llm=None, tts=None):
+        """Build the STT/LLM/TTS components, or reuse shared ones passed in
+        (see ``SessionManager``); only the per-turn state is then per agent."""
+        shared = stt is not None and llm is not None and tts is not None
+        if not shared:
+            print("🔄 Initializing ZenTravel AI Assistant...")
+        components = build_components(stt, llm, tts)
+        self.stt = components["stt"]
+        self.llm = components["llm"]
+        self.tts = components["tts"]
+        # Own channel on the shared player, so a barge-in only silences this session
+        self.player = AudioChannel(self.tts.player)
+        self.speaker = PipelinedTTS(self.tts, player=self.player)
+        # Earlier turns go to the LLM within a token budget; older ones are summarized
+        self.memory = ConversationMemory(summarize=self.llm.summarize, system_prompt=SYSTEM_MESSAGE)
+        if not shared:
+            warm_up(self.tts)
+        self.last_latency = None
+        self.last_turn_latency = None
+        self.last_user_text = None
+        self.last_barge_in_latency = None
+        if not shared:
+            print("✅ All components initialized successfully!")
     
+    @property
+    def ready(self) -> bool:
+        """False while model weights are still loading in the background."""
+        return self.stt.ready and self.llm.ready
+
+    def wait_ready(self):
+        """Block until background model loads have finished."""
+        self.stt.wait_ready()
+        self.llm.wait_ready()
+
     def run_conversation(self, duration=5):
-        """Run one conversation cycle: Listen → Process → Speak"""
+        """Run one conversation cycle: Listen → Process → Speak
+
+        ``duration`` is the longest we keep listening; the turn ends as soon as
+        the VAD sees enough trailing silence.
+        """
+        with trace_turn():
+            try:
+                # Step 1: Listen until end of speech (local STT transcribes while we listen)
+                streamer = self.stt.streaming_transcriber(on_partial=self._show_partial)
+                utterance = self.stt.listen(
+                    max_duration=duration,
+                    on_audio=streamer.feed if streamer else None,
+                )
+                if utterance is None:
+                    print("🔇 No speech detected")
+                    return "No speech detected"
+                print(f"🎙️ Captured {utterance.duration:.1f}s of speech")
+
+                # Step 2: Transcribe
+                print("📝 Transcribing...")
+                if streamer:
+                    user_text = streamer.finish().text
+                else:
+                    user_text = self.stt.transcribe(utterance.audio, utterance.samplerate)
+                print(f"👂 You said: {user_text}")
+                self.last_user_text = user_text
+
+                if not user_text.strip():
+                    return "No speech detected"
+
+                # Step 3 + 4: Generate the response and speak it sentence by sentence as it streams in
+                print("🤖 Thinking...")
+                route = {}
+                response = self.speaker.speak_stream(self.llm.stream_query(user_text, self.memory, route))
+                print(f"💭 LLM Response: {response}")
+                if route.get("ttft") is not None:
+                    print(f"⏱️ Time to first token ({route['winner']}): {route['ttft'] * 1000:.0f} ms")
+                if self.speaker.first_audio_at is not None:
+                    self.last_latency = self.speaker.first_audio_at - utterance.speech_ended_at
+                    get_tracer().record("turn.first_audio", self.last_latency)
+                    print(f"⏱️ End of speech → first audio: {self.last_latency * 1000:.0f} ms")
+                self._turn_done(utterance)
+
+                return response
+
+            except Exception as e:
+                print(f"❌ Error in conversation: {e}")
+                return f"Error: {e}"
+
+    async def arun_conversation(self, duration=5):
+        """Asyncio version of ``run_conversation``.
+
+        Capture, transcription, generation and playback run as concurrent
+        stages joined by bounded queues, and every wait is awaited rather than
+        blocking, so one event loop can serve many conversations.
+        """
+        with trace_turn():
+            try:
+                utterance, user_text = await self._ahear(duration)
+                if not user_text:
+                    return "No speech detected"
+                return await self._arespond(user_text, utterance)
+
+            except Exception as e:
+                print(f"❌ Error in conversation: {e}")
+                return f"Error: {e}"
+
+    async def _ahear(self, duration, start=None):
+        """Listen (from ``start`` if given) and transcribe; returns ``(utterance, text)``."""
+        loop = asyncio.get_running_loop()
+        audio_chunks = asyncio.Queue(maxsize=64)
+        streamer = self.stt.streaming_transcriber(on_partial=self._show_partial)
+        stopped = threading.Event()
+
+        def on_audio(chunk):
+            # Runs on the capture thread; blocks it (not the loop) if transcription lags,
+            # and ends the recording once nobody is consuming any more
+            put = asyncio.run_coroutine_threadsafe(audio_chunks.put(chunk.copy()), loop)
+            while not stopped.is_set():
+                try:
+                    return put.result(timeout=0.1)
+                except concurrent.futures.TimeoutError:
+                    pass
+            put.cancel()
+            raise InterruptedError("transcription stopped")
+
+        async def capture():
+            try:
+                return await asyncio.to_thread(
+                    self.stt.listen, duration, on_audio=on_audio if streamer else None, start=start
+                )
+            finally:
+                if not stopped.is_set():
+                    await audio_chunks.put(None)
+
+        # Stage 1 + 2: listen, transcribing while the user is still talking
+        capturing = asyncio.create_task(capture())
         try:
-            # Step 1: Listen (Speech-to-Text)
-            print(f"🎙️ Recording for {duration} seconds...")
-            audio, fs = self.stt.record(duration=duration)
-            
-            # Step 2: Transcribe
-            print("📝 Transcribing...")
-            user_text = self.stt.transcribe(audio, fs)
-            print(f"👂 You said: {user_text}")
-            
-            if not user_text.strip():
-                return "No speech detected"
-            
-            # Step 3: Generate response
-            print("🤖 Thinking...")
-            response = self.llm.query(user_text)
-            print(f"💭 LLM Response: {response}")
-            
-            # Step 4: Speak (Text-to-Speech)
-            print("🔊 Speaking...")
-            self.tts.speak(response)
-            
-            return response
-            
-        except Exception as e:
-            print(f"❌ Error in conversation: {e}")
-            return f"Error: {e}"
+            if streamer:
+                while (chunk := await audio_chunks.get()) is not None:
+                    await asyncio.to_thread(streamer.feed, chunk)
+            utterance = await capturing
+        finally:
+            # If transcription failed or we were cancelled, release the capture thread
+            # instead of leaving it blocked on a full queue with the microphone open
+            stopped.set()
+            if not capturing.done():
+                capturing.cancel()
+                await asyncio.gather(capturing, return_exceptions=True)
+        if utterance is None:
+            print("🔇 No speech detected")
+            return None, None
+        print(f"🎙️ Captured {utterance.duration:.1f}s of speech")
+
+        if streamer:
+            user_text = (await asyncio.to_thread(streamer.finish)).text
+        else:
+            user_text = await self.stt.atranscribe(utterance.audio, utterance.samplerate)
+        print(f"👂 You said: {user_text}")
+        self.last_user_text = user_text
+        return utterance, user_text.strip()
+
+    async def _arespond(self, user_text, utterance):
+        # Stage 3 + 4: stream tokens into sentence-level synthesis and ordered playback
+        print("🤖 Thinking...")
+        response = await self.speaker.aspeak_stream(self.llm.astream_query(user_text, self.memory))
+        print(f"💭 LLM Response: {response}")
+        if self.speaker.first_audio_at is not None:
+            self.last_latency = self.speaker.first_audio_at - utterance.speech_ended_at
+            get_tracer().record("turn.first_audio", self.last_latency)
+            print(f"⏱️ End of speech → first audio: {self.last_latency * 1000:.0f} ms")
+        self._turn_done(utterance)
+        return response
+
+    def _turn_done(self, utterance):
+        # End of speech → answer fully spoken
+        self.last_turn_latency = time.monotonic() - utterance.speech_ended_at
+        get_tracer().record("turn.complete", self.last_turn_latency)
+
+    async def arun_duplex(self, duration=15, turns=None):
+        """Full-duplex conversation loop with barge-in.
+
+        The microphone stays open while the assistant talks. When the user
+        starts speaking, playback is stopped, the in-flight LLM stream and any
+        queued synthesis are cancelled, and the next turn starts from the
+        onset of the interrupting speech.
+        """
+        mic = self.stt.microphone()
+        detector = BargeInDetector(samplerate=mic.samplerate)
+        pad = int(mic.samplerate * Settings.VAD_PAD_MS / 1000)
+        start = None
+        mic.start()
+        try:
+            while turns is None or turns > 0:
+                with trace_turn():
+                    utterance, user_text = await self._ahear(duration, start=start)
+                    start = None
+                    if not user_text:
+                        continue
+                    if turns is not None:
+                        turns -= 1
+
+                    stop = threading.Event()
+                    responding = asyncio.create_task(self._arespond(user_text, utterance))
+                    watching = asyncio.create_task(asyncio.to_thread(detector.watch, mic, stop, mic.ring.position))
+                    done, _ = await asyncio.wait({responding, watching}, return_when=asyncio.FIRST_COMPLETED)
+
+                    if watching in done and watching.result() is not None:
+                        # Speech after the answer finished is just the next turn; either way it starts there
+                        await self._barge_in(responding, detector.detected_at)
+                        start = max(mic.ring.oldest, watching.result() - pad)
+                    else:
+                        stop.set()
+                        await asyncio.gather(responding, watching, return_exceptions=True)
+        finally:
+            mic.stop()
+
+    async def _barge_in(self, responding, detected_at):
+        """Cancel everything still producing this answer, then silence the speaker.
+
+        Returns ``False`` when the answer had already been fully spoken, so
+        there was nothing to interrupt. Only speech over audio that was
+        actually playing counts towards the barge-in latency.
+        """
+        if responding.done():
+            await asyncio.gather(responding, return_exceptions=True)
+            return False
+        playing = self.player.is_playing()
+        # Cancel first: stopping the player while the answer still runs would let its
+        # playback stage queue the next clip, which the player then starts afresh
+        cancelled_before = self.speaker.cancelled_chunks
+        responding.cancel()
+        await asyncio.gather(responding, return_exceptions=True)
+        dropped = self.speaker.cancelled_chunks - cancelled_before
+        stopped = await asyncio.to_thread(self.player.stop)
+        if not playing:
+            print(f"✋ Answer cancelled before any audio played, dropped {dropped} queued TTS chunks")
+            return True
+        self.last_barge_in_latency = time.monotonic() - detected_at
+        get_tracer().record("barge_in", self.last_barge_in_latency)
+        print(f"✋ Barge-in: audio stopped {self.last_barge_in_latency * 1000:.0f} ms after speech onset"
+              f"{'' if stopped else ' (player timed out)'}, dropped {dropped} queued TTS chunks")
+        return True
+
+    def _show_partial(self, hypothesis):
+        if not hypothesis.is_final:
+            print(f"✏️ {hypothesis.text}")
 
 def run_pipeline():
     agent = ConversationalAgent()
@@ -61,5 +303,16 @@ def run_pipeline():
     except KeyboardInterrupt:
         print("\n👋 Goodbye!")
 
+def run_duplex_pipeline():
+    agent = ConversationalAgent()
+    print("🎯 ZenTravel AI Assistant - full duplex, interrupt me any time (Ctrl+C to exit)")
+    try:
+        asyncio.run(agent.arun_duplex())
+    except KeyboardInterrupt:
+        print("\n👋 Goodbye!")
+
 if __name__ == "__main__":
-    run_pipeline()
\ No newline at end of file
+    if "--duplex" in sys.argv:
+        run_duplex_pipeline()
+    else:
+        run_pipeline()
\ No newline at end of file
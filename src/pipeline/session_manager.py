@@ -0,0 +1,226 @@
+import asyncio
+import resource
+import sys
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from config.settings import Settings
+from src.core.utils import get_background_loop
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def _sizeof(value) -> int:
+    """``sys.getsizeof`` including the items of containers; objects that know their
+    footprint (``approx_bytes()``, e.g. ``ConversationMemory``) report it themselves."""
+    if hasattr(value, "approx_bytes"):
+        return value.approx_bytes()
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeof(key) + _sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset, deque)):
+        size += sum(_sizeof(item) for item in value)
+    return size
+
+
+class SessionLimitReached(Exception):
+    """No room for another session and none is idle enough to evict."""
+
+
+class ServerBusy(Exception):
+    """Every worker is busy and the wait queue is full."""
+
+
+@dataclass(slots=True)
+class SessionState:
+    """Everything kept per session besides the (shared) components."""
+
+    session_id: str
+    created_at: float
+    last_active: float
+    history: deque = field(default_factory=lambda: deque(maxlen=Settings.SESSION_HISTORY_TURNS))
+    turns: int = 0
+    busy: bool = False
+    last_latency: float = None
+
+    def approx_bytes(self) -> int:
+        return sys.getsizeof(self) + sum(_sizeof(getattr(self, name)) for name in self.__slots__)
+
+
+class Session:
+    def __init__(self, state, agent):
+        self.state = state
+        self.agent = agent
+
+    @property
+    def session_id(self):
+        return self.state.session_id
+
+    def approx_bytes(self) -> int:
+        """State plus the agent's own attributes and what they hold, e.g. its
+        conversation memory (shared components excluded)."""
+        agent_bytes = sum(
+            _sizeof(value) for name, value in vars(self.agent).items() if name not in ("stt", "llm", "tts")
+        )
+        return self.state.approx_bytes() + sys.getsizeof(self.agent) + agent_bytes
+
+
+def _rss_bytes():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+class SessionManager:
+    """Many conversation sessions on one set of shared STT/LLM/TTS components.
+
+    Each session only owns a lightweight agent (per-turn state) and a
+    bounded history. Turns run on the shared event loop with at most
+    ``max_concurrent`` at once; up to ``max_queue`` more wait for a slot and
+    anything beyond that is rejected with ``ServerBusy``. Sessions idle for
+    ``idle_timeout`` seconds are evicted, also to make room for new ones.
+    """
+
+    def __init__(self, max_sessions=None, max_concurrent=None, max_queue=None, idle_timeout=None,
+                 components=None, agent_factory=None):
+        self.max_sessions = max_sessions or Settings.SESSION_MAX
+        self.max_concurrent = max_concurrent or Settings.SESSION_MAX_CONCURRENT
+        self.max_queue = Settings.SESSION_MAX_QUEUE if max_queue is None else max_queue
+        self.idle_timeout = idle_timeout or Settings.SESSION_IDLE_SECONDS
+        before = _rss_bytes()
+        self.components = self._build_components() if components is None else components
+        self.shared_bytes = max(0, _rss_bytes() - before)
+        self._agent_factory = agent_factory or self._default_agent
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._slots = None  # asyncio.Semaphore, created on the loop
+        self.running = 0
+        self.queued = 0
+        self.rejected = 0
+        self.evicted = 0
+        self._sweeper = threading.Thread(target=self._sweep, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    @staticmethod
+    def _build_components():
+        from src.pipeline.main import build_components, warm_up
+        print("🔄 Initializing shared components...")
+        components = build_components()
+        warm_up(components["tts"])
+        print("✅ Shared components ready")
+        return components
+
+    def _default_agent(self):
+        from src.pipeline.main import ConversationalAgent
+        return ConversationalAgent(**self.components)
+
+    def open_session(self, session_id=None) -> Session:
+        """Create (or resume) a session, evicting expired idle ones if the box is full."""
+        with self._lock:
+            if session_id in self._sessions:
+                session = self._sessions[session_id]
+                session.state.last_active = time.monotonic()
+                return session
+            if len(self._sessions) >= self.max_sessions:
+                self._evict_idle()
+            if len(self._sessions) >= self.max_sessions:
+                self.rejected += 1
+                raise SessionLimitReached(f"{self.max_sessions} sessions already active")
+            now = time.monotonic()
+            state = SessionState(session_id or uuid.uuid4().hex, now, now)
+            session = Session(state, self._agent_factory())
+            self._sessions[state.session_id] = session
+            return session
+
+    def get(self, session_id):
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def close_session(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    async def aturn(self, session_id, duration=5):
+        """Run one conversation turn for ``session_id`` under admission control."""
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(f"Unknown or evicted session {session_id}")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrent)
+        with self._lock:
+            if self.running >= self.max_concurrent and self.queued >= self.max_queue:
+                self.rejected += 1
+                raise ServerBusy(f"{self.running} turns running and {self.queued} waiting")
+            self.queued += 1
+            session.state.busy = True
+        try:
+            async with self._slots:
+                with self._lock:
+                    self.queued -= 1
+                    self.running += 1
+                try:
+                    response = await session.agent.arun_conversation(duration)
+                finally:
+                    with self._lock:
+                        self.running -= 1
+        except BaseException:
+            session.state.busy = False
+            session.state.last_active = time.monotonic()
+            raise
+        state = session.state
+        state.busy = False
+        state.turns += 1
+        state.last_active = time.monotonic()
+        state.last_latency = session.agent.last_latency
+        if session.agent.last_user_text:
+            state.history.append((time.strftime("%H:%M:%S"), session.agent.last_user_text, response))
+        return response
+
+    def turn(self, session_id, duration=5):
+        """Blocking ``aturn`` for synchronous callers (Streamlit, CLI)."""
+        return get_background_loop().run(self.aturn(session_id, duration))
+
+    def _evict_idle(self):
+        # Caller holds self._lock
+        now = time.monotonic()
+        for session in list(self._sessions.values()):
+            if not session.state.busy and now - session.state.last_active >= self.idle_timeout:
+                del self._sessions[session.session_id]
+                self.evicted += 1
+
+    def evict_idle(self):
+        with self._lock:
+            self._evict_idle()
+
+    def _sweep(self):
+        while True:
+            time.sleep(max(1.0, self.idle_timeout / 4))
+            self.evict_idle()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            per_session = [s.approx_bytes() for s in sessions]
+            return {
+                "sessions": len(sessions),
+                "max_sessions": self.max_sessions,
+                "running": self.running,
+                "queued": self.queued,
+                "max_concurrent": self.max_concurrent,
+                "rejected": self.rejected,
+                "evicted": self.evicted,
+                "shared_bytes": self.shared_bytes,
+                "bytes_per_session": sum(per_session) / len(per_session) if per_session else 0,
+            }
+
+
+def get_session_manager() -> SessionManager:
+    """Process-wide session manager; builds the shared components on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = SessionManager()
+    return _manager
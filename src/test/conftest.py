@@ -0,0 +1,123 @@
+"""Fakes shared by the tests.
+
+The real classes are wired up here around stand-ins for models, SDKs and
+audio devices, so the tests themselves never reach into private attributes.
+Fixtures serve pytest; the ``make_*`` builders are importable for running a
+test file directly.
+"""
+import time
+from collections import OrderedDict
+import pytest
+from src.components.audio_player import NullAudioSink
+from src.components.llm_engine import LLMEngine
+from src.components.llm_router import LLMRouter
+from src.components.local_llm import LlamaCppModel
+from src.components.tts import TTS
+from src.core.circuit_breaker import CircuitBreaker
+
+
+class FakeHandle:
+    def __init__(self):
+        self.started_at = time.monotonic()
+
+    def wait(self, timeout=None):
+        return True
+
+
+class FakePlayer:
+    """Records what was played and stopped, without decoding anything.
+
+    Counts as playing from the first clip until ``stop()``.
+    """
+
+    def __init__(self):
+        self.events = []
+        self.played = []
+        self.playing = False
+
+    def play(self, audio_bytes, fmt, wait=True, samplerate=None, channel=None):
+        self.events.append("play")
+        self.played.append(audio_bytes.decode())
+        self.playing = True
+        return FakeHandle()
+
+    def stop(self, timeout=1.0, channel=None):
+        self.events.append("stop")
+        self.playing = False
+        return True
+
+    def is_playing(self, channel=None):
+        return self.playing
+
+
+class FakeLlama:
+    """Records how ``LlamaCppModel`` manages the llama.cpp context."""
+
+    def __init__(self):
+        self.calls = []
+
+    def reset(self):
+        self.calls.append("reset")
+
+    def save_state(self):
+        self.calls.append("save")
+        return object()
+
+    def load_state(self, state):
+        self.calls.append("load")
+
+    def create_chat_completion(self, messages, max_tokens, temperature=0.0, stream=False):
+        if not stream:
+            self.calls.append("prefill")
+            return {}
+        self.calls.append("chat")
+        return iter([{"choices": [{"delta": {"content": "ok"}}]}])
+
+
+def make_llama_model(max_prefixes=4):
+    """The real ``LlamaCppModel`` around a ``FakeLlama`` (skips loading weights)."""
+    model = object.__new__(LlamaCppModel)
+    model.name, model.llm, model.max_prefixes, model.prefix_hits = "fake.gguf", FakeLlama(), max_prefixes, 0
+    model._prefixes, model._system = OrderedDict(), None
+    return model
+
+
+def make_engine(sources, cache=None, model="llama-3.1-8b-instant"):
+    """The real ``LLMEngine`` routing over ``sources`` (skips SDK imports and model loads)."""
+    engine = object.__new__(LLMEngine)
+    engine.model = model
+    engine.cache = cache
+    engine.local = None
+    engine.router = LLMRouter(sources, hedge=False)
+    return engine
+
+
+def make_tts(providers, local=None, player=None):
+    """The real ``TTS`` with ``providers`` behind fresh breakers (skips SDK and model setup)."""
+    tts = object.__new__(TTS)
+    tts.player = player or NullAudioSink()
+    tts.local = local
+    tts.cache = None
+    tts.providers = list(providers)
+    tts.breakers = {name: CircuitBreaker(name) for name in tts.providers}
+    return tts
+
+
+@pytest.fixture
+def fake_player():
+    return FakePlayer()
+
+
+@pytest.fixture
+def llama_model():
+    return make_llama_model()
+
+
+@pytest.fixture
+def engine_factory():
+    return make_engine
+
+
+@pytest.fixture
+def tts_factory():
+    return make_tts
@@ -1,6 +1,7 @@
 import requests
 import json
 import os
+from config.settings import Settings
 
 def text_to_speech_elevenlabs(api_key, text, voice_id, filename="output.mp3"):
     """Direct API call to ElevenLabs"""
@@ -35,8 +36,8 @@ def text_to_speech_elevenlabs(api_key, text, voice_id, filename="output.mp3"):
         print(f"Error: {response.status_code} - {response.text}")
 
 # Usage
-api_key = "sk_1fa1f8dcf428f90830ae533190b7d8e6901670c01e3c3a82"
-text = "How are you Zen? कैसा है यार तू?"
-voice_id = "JBFqnCBsd6RMkjVDRZzb"
+if __name__ == "__main__":
+    text = "How are you Zen? कैसा है यार तू?"
+    voice_id = "JBFqnCBsd6RMkjVDRZzb"
 
-text_to_speech_elevenlabs(api_key, text, voice_id)
\ No newline at end of file
+    text_to_speech_elevenlabs(Settings.ELEVENLABS_API_KEY, text, voice_id)
\ No newline at end of file
@@ -0,0 +1,57 @@
+import asyncio
+import threading
+import time
+import numpy as np
+from src.pipeline.main import ConversationalAgent
+
+class FakeTTS:
+    primary = "fake"
+
+    def __init__(self, player):
+        self.player = player
+
+class FakeLLM:
+    def summarize(self, previous_summary, turns):
+        return ""
+
+class BrokenStreamer:
+    def feed(self, chunk):
+        raise RuntimeError("decoder crashed")
+
+class FakeSTT:
+    """Feeds 20 ms frames to ``on_audio`` for ``seconds``; ``closed`` is set when recording ends."""
+
+    def __init__(self, seconds=5.0):
+        self.seconds = seconds
+        self.closed = threading.Event()
+
+    def streaming_transcriber(self, on_partial=None):
+        return BrokenStreamer()
+
+    def listen(self, duration, on_audio=None, start=None):
+        try:
+            for _ in range(int(self.seconds / 0.02)):
+                on_audio(np.zeros(320, dtype=np.float32))
+                time.sleep(0.001)
+        finally:
+            self.closed.set()
+
+def test_failed_transcription_ends_the_recording(fake_player):
+    stt = FakeSTT()
+    agent = ConversationalAgent(stt=stt, llm=FakeLLM(), tts=FakeTTS(fake_player))
+
+    async def run():
+        try:
+            await agent._ahear(5)
+            assert False, "the streamer error should surface"
+        except RuntimeError:
+            pass
+
+    asyncio.run(run())
+    # Capture gave up well before its 5 s of audio instead of blocking on the full queue
+    assert stt.closed.wait(1)
+
+if __name__ == "__main__":
+    from conftest import FakePlayer
+    test_failed_transcription_ends_the_recording(FakePlayer())
+    print("✅ Async pipeline tests passed")
@@ -0,0 +1,22 @@
+import numpy as np
+from src.components.audio_capture import AudioRingBuffer
+
+def test_ring_buffer_wraps():
+    ring = AudioRingBuffer(8)
+    ring.write(np.arange(6, dtype=np.float32))
+    ring.write(np.arange(6, 10, dtype=np.float32))
+    assert ring.position == 10
+    assert ring.oldest == 2
+    np.testing.assert_array_equal(ring.read(4, 6), np.arange(4, 10, dtype=np.float32))
+
+def test_ring_buffer_skips_overwritten_samples():
+    ring = AudioRingBuffer(4)
+    ring.write(np.arange(10, dtype=np.float32))
+    out = np.empty(2, dtype=np.float32)
+    assert ring.read_into(0, out) == 6
+    np.testing.assert_array_equal(out, [6, 7])
+
+if __name__ == "__main__":
+    test_ring_buffer_wraps()
+    test_ring_buffer_skips_overwritten_samples()
+    print("✅ Ring buffer tests passed")
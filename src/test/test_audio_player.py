@@ -0,0 +1,90 @@
+import sys
+import time
+from contextlib import contextmanager
+from types import ModuleType
+import numpy as np
+from src.components.audio_player import AudioChannel, AudioPlayer
+
+class FakeOutputStream:
+    """Takes ``block_seconds`` per write, like a device buffer that is full."""
+    opened = []
+    block_seconds = 0.002
+    latency = 0.0
+
+    def __init__(self, samplerate, channels, dtype, device):
+        self.format = (samplerate, channels)
+        self.frames = 0
+        self.aborted = 0
+        FakeOutputStream.opened.append(self)
+
+    def start(self):
+        pass
+
+    def write(self, block):
+        time.sleep(self.block_seconds)
+        self.frames += len(block)
+
+    def abort(self):
+        self.aborted += 1
+
+    def close(self):
+        pass
+
+@contextmanager
+def fake_sounddevice():
+    fake = ModuleType("sounddevice")
+    fake.OutputStream = FakeOutputStream
+    saved = sys.modules.get("sounddevice")
+    sys.modules["sounddevice"] = fake
+    FakeOutputStream.opened = []
+    try:
+        yield FakeOutputStream.opened
+    finally:
+        if saved is None:
+            del sys.modules["sounddevice"]
+        else:
+            sys.modules["sounddevice"] = saved
+
+def pcm(seconds, samplerate=16000):
+    return np.zeros(int(seconds * samplerate), dtype="<i2").tobytes()
+
+def test_clips_play_in_order_on_one_stream():
+    with fake_sounddevice() as opened:
+        player = AudioPlayer()
+        handles = [player.play(pcm(0.1), "pcm_16000", wait=False) for _ in range(3)]
+        assert handles[-1].wait(2)
+        assert all(h.done.is_set() and not h.cancelled for h in handles)
+        finished = [h.finished_at for h in handles]
+        assert finished == sorted(finished)
+        # Same format throughout, so the stream is opened once and every frame is written
+        assert len(opened) == 1 and opened[0].frames == 3 * 1600
+        player.play(pcm(0.1, 24000), "pcm_24000")
+        assert len(opened) == 2 and opened[1].format == (24000, 1)
+
+def test_stop_cuts_the_current_clip_and_drops_the_queue():
+    with fake_sounddevice() as opened:
+        player = AudioPlayer()
+        current = player.play(pcm(1.0), "pcm_16000", wait=False)
+        queued = player.play(pcm(1.0), "pcm_16000", wait=False)
+        time.sleep(0.02)
+        assert player.stop(timeout=1.0)
+        assert current.cancelled and queued.cancelled
+        assert opened[0].aborted == 1 and opened[0].frames < 16000
+
+def test_stopping_a_channel_leaves_other_sessions_playing():
+    with fake_sounddevice():
+        player = AudioPlayer()
+        mine, theirs = AudioChannel(player), AudioChannel(player)
+        playing = mine.play(pcm(1.0), "pcm_16000", wait=False)
+        waiting = theirs.play(pcm(0.1), "pcm_16000", wait=False)
+        dropped = mine.play(pcm(0.1), "pcm_16000", wait=False)
+        time.sleep(0.02)
+        assert mine.stop(timeout=1.0)
+        assert playing.cancelled and dropped.cancelled
+        assert waiting.wait(2) and not waiting.cancelled
+
+if __name__ == "__main__":
+    test_clips_play_in_order_on_one_stream()
+    test_stop_cuts_the_current_clip_and_drops_the_queue()
+    test_stopping_a_channel_leaves_other_sessions_playing()
+    print("✅ Audio player tests passed")
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import time
+import numpy as np
+from src.components.audio_player import NullAudioSink
+from src.pipeline.main import ConversationalAgent
+
+class FakeTTS:
+    primary = "fake"
+
+    def __init__(self, player):
+        self.player = player
+
+class FakeLLM:
+    def summarize(self, previous_summary, turns):
+        return ""
+
+def make_agent(tts):
+    return ConversationalAgent(stt=object(), llm=FakeLLM(), tts=tts)
+
+def test_barge_in_stops_playback_after_the_answer_is_cancelled(fake_player):
+    agent = make_agent(FakeTTS(fake_player))
+    player = agent.tts.player
+
+    async def answer():
+        # Stands in for aspeak_stream's playback stage queueing clip after clip
+        while True:
+            await asyncio.to_thread(agent.player.play, b"", "pcm", False)
+            await asyncio.sleep(0)
+
+    async def run():
+        responding = asyncio.create_task(answer())
+        await asyncio.sleep(0.02)
+        await agent._barge_in(responding, time.monotonic())
+        await asyncio.sleep(0.02)
+        return responding
+
+    responding = asyncio.run(run())
+    assert responding.cancelled()
+    assert player.events[-1] == "stop" and player.events.count("stop") == 1
+    assert agent.last_barge_in_latency is not None
+
+def test_barge_in_only_silences_its_own_session():
+    tts = FakeTTS(NullAudioSink(realtime=True))
+    interrupted, other = make_agent(tts), make_agent(tts)
+    clips = {}
+
+    def speak(agent):
+        clips[agent] = agent.player.play_samples(np.zeros(16000), 16000)
+
+    threads = [threading.Thread(target=speak, args=(agent,)) for agent in (interrupted, other)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+
+    async def run():
+        await interrupted._barge_in(asyncio.create_task(asyncio.sleep(0)), time.monotonic())
+
+    asyncio.run(run())
+    threads[0].join(0.5)
+    assert clips[interrupted].cancelled
+    assert threads[1].is_alive() and other not in clips
+    threads[1].join()
+    assert not clips[other].cancelled
+
+def test_speech_after_the_answer_is_not_a_barge_in(fake_player):
+    agent = make_agent(FakeTTS(fake_player))
+
+    async def run():
+        responding = asyncio.create_task(asyncio.to_thread(agent.player.play, b"", "pcm"))
+        await responding
+        return await agent._barge_in(responding, time.monotonic())
+
+    assert asyncio.run(run()) is False
+    assert "stop" not in fake_player.events
+    assert agent.last_barge_in_latency is None
+
+def test_speech_before_any_audio_cancels_without_a_latency_sample(fake_player):
+    agent = make_agent(FakeTTS(fake_player))
+
+    async def run():
+        # Still waiting on the LLM: the answer is cancelled but nothing was heard yet
+        responding = asyncio.create_task(asyncio.sleep(10))
+        await asyncio.sleep(0)
+        assert await agent._barge_in(responding, time.monotonic())
+        return responding
+
+    assert asyncio.run(run()).cancelled()
+    assert agent.last_barge_in_latency is None
+
+if __name__ == "__main__":
+    from conftest import FakePlayer
+    test_barge_in_stops_playback_after_the_answer_is_cancelled(FakePlayer())
+    test_barge_in_only_silences_its_own_session()
+    test_speech_after_the_answer_is_not_a_barge_in(FakePlayer())
+    test_speech_before_any_audio_cancels_without_a_latency_sample(FakePlayer())
+    print("✅ Barge-in tests passed")
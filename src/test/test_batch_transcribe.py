@@ -0,0 +1,76 @@
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+import numpy as np
+import soundfile as sf
+from src.pipeline import batch_transcribe
+from src.pipeline.batch_transcribe import BatchTranscriber, SpeechChunker, iter_audio_blocks, load_completed
+
+class ThresholdVAD:
+    window_size = 160
+
+    def reset(self):
+        pass
+
+    def __call__(self, window):
+        return 1.0 if np.abs(window).max() > 0.1 else 0.0
+
+class FakeModel:
+    def transcribe(self, audio, beam_size, language):
+        return [SimpleNamespace(start=0.0, end=len(audio) / 16000, text=f" {len(audio) // 1600}")], None
+
+def tone(seconds, level, sr=16000):
+    return np.full(int(sr * seconds), level, dtype=np.float32)
+
+def test_chunker_splits_on_pauses_and_caps_length():
+    chunker = SpeechChunker(ThresholdVAD(), min_silence_ms=300, max_chunk_seconds=2, pad_ms=0)
+    audio = np.concatenate([tone(0.5, 0), tone(1.0, 0.5), tone(0.5, 0), tone(3.0, 0.5), tone(0.5, 0)])
+    chunks = []
+    for i in range(0, len(audio), 4000):
+        chunks += chunker.feed(audio[i:i + 4000])
+    chunks += chunker.flush()
+    starts = [start / 16000 for start, _ in chunks]
+    lengths = [len(a) / 16000 for _, a in chunks]
+    assert abs(starts[0] - 0.5) < 0.02 and abs(lengths[0] - 1.0) < 0.02
+    # The 3 s run is split at the 2 s cap, without overlap
+    assert all(length <= 2.01 for length in lengths)
+    assert abs(sum(lengths[1:]) - 3.0) < 0.02
+
+def test_resampling_keeps_duration():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "a.wav")
+        sf.write(path, np.zeros((44100 * 3, 2), dtype=np.float32), 44100)
+        total = sum(len(b) for b in iter_audio_blocks(path, block_seconds=0.7))
+        assert abs(total - 48000) <= 1
+
+def test_run_writes_in_order_and_resumes():
+    batch_transcribe._model = FakeModel()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for name, seconds in [("a.wav", 1.0), ("b.wav", 2.0), ("c.wav", 0.5)]:
+            path = os.path.join(tmp, name)
+            sf.write(path, np.concatenate([tone(0.3, 0), tone(seconds, 0.5), tone(0.3, 0)]), 16000)
+            paths.append(path)
+        output = os.path.join(tmp, "out.jsonl")
+        with ThreadPoolExecutor(2) as pool:
+            transcriber = BatchTranscriber(workers=2, vad=ThresholdVAD(), executor=pool)
+            report = transcriber.run(paths[:2], output, root=tmp)
+            assert report["files"] == 2
+            # Simulate a crash mid-write, then resume with the full list
+            with open(output, "a") as f:
+                f.write('{"file": "c.wa')
+            report = transcriber.run(paths, output, root=tmp)
+        assert report["files"] == 1
+        records = [json.loads(line) for line in open(output)]
+        assert [r["file"] for r in records] == ["a.wav", "b.wav", "c.wav"]
+        # Segment times are relative to the file (speech at 0.3 s minus 0.2 s padding)
+        assert abs(records[1]["segments"][0]["start"] - 0.1) < 0.02
+        assert load_completed(output) == {"a.wav", "b.wav", "c.wav"}
+
+if __name__ == "__main__":
+    test_chunker_splits_on_pauses_and_caps_length()
+    test_resampling_keeps_duration()
+    test_run_writes_in_order_and_resumes()
+    print("✅ Batch transcription tests passed")
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import time
+import numpy as np
+from src.benchmarks.bench_pipeline import compare
+from src.benchmarks.mock_providers import MockProfile, MockProviderServer, parse_overrides, start_mock_providers
+from src.components.audio_capture import FileAudioSource
+from src.components.audio_player import NullAudioSink
+from src.components.vad import EnergyVAD, VADEndpointer
+from src.core.transport import HTTPTransport
+
+def test_parse_overrides():
+    assert parse_overrides(["groq.ttft_ms=300", "groq.reply=hi"]) == {"groq": {"ttft_ms": 300.0, "reply": "hi"}}
+    try:
+        parse_overrides(["groq.nope=1"])
+        assert False, "unknown field accepted"
+    except ValueError:
+        pass
+
+def test_streamed_chat_through_transport_override():
+    server = MockProviderServer("perplexity", MockProfile(ttft_ms=80, tokens_per_s=500, jitter=0, reply="a b c")).start()
+    transport = HTTPTransport(overrides={"perplexity": server.url})
+
+    async def stream():
+        started = time.perf_counter()
+        first, deltas = None, []
+        client = transport.async_client("perplexity")
+        async with client.stream("POST", "https://api.perplexity.ai/chat/completions",
+                                 json={"stream": True, "messages": []}) as response:
+            async for line in response.aiter_lines():
+                if not line.startswith("data:") or line.endswith("[DONE]"):
+                    continue
+                delta = json.loads(line[5:])["choices"][0]["delta"].get("content")
+                if delta:
+                    first = first or time.perf_counter() - started
+                    deltas.append(delta)
+        return first, deltas
+
+    try:
+        first, deltas = asyncio.run(stream())
+        assert deltas == ["a ", "b ", "c"]
+        assert 0.07 <= first < 0.5
+        assert server.requests == 1
+    finally:
+        server.stop()
+
+def test_speech_and_failures():
+    servers = start_mock_providers({"ttsopenai": {"latency_ms": 0}, "elevenlabs": {"error_rate": 1.0}},
+                                   names=["ttsopenai", "elevenlabs"])
+    transport = HTTPTransport(overrides={name: s.url for name, s in servers.items()})
+    try:
+        audio = transport.client("ttsopenai").post("https://api.ttsopenai.com/v1/audio/speech",
+                                                   json={"input": "नमस्ते"})
+        assert audio.status_code == 200
+        playback = NullAudioSink().play(audio.content, "mp3")
+        assert abs(playback.duration - 6 * 0.06) < 0.01
+        failed = transport.client("elevenlabs").post("https://api.elevenlabs.io/v1/text-to-speech/voice",
+                                                     json={"text": "hi"})
+        assert failed.status_code == 503
+    finally:
+        for server in servers.values():
+            server.stop()
+
+def test_file_audio_source_endpoints_like_a_microphone():
+    import soundfile as sf, tempfile, os
+    samplerate = 8000
+    t = np.arange(samplerate) / samplerate
+    speech = np.concatenate([np.zeros(samplerate // 4), 0.3 * np.sin(2 * np.pi * 200 * t)])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "utterance.wav")
+        sf.write(path, speech, samplerate)
+        source = FileAudioSource([path], samplerate=16000, buffer_seconds=5, speed=20)
+
+    endpointer = VADEndpointer(vad=EnergyVAD(), samplerate=16000, silence_ms=300, pad_ms=0)
+    for _ in range(2):
+        with source:
+            utterance = endpointer.listen(source.frames(5), 5)
+        assert utterance is not None and abs(utterance.duration - 1.0) < 0.1
+    assert source.played == 2 and not source.active
+
+def test_compare_flags_regressions():
+    baseline = {"ttfa_p50_ms": 500, "ttfa_p95_ms": 800, "turn_p50_ms": 1500, "turn_p95_ms": 2000,
+                "turns_per_s": 1.0, "failed": 0, "turns": 20}
+    assert compare(dict(baseline, ttfa_p50_ms=600), baseline, 0.2, 50) == []
+    regressions = compare(dict(baseline, ttfa_p95_ms=1100, turns_per_s=0.7, failed=1), baseline, 0.2, 50)
+    assert len(regressions) == 3
+    assert regressions[0].startswith("ttfa_p95_ms")
+    # Too few turns for a stable p95: only the p50s are compared
+    short = dict(baseline, turns=5)
+    assert compare(dict(short, ttfa_p95_ms=1100), short, 0.2, 50) == []
+    assert compare(dict(short, ttfa_p50_ms=700), short, 0.2, 50)[0].startswith("ttfa_p50_ms")
+
+if __name__ == "__main__":
+    test_parse_overrides()
+    test_streamed_chat_through_transport_override()
+    test_speech_and_failures()
+    test_file_audio_source_endpoints_like_a_microphone()
+    test_compare_flags_regressions()
+    print("✅ Benchmark harness tests passed")
@@ -0,0 +1,49 @@
+import time
+from src.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker("test", failure_threshold=2, backoff=10, max_backoff=60)
+    breaker.record_failure("timeout")
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure("timeout")
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+def test_half_open_lets_one_trial_through():
+    breaker = CircuitBreaker("test", failure_threshold=1, backoff=0.01, max_backoff=1)
+    breaker.record_failure("boom")
+    time.sleep(0.02)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+def test_failed_trial_reopens_with_longer_backoff():
+    breaker = CircuitBreaker("test", failure_threshold=1, backoff=0.01, max_backoff=1)
+    breaker.record_failure("boom")
+    first = breaker.snapshot()["retry_in"]
+    time.sleep(0.02)
+    assert breaker.allow()
+    breaker.record_failure("still down")
+    assert breaker.state == OPEN
+    assert breaker.snapshot()["retry_in"] > first
+
+def test_probe_controls_recovery():
+    healthy = []
+    breaker = CircuitBreaker("test", probe=lambda: bool(healthy), failure_threshold=1, backoff=0.0, max_backoff=1)
+    breaker.record_failure("boom")
+    # With a probe, an expired backoff alone doesn't let traffic through
+    assert not breaker.allow()
+    breaker.run_probe()
+    assert breaker.state == OPEN
+    healthy.append(True)
+    breaker.run_probe()
+    assert breaker.state == HALF_OPEN and breaker.allow()
+
+if __name__ == "__main__":
+    test_opens_after_consecutive_failures()
+    test_half_open_lets_one_trial_through()
+    test_failed_trial_reopens_with_longer_backoff()
+    test_probe_controls_recovery()
+    print("✅ Circuit breaker tests passed")
@@ -0,0 +1,72 @@
+import threading
+from config.settings import Settings
+from src.components.conversation_memory import ConversationMemory, estimate_tokens
+
+def test_recent_turns_are_sent_with_the_query():
+    memory = ConversationMemory(budget_tokens=1000, system_prompt="You are a travel assistant.")
+    memory.add_turn("Goa kab jana accha hai?", "November se February sabse accha hai.")
+    messages = memory.messages("and the hotels there?")
+    assert [m["role"] for m in messages] == ["system", "user", "assistant", "user"]
+    assert messages[-1]["content"] == "and the hotels there?"
+
+def test_prompt_size_stays_flat_and_old_turns_are_summarized():
+    calls = []
+
+    def summarize(previous, turns):
+        calls.append(len(turns))
+        return (previous + " " + " ".join(user for user, _ in turns)).strip()
+
+    memory = ConversationMemory(summarize=summarize, budget_tokens=300, summary_tokens=60)
+    sizes = []
+    for i in range(40):
+        memory.add_turn(f"Question number {i} about Jaipur forts and food?", "A fairly long answer " * 8)
+        memory.wait(2)
+        sizes.append(memory.prompt_tokens("next question?"))
+    assert max(sizes) <= 300
+    assert calls and memory.summary
+    # Summaries are bounded too, so the prompt does not creep up over time
+    assert estimate_tokens(memory.summary) <= 60 + 5
+    assert max(sizes[20:]) - min(sizes[20:]) < 100
+
+def test_summarization_runs_in_the_background():
+    release = threading.Event()
+
+    def slow_summarize(previous, turns):
+        release.wait(2)
+        return "summary"
+
+    memory = ConversationMemory(summarize=slow_summarize, budget_tokens=200, summary_tokens=20)
+    for i in range(10):
+        memory.add_turn(f"question {i} " * 5, "answer " * 20)
+    # Still summarizing, but building a prompt doesn't wait and stays within budget
+    assert memory.prompt_tokens("q") <= 200
+    release.set()
+    memory.wait(2)
+    assert memory.summary == "summary"
+
+def test_memories_share_the_summarizer_threads():
+    before = threading.active_count()
+    memories = [ConversationMemory(summarize=lambda previous, turns: "s", budget_tokens=200, summary_tokens=20)
+                for _ in range(20)]
+    for memory in memories:
+        for i in range(5):
+            memory.add_turn(f"question {i} " * 5, "answer " * 20)
+    for memory in memories:
+        memory.wait(2)
+        assert memory.summary == "s"
+    # One pool for the process, not a thread per session
+    assert threading.active_count() - before <= Settings.MEMORY_SUMMARY_WORKERS
+
+def test_approx_bytes_counts_the_stored_turns():
+    memory = ConversationMemory(budget_tokens=10000)
+    empty = memory.approx_bytes()
+    memory.add_turn("Goa kab jana accha hai?", "November se February. " * 50)
+    assert memory.approx_bytes() - empty > 1000
+
+if __name__ == "__main__":
+    test_recent_turns_are_sent_with_the_query()
+    test_prompt_size_stays_flat_and_old_turns_are_summarized()
+    test_summarization_runs_in_the_background()
+    test_memories_share_the_summarizer_threads()
+    test_approx_bytes_counts_the_stored_turns()
+    print("✅ Conversation memory tests passed")
@@ -0,0 +1,49 @@
+import os
+import tempfile
+from src.components.llm_cache import (
+    InMemoryCacheBackend, LLMResponseCache, SQLiteCacheBackend, normalize_query
+)
+
+def test_normalize_query_variants():
+    assert normalize_query("Weather in GOA??") == normalize_query("weather in goa")
+    assert normalize_query("Goa mein kia dekhna hai!") == normalize_query("goa mai kya dekhna hain")
+    assert normalize_query("गोवा में क्या देखें?") == "गोवा में क्या देखें"
+    # English words are never rewritten as Hinglish
+    assert normalize_query("Tell me about Goa") == "tell me about goa"
+
+def test_memory_backend_lru_and_ttl():
+    backend = InMemoryCacheBackend(max_entries=2)
+    backend.set("a", "1")
+    backend.set("b", "2")
+    backend.get("a")
+    backend.set("c", "3")
+    assert backend.get("b") is None
+    assert backend.get("a") == "1"
+    backend.set("expired", "x", ttl=-1)
+    assert backend.get("expired") is None
+
+def test_sqlite_backend_round_trip():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.sqlite3")
+        cache = LLMResponseCache(SQLiteCacheBackend(path, max_entries=1), ttl=60)
+        cache.put("m", "sys", "Best time to visit Manali?", "October to June")
+        assert cache.get("m", "sys", "best time to visit manali") == "October to June"
+        cache.put("m", "sys", "Weather in Goa", "Sunny")
+        assert cache.get("m", "sys", "best time to visit manali") is None
+        assert len(cache.backend) == 1
+
+def test_engine_caches_only_the_preferred_backends_answers(engine_factory):
+    engine = engine_factory({"groq": None, "ollama": None}, cache=LLMResponseCache(InMemoryCacheBackend()))
+    engine._remember("Weather in Goa", "Rainy (llama2)", "ollama")
+    assert engine._cached("Weather in Goa") is None and len(engine.cache.backend) == 0
+    engine._remember("Weather in Goa", "Sunny", "groq")
+    assert engine.cache_model == "groq:llama-3.1-8b-instant"
+    assert engine._cached("weather in goa") == "Sunny"
+
+if __name__ == "__main__":
+    from conftest import make_engine
+    test_normalize_query_variants()
+    test_memory_backend_lru_and_ttl()
+    test_sqlite_backend_round_trip()
+    test_engine_caches_only_the_preferred_backends_answers(make_engine)
+    print("✅ LLM cache tests passed")
@@ -0,0 +1,84 @@
+import asyncio
+from src.components.llm_router import LLMRouter
+
+def source(delay, text="hi there", fail=False):
+    async def stream(prompt):
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("backend down")
+        for word in text.split(" "):
+            yield word + " "
+    return stream
+
+async def collect(router, prompt="hello"):
+    return "".join([delta async for delta in router.astream(prompt)])
+
+async def drain(stream):
+    return [delta async for delta in stream]
+
+def test_hedge_wins_when_primary_is_slow():
+    router = LLMRouter({"slow": source(0.5, "slow answer"), "fast": source(0.01, "fast answer")},
+                       hedge=True, default_deadline=50, min_deadline=10)
+    assert asyncio.run(collect(router)) == "fast answer "
+    metrics = router.metrics()
+    assert metrics["decisions"]["hedged"] == 1
+    assert metrics["decisions"]["hedge_won"] == 1
+    assert metrics["providers"]["slow"]["cancelled"] == 1
+
+def test_no_hedge_when_primary_is_fast():
+    router = LLMRouter({"a": source(0.0, "one"), "b": source(0.0, "two")},
+                       hedge=True, default_deadline=200, min_deadline=10)
+    assert asyncio.run(collect(router)) == "one "
+    assert router.metrics()["decisions"]["hedged"] == 0
+    assert router.stats["b"].requests == 0
+
+def test_failover_and_ranking_by_latency():
+    router = LLMRouter({"broken": source(0.0, fail=True), "ok": source(0.0, "fine")},
+                       hedge=True, default_deadline=200, min_deadline=10)
+    assert asyncio.run(collect(router)) == "fine "
+    assert router.metrics()["decisions"]["failover"] == 1
+    # The failing backend is now ranked behind the healthy one
+    assert router.rank() == ["ok", "broken"]
+
+def test_all_backends_failing_raises():
+    router = LLMRouter({"a": source(0.0, fail=True)}, hedge=True, default_deadline=200, min_deadline=10)
+    try:
+        asyncio.run(collect(router))
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected the backend error to propagate")
+
+def test_cancelled_slow_backend_keeps_a_lower_bound_sample():
+    router = LLMRouter({"slow": source(0.3, "slow answer"), "fast": source(0.0, "fast answer")},
+                       hedge=True, default_deadline=200, min_deadline=10)
+    # It used to answer in 20 ms, so hedging starts after its p95
+    router.stats["slow"].ttfts.extend([0.02] * router.min_samples)
+    assert asyncio.run(collect(router)) == "fast answer "
+    assert router.stats["slow"].cancelled == 1
+    assert len(router.stats["slow"].ttfts) == router.min_samples + 1
+    assert router.stats["slow"].ttfts[-1] >= 0.02
+    # The hedge that lost after barely starting gets no sample
+    router = LLMRouter({"a": source(0.01, "one"), "b": source(0.3, "two")},
+                       hedge=True, default_deadline=0, min_deadline=0)
+    router.deadline = lambda name: 0.0 if name == "a" else 1.0
+    assert asyncio.run(collect(router)) == "one "
+    assert router.stats["b"].cancelled == 1 and not router.stats["b"].ttfts
+
+def test_unrecorded_requests_leave_the_stats_alone():
+    router = LLMRouter({"broken": source(0.0, fail=True), "ok": source(0.0, "fine")},
+                       hedge=True, default_deadline=200, min_deadline=10)
+    summary = "".join(asyncio.run(drain(router.astream("summarize", record=False))))
+    assert summary == "fine "
+    metrics = router.metrics()
+    assert metrics["decisions"]["turns"] == 0 and metrics["last_route"] is None
+    assert all(p["requests"] == 0 and p["p50_ms"] is None for p in metrics["providers"].values())
+
+if __name__ == "__main__":
+    test_hedge_wins_when_primary_is_slow()
+    test_no_hedge_when_primary_is_fast()
+    test_failover_and_ranking_by_latency()
+    test_all_backends_failing_raises()
+    test_cancelled_slow_backend_keeps_a_lower_bound_sample()
+    test_unrecorded_requests_leave_the_stats_alone()
+    print("✅ LLM router tests passed")
@@ -0,0 +1,44 @@
+import asyncio
+import time
+from src.components.llm_cache import InMemoryCacheBackend, LLMResponseCache
+
+def source(delay, text):
+    async def stream(messages):
+        await asyncio.sleep(delay)
+        for word in text.split(" "):
+            yield word + " "
+    return stream
+
+def test_stream_query_yields_deltas_and_reports_ttft(engine_factory):
+    engine = engine_factory({"groq": source(0.05, "Goa is sunny")})
+    route = {}
+    start = time.monotonic()
+    deltas = list(engine.stream_query("Weather in Goa?", route=route))
+    assert deltas == ["Goa ", "is ", "sunny "]
+    assert route["winner"] == "groq"
+    assert 0.05 <= route["ttft"] <= time.monotonic() - start
+
+def test_each_call_gets_its_own_route(engine_factory):
+    engine = engine_factory({"groq": source(0.0, "first")})
+    first, second = {}, {}
+    list(engine.stream_query("one", route=first))
+    assert engine.query("two") == "first "
+    list(engine.stream_query("three", route=second))
+    # Nothing is kept on the shared engine; each caller reads its own result
+    assert first["winner"] == second["winner"] == "groq"
+    assert first["ttft"] is not None and second["ttft"] is not None
+
+def test_cached_answers_report_the_cache(engine_factory):
+    cache = LLMResponseCache(InMemoryCacheBackend())
+    engine = engine_factory({"groq": source(0.05, "Goa is sunny")}, cache=cache)
+    list(engine.stream_query("Weather in Goa?"))
+    route = {}
+    assert list(engine.stream_query("weather in goa", route=route)) == ["Goa is sunny "]
+    assert route["winner"] == "cache" and route["ttft"] < 0.05
+
+if __name__ == "__main__":
+    from conftest import make_engine
+    test_stream_query_yields_deltas_and_reports_ttft(make_engine)
+    test_each_call_gets_its_own_route(make_engine)
+    test_cached_answers_report_the_cache(make_engine)
+    print("✅ LLM streaming tests passed")
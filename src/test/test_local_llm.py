@@ -0,0 +1,119 @@
+import asyncio
+import time
+from src.components.llm_router import LLMRouter
+from src.components.local_llm import LlamaCppModel, LocalLLM, LocalLLMBusy
+
+SYSTEM = {"role": "system", "content": "You are a helpful travel assistant."}
+
+class FakeModel:
+    """Streams the user's words back, one 'token' every ``delay`` seconds."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.generated = 0
+        self.running = 0
+        self.max_running = 0
+
+    def stream(self, messages, max_tokens, temperature):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            for word in messages[-1]["content"].split()[:max_tokens]:
+                time.sleep(self.delay)
+                self.generated += 1
+                yield word + " "
+        finally:
+            self.running -= 1
+
+async def _drain(stream):
+    return "".join([delta async for delta in stream])
+
+def ask(llm, text):
+    async def run():
+        return "".join([delta async for delta in llm.astream([SYSTEM, {"role": "user", "content": text}])])
+    return asyncio.run(run())
+
+def test_streams_answer_and_tracks_speed():
+    llm = LocalLLM(model=FakeModel(delay=0.01))
+    assert ask(llm, "three days in Jaipur") == "three days in Jaipur "
+    metrics = llm.metrics()
+    assert metrics["requests"] == 1 and metrics["ttft_p50_ms"] >= 10
+    assert 50 < metrics["tokens_per_s"] < 110
+
+def test_queue_bounds_waiting_requests():
+    model = FakeModel(delay=0.02)
+    llm = LocalLLM(model=model, max_queue=1)
+
+    async def run():
+        asks = [llm.astream([SYSTEM, {"role": "user", "content": "a b c d e"}]) for _ in range(3)]
+        consume = lambda stream: asyncio.ensure_future(_drain(stream))
+        first = consume(asks[0])
+        await asyncio.sleep(0.01)  # worker has taken the first request
+        second = consume(asks[1])
+        await asyncio.sleep(0.01)
+        try:
+            await _drain(asks[2])
+            assert False, "third request should not fit in the queue"
+        except LocalLLMBusy:
+            pass
+        return await first, await second
+
+    assert asyncio.run(run()) == ("a b c d e ", "a b c d e ")
+    assert model.max_running == 1 and llm.metrics()["rejected"] == 1
+
+def test_leaving_early_stops_generation():
+    model = FakeModel(delay=0.01)
+    llm = LocalLLM(model=model)
+
+    async def run():
+        stream = llm.astream([SYSTEM, {"role": "user", "content": " ".join(["word"] * 50)}])
+        async for _ in stream:
+            break
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+    assert model.generated < 10
+
+def test_system_prompt_state_is_reused(llama_model):
+    model = llama_model
+    summary = {"role": "system", "content": "Summarize the conversation."}
+    for system in (SYSTEM, SYSTEM, summary, SYSTEM):
+        assert list(model.stream([system, {"role": "user", "content": "hi"}], 10, 0.0)) == ["ok"]
+    # Each prompt is prefilled once; coming back to the travel prompt restores its saved state
+    assert model.llm.calls == ["reset", "prefill", "save", "chat", "chat",
+                               "reset", "prefill", "save", "chat", "load", "chat"]
+    assert model.prefix_hits == model.llm.calls.count("load") == 1
+
+def test_router_falls_back_to_local_model():
+    llm = LocalLLM(model=FakeModel())
+
+    async def outage(messages):
+        raise ConnectionError("provider down")
+        yield
+
+    async def run():
+        router = LLMRouter({"groq": outage, "local": llm.astream}, hedge=False)
+        route = {}
+        text = "".join([d async for d in router.astream([SYSTEM, {"role": "user", "content": "still here"}], route)])
+        return text, route["winner"]
+
+    assert asyncio.run(run()) == ("still here ", "local")
+
+def test_model_is_never_downloaded_implicitly():
+    try:
+        LlamaCppModel(path="", download=False)
+    except RuntimeError as e:
+        assert "LOCAL_LLM_MODEL_PATH" in str(e)
+    else:
+        raise AssertionError("expected a missing model path to be refused")
+
+if __name__ == "__main__":
+    from conftest import make_llama_model
+    test_streams_answer_and_tracks_speed()
+    test_queue_bounds_waiting_requests()
+    test_leaving_early_stops_generation()
+    test_system_prompt_state_is_reused(make_llama_model())
+    test_router_falls_back_to_local_model()
+    test_model_is_never_downloaded_implicitly()
+    print("✅ Local LLM tests passed")
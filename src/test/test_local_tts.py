@@ -0,0 +1,86 @@
+import threading
+import time
+import numpy as np
+from src.components.audio_player import NullAudioSink, decode_audio
+from src.components.local_tts import PCM_FORMAT, LocalTTS, to_pcm16
+
+class FakeVoice:
+    """Speaks 10 ms of audio per character, slowly, and counts overlapping calls."""
+    samplerate = 16000
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.texts = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, text):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            self.texts.append(text)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        return np.full(len(text) * 160, 0.5, dtype=np.float32)
+
+def test_streams_one_pcm_chunk_per_sentence():
+    voice = FakeVoice()
+    tts = LocalTTS(voice=voice)
+    chunks = list(tts.stream("Namaste! Goa is lovely in December. Shall I look for hotels?"))
+    assert voice.texts == ["Namaste!", "Goa is lovely in December.", "Shall I look for hotels?"]
+    assert [len(chunk) for chunk in chunks] == [len(text) * 160 * 2 for text in voice.texts]
+    metrics = tts.metrics()
+    assert metrics["sentences"] == 3 and abs(metrics["audio_seconds"] - sum(map(len, voice.texts)) / 100) < 1e-6
+
+def test_pcm_round_trip_and_clipping():
+    pcm = to_pcm16(np.array([0.0, 0.5, 2.0, -2.0], dtype=np.float32))
+    assert np.frombuffer(pcm, dtype="<i2").tolist() == [0, 16383, 32767, -32767]
+    samples, sr = decode_audio(pcm, PCM_FORMAT)
+    assert sr == 16000 and samples.shape == (4, 1)
+    playback = NullAudioSink().play(pcm * 4000, PCM_FORMAT)
+    assert abs(playback.duration - 1.0) < 1e-9
+
+def test_shared_voice_bounds_concurrency():
+    voice = FakeVoice(delay=0.02)
+    tts = LocalTTS(voice=voice, workers=1)
+    threads = [threading.Thread(target=tts.synthesize, args=(f"Sentence {i}.",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert voice.max_running == 1 and len(voice.texts) == 4
+
+def test_failed_local_voice_hands_only_the_rest_to_fallbacks(tts_factory):
+    voice = FakeVoice()
+
+    def flaky(text):
+        if text.startswith("Goa"):
+            raise RuntimeError("out of memory")
+        return voice(text)
+
+    tts = tts_factory(["local", "ttsopenai"], local=LocalTTS(voice=flaky))
+    asked = []
+    tts.synthesize = lambda text, exclude=(): asked.append((text, exclude)) or (b"\0\0" * 160, PCM_FORMAT)
+    tts.speak("Namaste! Goa is lovely in December. Shall I look for hotels?")
+    assert voice.texts == ["Namaste!"]
+    assert asked == [("Goa is lovely in December. Shall I look for hotels?", ("local",))]
+    assert tts.player.clips == 2
+
+def test_direct_speech_skips_every_audio_provider(tts_factory):
+    voice = FakeVoice()
+    tts = tts_factory(["local", "ttsopenai"], local=LocalTTS(voice=voice))
+    asked = []
+    tts.synthesize = lambda text, exclude=(): asked.append(set(exclude)) or None
+    tts.speak_direct("Namaste!")
+    assert voice.texts == [] and asked == [{"ttsopenai", "elevenlabs", "local"}]
+
+if __name__ == "__main__":
+    from conftest import make_tts
+    test_streams_one_pcm_chunk_per_sentence()
+    test_pcm_round_trip_and_clipping()
+    test_shared_voice_bounds_concurrency()
+    test_failed_local_voice_hands_only_the_rest_to_fallbacks(make_tts)
+    test_direct_speech_skips_every_audio_provider(make_tts)
+    print("✅ Local TTS tests passed")
@@ -0,0 +1,86 @@
+import numpy as np
+from src.components.semantic_cache import SemanticCache, VectorIndex
+
+class HashEmbedder:
+    """Bag-of-words embedder so tests don't need the transformer model."""
+    dim = 64
+
+    def embed(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                out[i, hash(word) % self.dim] += 1.0
+        return out / np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-9)
+
+def test_semantic_cache_hits_close_queries_only():
+    cache = SemanticCache(HashEmbedder(), threshold=0.8, capacity=10)
+    cache.add("what to see in goa", "Beaches and forts", namespace="m")
+    assert cache.lookup("What to see in Goa", namespace="m") == "Beaches and forts"
+    assert cache.lookup("What to see in Goa", namespace="other") is None
+    assert cache.lookup("hotels in manali", namespace="m") is None
+    assert cache.lookup_batch(["what to see in goa", "hotels in manali"], namespace="m") == ["Beaches and forts", None]
+
+def test_nearer_entry_in_another_namespace_does_not_hide_a_hit():
+    cache = SemanticCache(HashEmbedder(), threshold=0.5, capacity=10)
+    cache.add("what to see in goa", "Beaches and forts", namespace="groq")
+    cache.add("what to see in goa today", "Fallback answer", namespace="ollama")
+    assert cache.lookup("what to see in goa today", namespace="groq") == "Beaches and forts"
+    assert cache.lookup_batch(["what to see in goa today"], namespace="groq") == ["Beaches and forts"]
+    assert cache.lookup("what to see in goa", namespace="perplexity") is None
+
+def test_vector_index_filters_labels_before_picking_the_best():
+    rng = np.random.default_rng(2)
+    data = rng.standard_normal((600, 16)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    for ivf_min in (10_000, 256):
+        index = VectorIndex(16, 600, nprobe=64, ivf_min=ivf_min)
+        for i, vector in enumerate(data):
+            index.add(vector, label=i % 2)
+        # Each query is itself under label 0; with label 1 the best must be a different entry
+        slot, _ = index.search(data[0], label=1)
+        assert slot % 2 == 1
+        slots, _ = index.search_batch(data[:10:2], label=1)
+        assert all(s % 2 == 1 for s in slots)
+        assert list(index.search_batch(data[:10:2], label=0)[0]) == list(range(0, 10, 2))
+
+def test_vector_index_ivf_matches_exact_search():
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((600, 16)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    index = VectorIndex(16, 600, nprobe=64, ivf_min=256)
+    for vector in data:
+        index.add(vector)
+    assert index._centroids is not None
+    slots, _ = index.search_batch(data[:50])
+    assert list(slots) == list(range(50))
+    assert [index.search(v)[0] for v in data[:50]] == list(range(50))
+
+def test_vector_index_batch_probes_the_same_lists_as_single_lookups():
+    rng = np.random.default_rng(1)
+    data = rng.standard_normal((2000, 16)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    index = VectorIndex(16, 3000, nprobe=4, ivf_min=1000)
+    for vector in data:
+        index.add(vector)
+    queries = data[:64] + 0.3 * rng.standard_normal((64, 16)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    slots, scores = index.search_batch(queries)
+    single = [index.search(q) for q in queries]
+    assert list(slots) == [slot for slot, _ in single]
+    assert np.allclose(scores, [score for _, score in single], atol=1e-5)
+
+def test_vector_index_reuses_least_recently_used_slot():
+    index = VectorIndex(2, 2)
+    index.add(np.array([1.0, 0.0], dtype=np.float32))
+    index.add(np.array([0.0, 1.0], dtype=np.float32))
+    index.search(np.array([1.0, 0.0], dtype=np.float32))
+    assert index.add(np.array([0.6, 0.8], dtype=np.float32)) == (1, 1)
+
+if __name__ == "__main__":
+    test_semantic_cache_hits_close_queries_only()
+    test_nearer_entry_in_another_namespace_does_not_hide_a_hit()
+    test_vector_index_filters_labels_before_picking_the_best()
+    test_vector_index_ivf_matches_exact_search()
+    test_vector_index_batch_probes_the_same_lists_as_single_lookups()
+    test_vector_index_reuses_least_recently_used_slot()
+    print("✅ Semantic cache tests passed")
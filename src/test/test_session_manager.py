@@ -0,0 +1,78 @@
+import asyncio
+import time
+from src.components.conversation_memory import ConversationMemory
+from src.core.utils import get_background_loop
+from src.pipeline.session_manager import ServerBusy, SessionLimitReached, SessionManager
+
+class FakeAgent:
+    def __init__(self):
+        self.memory = ConversationMemory(budget_tokens=10000)
+        self.last_latency = 0.1
+        self.last_user_text = None
+
+    async def arun_conversation(self, duration):
+        await asyncio.sleep(duration)
+        self.last_user_text = "Goa kab jana accha hai?"
+        return "November se February."
+
+def make_manager(**kwargs):
+    return SessionManager(components={}, agent_factory=FakeAgent, **kwargs)
+
+def test_turn_updates_compact_history():
+    manager = make_manager(max_sessions=2)
+    session = manager.open_session()
+    assert manager.turn(session.session_id, duration=0) == "November se February."
+    assert session.state.turns == 1
+    assert session.state.history[0][1] == "Goa kab jana accha hai?"
+    assert manager.metrics()["bytes_per_session"] > 0
+
+def test_admission_control_queues_then_rejects():
+    manager = make_manager(max_concurrent=1, max_queue=1)
+    ids = [manager.open_session().session_id for _ in range(3)]
+
+    async def three_turns():
+        first = asyncio.ensure_future(manager.aturn(ids[0], 0.2))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(manager.aturn(ids[1], 0))
+        await asyncio.sleep(0.01)
+        assert manager.metrics()["queued"] == 1
+        try:
+            await manager.aturn(ids[2], 0)
+        except ServerBusy:
+            rejected = True
+        else:
+            rejected = False
+        await asyncio.gather(first, second)
+        return rejected
+
+    assert get_background_loop().run(three_turns())
+    assert manager.metrics()["rejected"] == 1
+
+def test_idle_sessions_are_evicted_to_make_room():
+    manager = make_manager(max_sessions=1, idle_timeout=0.05)
+    first = manager.open_session()
+    try:
+        manager.open_session()
+    except SessionLimitReached:
+        pass
+    else:
+        raise AssertionError("expected the session limit to apply")
+    time.sleep(0.06)
+    second = manager.open_session()
+    assert manager.get(first.session_id) is None
+    assert manager.get(second.session_id) is second
+    assert manager.metrics()["evicted"] == 1
+
+def test_session_size_includes_its_memory():
+    manager = make_manager()
+    session = manager.open_session()
+    before = session.approx_bytes()
+    session.agent.memory.add_turn("Goa kab jana accha hai?", "November se February. " * 50)
+    assert session.approx_bytes() - before > 1000
+
+if __name__ == "__main__":
+    test_turn_updates_compact_history()
+    test_admission_control_queues_then_rejects()
+    test_idle_sessions_are_evicted_to_make_room()
+    test_session_size_includes_its_memory()
+    print("✅ Session manager tests passed")
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+import time
+from config.settings import Settings
+import src.pipeline.main as main
+
+HEAVY = ("groq", "ollama", "openai", "elevenlabs", "faster_whisper", "torch", "transformers", "sounddevice")
+
+def test_pipeline_import_defers_optional_backends():
+    code = f"import sys, src.pipeline.main; print([m for m in {HEAVY!r} if m in sys.modules])"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]", result.stdout
+
+class Slow:
+    def __init__(self):
+        time.sleep(0.2)
+
+def test_components_are_built_concurrently():
+    saved = main.STT, main.LLMEngine, main.TTS
+    main.STT, main.LLMEngine, main.TTS = (type(name, (Slow,), {}) for name in ("STT", "LLMEngine", "TTS"))
+    parallel = Settings.STARTUP_PARALLEL_INIT
+    try:
+        Settings.STARTUP_PARALLEL_INIT = True
+        shared_tts = object()
+        start = time.perf_counter()
+        components = main.build_components(tts=shared_tts)
+        elapsed = time.perf_counter() - start
+        assert components["tts"] is shared_tts
+        assert type(components["stt"]).__name__ == "STT" and type(components["llm"]).__name__ == "LLMEngine"
+        assert elapsed < 0.35, f"{elapsed:.2f}s"
+
+        Settings.STARTUP_PARALLEL_INIT = False
+        start = time.perf_counter()
+        main.build_components()
+        assert time.perf_counter() - start >= 0.6
+    finally:
+        main.STT, main.LLMEngine, main.TTS = saved
+        Settings.STARTUP_PARALLEL_INIT = parallel
+
+if __name__ == "__main__":
+    test_pipeline_import_defers_optional_backends()
+    test_components_are_built_concurrently()
+    print("✅ Startup tests passed")
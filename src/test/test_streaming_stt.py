@@ -0,0 +1,90 @@
+import asyncio
+from contextlib import contextmanager
+from types import SimpleNamespace
+import numpy as np
+from src.components.streaming_stt import StreamingTranscriber
+
+# 100 Hz "audio" so one decode step is 100 samples; word times are seconds into the window
+SCRIPT = [
+    [(0.0, 0.5, " namaste"), (0.5, 1.0, " goa")],
+    [(0.0, 0.5, " Namaste"), (0.5, 1.0, " goa,"), (1.0, 1.8, " trip")],
+    [(0.0, 0.8, " trip"), (0.8, 1.5, " plan")],
+    [(0.0, 0.7, " plan"), (0.7, 1.0, " karo")],
+]
+
+class FakeModel:
+    def __init__(self, script):
+        self.script = list(script)
+        self.seen = []  # (window length, initial prompt) per decode
+
+    def transcribe(self, audio, initial_prompt=None, **kwargs):
+        self.seen.append((len(audio), initial_prompt))
+        words = [SimpleNamespace(start=s, end=e, word=w) for s, e, w in self.script.pop(0)]
+        return [SimpleNamespace(words=words)], None
+
+class FakePool:
+    def __init__(self, script):
+        self.model = FakeModel(script)
+
+    @contextmanager
+    def acquire(self):
+        yield self.model
+
+def make(script=SCRIPT, **kwargs):
+    pool = FakePool(script)
+    return pool.model, StreamingTranscriber(pool, samplerate=100, step_seconds=1, window_seconds=10, **kwargs)
+
+def test_commits_words_two_decodes_agree_on():
+    model, transcriber = make()
+    assert transcriber.feed(np.zeros(50)) is None
+    first = transcriber.feed(np.zeros(50))
+    assert (first.committed, first.partial, first.is_final) == ("", "namaste goa", False)
+    second = transcriber.feed(np.zeros(100))
+    # Agreement ignores case and punctuation; the newer spelling is kept
+    assert (second.committed, second.partial) == ("Namaste goa,", "trip")
+    third = transcriber.feed(np.zeros(100))
+    assert (third.committed, third.partial) == ("Namaste goa, trip", "plan")
+    # Committed audio is cut from the window and the committed text primes the next decode
+    assert model.seen[:3] == [(100, None), (200, None), (200, "Namaste goa,")]
+
+def test_finish_flushes_partial_words():
+    model, transcriber = make()
+    for _ in range(3):
+        transcriber.feed(np.zeros(100))
+    final = transcriber.finish()
+    assert final.is_final and final.partial == ""
+    assert final.text == final.committed == "Namaste goa, trip plan karo"
+    assert model.seen[-1] == (120, "Namaste goa, trip")
+
+def test_finish_without_audio_skips_decode():
+    model, transcriber = make()
+    final = transcriber.finish()
+    assert final.is_final and final.text == "" and model.seen == []
+
+def test_stream_and_astream_yield_partials_then_final():
+    chunks = [np.zeros(50, dtype=np.float32)] * 6
+    _, transcriber = make()
+    heard = []
+    transcriber.on_partial = heard.append
+    hypotheses = list(transcriber.stream(chunks))
+    assert [h.is_final for h in hypotheses] == [False, False, False, True]
+    assert hypotheses[-1].text == "Namaste goa, trip plan karo" and heard == hypotheses
+
+    async def feed():
+        for chunk in chunks:
+            yield chunk
+
+    async def run():
+        _, transcriber = make()
+        return [h async for h in transcriber.astream(feed())]
+
+    streamed = asyncio.run(run())
+    assert [(h.committed, h.partial, h.is_final) for h in streamed] == \
+        [(h.committed, h.partial, h.is_final) for h in hypotheses]
+
+if __name__ == "__main__":
+    test_commits_words_two_decodes_agree_on()
+    test_finish_flushes_partial_words()
+    test_finish_without_audio_skips_decode()
+    test_stream_and_astream_yield_partials_then_final()
+    print("✅ Streaming STT tests passed")
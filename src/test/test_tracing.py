@@ -0,0 +1,137 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+from src.core.tracing import Histogram, Tracer, get_tracer, trace_turn, traced
+
+def test_histogram_percentiles_within_bucket_error():
+    histogram = Histogram()
+    for ms in range(1, 1001):
+        histogram.record(ms / 1000)
+    assert histogram.count == 1000
+    for q, expected in ((50, 0.5), (95, 0.95), (99, 0.99)):
+        assert abs(histogram.percentile(q) - expected) / expected < 0.05
+    assert histogram.percentile(100) == histogram.max == 1.0
+
+def test_spans_grouped_by_stage_and_provider():
+    tracer = Tracer(path="")
+    with tracer.span("llm.query", provider="groq") as span:
+        span.set(bytes=12)
+    with tracer.span("llm.query", provider="ollama"):
+        pass
+    assert set(tracer.summary()) == {("llm.query", "groq"), ("llm.query", "ollama")}
+    assert tracer.recent[0].attrs["bytes"] == 12
+
+def test_errors_are_recorded_and_reraised():
+    tracer = Tracer(path="")
+    try:
+        with tracer.span("tts.speak"):
+            raise RuntimeError("down")
+    except RuntimeError:
+        pass
+    assert tracer.recent[-1].attrs["error"] == "RuntimeError"
+
+class FakeEngine:
+    def __init__(self):
+        self.last_provider = None
+
+    @traced("test.query", provider=lambda self: self.last_provider)
+    def query(self, prompt):
+        self.last_provider = "groq"
+        return prompt.upper()
+
+    @traced("test.stream", provider=lambda self: "ollama")
+    async def stream(self, prompt):
+        for word in prompt.split():
+            await asyncio.sleep(0)
+            yield word
+
+def test_decorator_labels_provider_payload_and_turn():
+    engine = FakeEngine()
+    tracer = get_tracer()
+    with trace_turn("turn-1"):
+        engine.query("नमस्ते")
+
+        async def consume():
+            return [word async for word in engine.stream("a bb ccc")]
+        assert asyncio.run(consume()) == ["a", "bb", "ccc"]
+
+    spans = {s.name: s for s in tracer.recent if s.turn_id == "turn-1"}
+    assert spans["test.query"].attrs == {"provider": "groq", "bytes": len("नमस्ते".encode("utf-8"))}
+    assert spans["test.stream"].attrs["bytes"] == 6
+    assert "first_item_ms" in spans["test.stream"].attrs
+    assert spans["turn"].duration >= spans["test.query"].duration
+
+def test_turn_id_reaches_worker_threads():
+    tracer = get_tracer()
+
+    @traced("test.worker")
+    def work():
+        return None
+
+    with trace_turn("turn-2"):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+        asyncio.run(asyncio.to_thread(work))
+    turns = [s.turn_id for s in tracer.recent if s.name == "test.worker"]
+    # Plain threads start with an empty context; asyncio.to_thread carries it over
+    assert turns[-2:] == [None, "turn-2"]
+
+def test_jsonl_export():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "trace.jsonl")
+        tracer = Tracer(path=path)
+        with tracer.span("stt.transcribe", provider="groq") as span:
+            span.set(bytes=3200)
+        tracer.record("turn.first_audio", 0.42)
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            with open(path, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f if line.endswith("\n")]
+            if len(lines) == 2:
+                break
+            time.sleep(0.01)
+        assert lines[0]["span"] == "stt.transcribe" and lines[0]["bytes"] == 3200
+        assert abs(lines[1]["duration_ms"] - 420) < 5
+
+def test_prometheus_endpoint():
+    tracer = Tracer(path="")
+    for _ in range(3):
+        with tracer.span("tts.play"):
+            pass
+    text = tracer.prometheus()
+    assert 'zen_stage_seconds{stage="tts.play",quantile="0.95"}' in text
+    assert 'zen_stage_seconds_count{stage="tts.play"} 3' in text
+
+    server = tracer.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.read().decode() == tracer.prometheus()
+    finally:
+        server.shutdown()
+
+def test_span_overhead_is_small():
+    tracer = Tracer(path="")
+    n = 20000
+    start = time.perf_counter()
+    for _ in range(n):
+        with tracer.span("bench"):
+            pass
+    per_span = (time.perf_counter() - start) / n
+    assert per_span < 50e-6, f"{per_span * 1e6:.1f} µs per span"
+
+if __name__ == "__main__":
+    test_histogram_percentiles_within_bucket_error()
+    test_spans_grouped_by_stage_and_provider()
+    test_errors_are_recorded_and_reraised()
+    test_decorator_labels_provider_payload_and_turn()
+    test_turn_id_reaches_worker_threads()
+    test_jsonl_export()
+    test_prometheus_endpoint()
+    test_span_overhead_is_small()
+    print("✅ Tracing tests passed")
@@ -0,0 +1,47 @@
+import asyncio
+from src.core.transport import HTTPTransport, _parse_limits
+
+def test_parse_limits():
+    assert _parse_limits("groq=8, elevenlabs=2,") == {"groq": 8, "elevenlabs": 2}
+    assert _parse_limits("") == {}
+
+def test_clients_are_shared_per_provider():
+    transport = HTTPTransport(limits={"groq": 3}, http2=False)
+    groq = transport.client("groq")
+    assert transport.client("groq") is groq
+    assert transport.client("perplexity") is not groq
+    assert groq._transport._pool._max_connections == 3
+    transport.close()
+
+def test_async_clients_are_per_event_loop():
+    transport = HTTPTransport(http2=False)
+
+    async def get():
+        first = transport.async_client("groq")
+        assert transport.async_client("groq") is first
+        return first
+
+    assert asyncio.run(get()) is not asyncio.run(get())
+
+def test_sdk_clients_wrap_the_loops_http_client():
+    transport = HTTPTransport(http2=False)
+    built = []
+
+    def build():
+        built.append(transport.async_client("groq"))
+        return object()
+
+    async def get():
+        sdk = transport.sdk_client("groq", build)
+        assert transport.sdk_client("groq", build) is sdk
+        return sdk
+
+    assert asyncio.run(get()) is not asyncio.run(get())
+    assert len(built) == 2 and built[0] is not built[1]
+
+if __name__ == "__main__":
+    test_parse_limits()
+    test_clients_are_shared_per_provider()
+    test_async_clients_are_per_event_loop()
+    test_sdk_clients_wrap_the_loops_http_client()
+    print("✅ Transport tests passed")
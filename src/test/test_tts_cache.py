@@ -0,0 +1,30 @@
+import tempfile
+from src.components.tts_cache import TTSAudioCache
+
+def test_cache_hit_and_normalized_key():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSAudioCache(directory, max_bytes=1024)
+        key = cache.key("elevenlabs", "voice", "model", "mp3", "Hello  there ")
+        assert key == cache.key("elevenlabs", "voice", "model", "mp3", "Hello there")
+        assert cache.get(key) is None
+        cache.put(key, b"abc")
+        assert bytes(cache.get(key)) == b"abc"
+        stats = cache.metrics()
+        assert stats["hits"] == 1 and stats["misses"] == 1 and stats["bytes_served"] == 3
+
+def test_cache_evicts_least_recently_used():
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSAudioCache(directory, max_bytes=10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        cache.get("a")
+        cache.put("c", b"1234")
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        # Index is rebuilt from disk on restart
+        assert TTSAudioCache(directory, max_bytes=10).metrics()["entries"] == 2
+
+if __name__ == "__main__":
+    test_cache_hit_and_normalized_key()
+    test_cache_evicts_least_recently_used()
+    print("✅ TTS cache tests passed")
@@ -0,0 +1,96 @@
+import asyncio
+import random
+import time
+from src.components.tts_pipeline import PipelinedTTS, SentenceChunker, split_sentences
+
+class FakeTTS:
+    primary = "fake"
+
+    def __init__(self, player):
+        self.player = player
+
+    async def asynthesize(self, text):
+        # Later chunks may finish first; playback must still be in order
+        await asyncio.sleep(random.random() / 100)
+        return text.encode(), "pcm"
+
+def test_splits_on_danda_and_punctuation():
+    text = "Goa is great in winter। Beaches are calm! Kya aap hotels dekhna chahenge?"
+    assert split_sentences(text, min_chars=1) == [
+        "Goa is great in winter।",
+        "Beaches are calm!",
+        "Kya aap hotels dekhna chahenge?",
+    ]
+
+def test_keeps_decimals_and_abbreviations_together():
+    text = "Tickets cost Rs. 3.5 thousand. Dr. Rao recommends it."
+    assert split_sentences(text, min_chars=1) == [
+        "Tickets cost Rs. 3.5 thousand.",
+        "Dr. Rao recommends it.",
+    ]
+
+def test_streamed_tokens_emit_first_sentence_early():
+    chunker = SentenceChunker(min_chars=1)
+    assert chunker.feed("Namaste") == []
+    assert chunker.feed("! Aaj") == ["Namaste!"]
+    assert chunker.feed(" mausam accha hai") == []
+    assert chunker.flush() == ["Aaj mausam accha hai"]
+
+def test_long_clauses_split_at_soft_boundary():
+    text = "Visit Baga beach in the morning, then head to Fort Aguada for the sunset views"
+    assert split_sentences(text, soft_chars=20) == [
+        "Visit Baga beach in the morning,",
+        "then head to Fort Aguada for the sunset views",
+    ]
+
+def test_async_pipeline_plays_chunks_in_order(fake_player):
+    async def deltas():
+        for token in "One. Two is here. Three is here too. Four is the last one.".split(" "):
+            yield token + " "
+
+    tts = FakeTTS(fake_player)
+    speaker = PipelinedTTS(tts, max_parallel=2)
+    text = asyncio.run(speaker.aspeak_stream(deltas()))
+    assert text.split() == "One. Two is here. Three is here too. Four is the last one.".split()
+    assert " ".join(tts.player.played) == "One. Two is here. Three is here too. Four is the last one."
+    assert speaker.last_ttfa is not None
+
+class FlakyTTS(FakeTTS):
+    """Fails to synthesize the chunks in ``fail``; direct playback of them takes a while."""
+
+    def __init__(self, player, fail):
+        super().__init__(player)
+        self.fail = fail
+        self.direct = []
+
+    async def asynthesize(self, text):
+        if text in self.fail:
+            return None
+        return await super().asynthesize(text)
+
+    def speak_direct(self, text):
+        time.sleep(0.05)
+        self.direct.append((text, time.monotonic()))
+
+def test_failed_chunk_is_spoken_directly_and_not_counted_as_first_audio(fake_player):
+    async def deltas():
+        yield "One. Two is here. Three is here too."
+
+    tts = FlakyTTS(fake_player, fail={"One."})
+    speaker = PipelinedTTS(tts, max_parallel=2)
+    asyncio.run(speaker.aspeak_stream(deltas()))
+    # Only direct playback is retried for the failed chunk, not every provider again
+    assert [text for text, _ in tts.direct] == ["One."]
+    assert fake_player.played == ["Two is here. Three is here too."]
+    # First audio is when the player started the first clip, after the failed chunk
+    assert speaker.first_audio_at >= tts.direct[0][1]
+
+if __name__ == "__main__":
+    from conftest import FakePlayer
+    test_splits_on_danda_and_punctuation()
+    test_keeps_decimals_and_abbreviations_together()
+    test_streamed_tokens_emit_first_sentence_early()
+    test_long_clauses_split_at_soft_boundary()
+    test_async_pipeline_plays_chunks_in_order(FakePlayer())
+    test_failed_chunk_is_spoken_directly_and_not_counted_as_first_audio(FakePlayer())
+    print("✅ Sentence chunker tests passed")
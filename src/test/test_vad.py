@@ -0,0 +1,64 @@
+import threading
+import numpy as np
+from src.components.vad import BargeInDetector, VADEndpointer
+
+class ThresholdVAD:
+    window_size = 160
+
+    def reset(self):
+        pass
+
+    def __call__(self, window):
+        return 1.0 if np.abs(window).max() > 0.1 else 0.0
+
+def make_frames(*segments, frame=160):
+    audio = np.concatenate([np.full(int(16000 * sec), level, dtype=np.float32) for sec, level in segments])
+    return [audio[i:i + frame] for i in range(0, len(audio), frame)]
+
+def test_endpointer_trims_and_stops_on_silence():
+    endpointer = VADEndpointer(ThresholdVAD(), threshold=0.5, silence_ms=300, min_speech_ms=50, pad_ms=0)
+    frames = make_frames((0.5, 0.0), (1.0, 0.5), (2.0, 0.0))
+    consumed = []
+    utterance = endpointer.listen((consumed.append(f) or f for f in frames), max_duration=5)
+    assert utterance is not None
+    assert abs(utterance.duration - 1.0) < 0.02
+    # Stopped shortly after the trailing-silence window, not at the end of the input
+    assert len(consumed) * 160 / 16000 < 1.9
+
+def test_endpointer_returns_none_without_speech():
+    endpointer = VADEndpointer(ThresholdVAD(), threshold=0.5, silence_ms=300, min_speech_ms=50, pad_ms=0)
+    assert endpointer.listen(make_frames((1.0, 0.0)), max_duration=5) is None
+
+class FakeRing:
+    position = 0
+
+class FakeMic:
+    frame_size = 160
+
+    def __init__(self, frames):
+        self.ring = FakeRing()
+        self._frames = frames
+
+    def frames(self, start=None):
+        yield from self._frames
+
+def test_barge_in_ignores_short_noise_and_reports_onset():
+    detector = BargeInDetector(ThresholdVAD(), threshold=0.5, min_speech_ms=200)
+    # A 50 ms click, then real speech starting at 1.0 s
+    mic = FakeMic(make_frames((0.5, 0.0), (0.05, 0.5), (0.45, 0.0), (1.0, 0.5)))
+    onset = detector.watch(mic, threading.Event(), start=0)
+    assert onset == 16000
+    assert detector.detected_at is not None
+
+def test_barge_in_stops_when_asked():
+    detector = BargeInDetector(ThresholdVAD(), threshold=0.5, min_speech_ms=200)
+    stop = threading.Event()
+    stop.set()
+    assert detector.watch(FakeMic(make_frames((1.0, 0.5))), stop) is None
+
+if __name__ == "__main__":
+    test_endpointer_trims_and_stops_on_silence()
+    test_endpointer_returns_none_without_speech()
+    test_barge_in_ignores_short_noise_and_reports_onset()
+    test_barge_in_stops_when_asked()
+    print("✅ VAD endpointer and barge-in tests passed")
@@ -0,0 +1,64 @@
+import threading
+import time
+import numpy as np
+from src.components.whisper_batching import WhisperBatchScheduler
+
+class FakePool:
+    workers = 1
+
+def make_scheduler(sizes, **kwargs):
+    def batch_fn(audios):
+        sizes.append(len(audios))
+        time.sleep(0.05)
+        return [f"len={len(a)}" for a in audios]
+    return WhisperBatchScheduler(pool=FakePool(), batch_fn=batch_fn, **kwargs)
+
+def test_results_are_routed_to_each_caller():
+    sizes = []
+    scheduler = make_scheduler(sizes, max_batch=8, max_wait_ms=50)
+    futures = [scheduler.submit(np.zeros(n, dtype=np.float32)) for n in (100, 200, 300)]
+    assert [f.result(2) for f in futures] == ["len=100", "len=200", "len=300"]
+    assert sizes == [3]
+
+def test_batch_size_is_capped():
+    sizes = []
+    scheduler = make_scheduler(sizes, max_batch=2, max_wait_ms=50)
+    futures = [scheduler.submit(np.zeros(10, dtype=np.float32)) for _ in range(5)]
+    [f.result(2) for f in futures]
+    assert max(sizes) == 2 and sum(sizes) == 5
+
+def test_concurrent_sessions_share_batches_without_waiting():
+    sizes = []
+    scheduler = make_scheduler(sizes, max_batch=8, max_wait_ms=0)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(scheduler.transcribe(np.zeros(10)))) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 6
+    # Requests arriving while a batch runs are decoded together in the next one
+    assert len(sizes) < 6
+
+def test_errors_reach_every_caller():
+    def boom(audios):
+        raise RuntimeError("decode failed")
+    scheduler = WhisperBatchScheduler(pool=FakePool(), batch_fn=boom, max_batch=4, max_wait_ms=20)
+    future = scheduler.submit(np.zeros(10))
+    assert isinstance(future.exception(2), RuntimeError)
+
+def test_missing_texts_fail_the_batch_instead_of_hanging():
+    def short(audios):
+        time.sleep(0.02)
+        return ["only one"]
+    scheduler = WhisperBatchScheduler(pool=FakePool(), batch_fn=short, max_batch=4, max_wait_ms=20)
+    futures = [scheduler.submit(np.zeros(10)) for _ in range(3)]
+    assert all(isinstance(f.exception(2), RuntimeError) for f in futures)
+
+if __name__ == "__main__":
+    test_results_are_routed_to_each_caller()
+    test_batch_size_is_capped()
+    test_concurrent_sessions_share_batches_without_waiting()
+    test_errors_reach_every_caller()
+    test_missing_texts_fail_the_batch_instead_of_hanging()
+    print("✅ Whisper batching tests passed")
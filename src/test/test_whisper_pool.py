@@ -0,0 +1,84 @@
+import sys
+import threading
+import time
+from types import ModuleType, SimpleNamespace
+from src.components.whisper_pool import WhisperModelPool, get_whisper_pool
+
+class FakeWhisperModel:
+    """Counts loads and overlapping decodes; every decode takes ``delay`` seconds."""
+    loads = 0
+
+    def __init__(self, *args, delay=0.02, **kwargs):
+        FakeWhisperModel.loads += 1
+        self.delay = delay
+        self.decodes = 0
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, **kwargs):
+        with self._lock:
+            self.decodes += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        return iter([SimpleNamespace(text=" namaste"), SimpleNamespace(text=" goa")]), None
+
+def test_pools_are_shared_per_model_configuration():
+    pool = get_whisper_pool(size="tiny", device="cpu", compute_type="int8", workers=2)
+    assert get_whisper_pool(size="tiny", device="cpu", compute_type="int8") is pool
+    assert get_whisper_pool(size="base", device="cpu", compute_type="int8") is not pool
+    assert pool.workers == 2
+
+def test_model_is_loaded_and_warmed_once():
+    fake = ModuleType("faster_whisper")
+    fake.WhisperModel = FakeWhisperModel
+    saved = sys.modules.get("faster_whisper")
+    sys.modules["faster_whisper"] = fake
+    try:
+        FakeWhisperModel.loads = 0
+        pool = WhisperModelPool("tiny", "cpu", "int8", workers=2, cpu_threads=1)
+        threads = [threading.Thread(target=pool.load) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        if saved is None:
+            del sys.modules["faster_whisper"]
+        else:
+            sys.modules["faster_whisper"] = saved
+    # One copy of the weights, warmed by a single dummy decode before anyone uses it
+    assert FakeWhisperModel.loads == 1 and pool.model.decodes == 1
+    assert pool.load_seconds is not None
+
+def test_workers_bound_concurrent_decodes():
+    pool = WhisperModelPool("tiny", "cpu", "int8", workers=2, cpu_threads=1)
+    pool.model = FakeWhisperModel()
+    texts = []
+    threads = [threading.Thread(target=lambda: texts.append(pool.transcribe(None)[0])) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert texts == ["namaste goa"] * 6
+    assert pool.model.max_running == 2
+
+def test_acquire_times_out_when_every_worker_is_busy():
+    pool = WhisperModelPool("tiny", "cpu", "int8", workers=1, cpu_threads=1)
+    pool.model = FakeWhisperModel()
+    with pool.acquire():
+        try:
+            with pool.acquire(timeout=0.01):
+                assert False, "the only worker is taken"
+        except TimeoutError:
+            pass
+
+if __name__ == "__main__":
+    test_pools_are_shared_per_model_configuration()
+    test_model_is_loaded_and_warmed_once()
+    test_workers_bound_concurrent_decodes()
+    test_acquire_times_out_when_every_worker_is_busy()
+    print("✅ Whisper pool tests passed")